@@ -0,0 +1,56 @@
+-- Personal bests for the Fruit Ninja CV leaderboard (optional)
+-- Run this SQL in your Supabase SQL Editor, then set LEADERBOARD_PERSONAL_BESTS=1.
+-- Safe to run more than once.
+
+-- One row per (player, difficulty) holding the player's best score
+CREATE TABLE IF NOT EXISTS personal_bests (
+  player_name TEXT NOT NULL,
+  difficulty TEXT NOT NULL CHECK (difficulty IN ('easy', 'medium', 'hard')),
+  score INTEGER NOT NULL CHECK (score >= 0),
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(), -- when the best was achieved
+  PRIMARY KEY (player_name, difficulty)
+);
+
+-- Rank lookups: COUNT(*) WHERE difficulty = ? AND score > ?
+CREATE INDEX IF NOT EXISTS idx_personal_bests_difficulty_score 
+ON personal_bests(difficulty, score DESC);
+
+-- Keep personal_bests current in the same transaction as every game insert.
+-- SECURITY DEFINER: kiosks may only insert into leaderboard, not personal_bests.
+-- search_path is pinned so a caller's objects cannot shadow personal_bests.
+CREATE OR REPLACE FUNCTION update_personal_best()
+RETURNS trigger AS $$
+BEGIN
+  INSERT INTO personal_bests (player_name, difficulty, score, created_at)
+  VALUES (NEW.player_name, NEW.difficulty, NEW.score, NEW.created_at)
+  ON CONFLICT (player_name, difficulty) DO UPDATE SET
+    score = GREATEST(personal_bests.score, EXCLUDED.score),
+    created_at = CASE WHEN EXCLUDED.score > personal_bests.score
+                      THEN EXCLUDED.created_at ELSE personal_bests.created_at END;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public, pg_temp;
+
+DROP TRIGGER IF EXISTS leaderboard_personal_best ON leaderboard;
+CREATE TRIGGER leaderboard_personal_best
+AFTER INSERT ON leaderboard
+FOR EACH ROW EXECUTE FUNCTION update_personal_best();
+
+-- Backfill from the games already played (after the trigger exists, so no
+-- game is missed; GREATEST makes overlapping updates harmless)
+INSERT INTO personal_bests (player_name, difficulty, score, created_at)
+SELECT DISTINCT ON (player_name, difficulty) player_name, difficulty, score, created_at
+FROM leaderboard
+ORDER BY player_name, difficulty, score DESC, created_at
+ON CONFLICT (player_name, difficulty) DO UPDATE SET
+  score = GREATEST(personal_bests.score, EXCLUDED.score),
+  created_at = CASE WHEN EXCLUDED.score > personal_bests.score
+                    THEN EXCLUDED.created_at ELSE personal_bests.created_at END;
+
+-- Read-only for clients
+ALTER TABLE personal_bests ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Enable read access for all users" ON personal_bests;
+CREATE POLICY "Enable read access for all users" 
+ON personal_bests FOR SELECT 
+USING (true);
@@ -0,0 +1,87 @@
+-- Replay verification for the Fruit Ninja CV leaderboard (optional)
+-- Run this SQL in your Supabase SQL Editor; kiosks then upload a gameplay
+-- trace with every score and scripts/verify_scores.py re-checks them.
+-- Without this table kiosks still store scores and skip the trace upload.
+-- Safe to run more than once.
+
+-- One trace per game, apart from leaderboard so board reads stay small.
+-- Archived games (docs/retention.sql) take their trace with them. A game
+-- submitted without a trace gets a row without one when it is judged.
+CREATE TABLE IF NOT EXISTS score_replays (
+  submission_id UUID PRIMARY KEY
+    REFERENCES leaderboard(submission_id) ON DELETE CASCADE,
+  replay TEXT CHECK (length(replay) <= 1000000),
+  verdict TEXT CHECK (verdict IN ('ok', 'mismatch', 'invalid')),
+  replayed_score INTEGER,
+  reason TEXT,
+  verified_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Tables created before games without a trace were judged
+ALTER TABLE score_replays ALTER COLUMN replay DROP NOT NULL;
+ALTER TABLE score_replays DROP CONSTRAINT IF EXISTS score_replays_replay_or_verdict;
+ALTER TABLE score_replays ADD CONSTRAINT score_replays_replay_or_verdict
+CHECK (replay IS NOT NULL OR verdict IS NOT NULL);
+
+-- Traces without a verdict
+CREATE INDEX IF NOT EXISTS idx_score_replays_pending
+ON score_replays(submission_id) WHERE verdict IS NULL;
+
+ALTER TABLE score_replays ENABLE ROW LEVEL SECURITY;
+
+-- Kiosks may upload a trace but not read or judge one; the verifier uses
+-- SUPABASE_SERVICE_KEY, which bypasses RLS
+DROP POLICY IF EXISTS "Enable insert access for all users" ON score_replays;
+CREATE POLICY "Enable insert access for all users"
+ON score_replays FOR INSERT
+WITH CHECK (verdict IS NULL AND verified_at IS NULL);
+
+-- The verifier stores a batch of verdicts in one call:
+-- rpc('set_replay_verdicts', {'verdicts': [{submission_id, verdict, replayed_score, reason}, ...]})
+CREATE OR REPLACE FUNCTION set_replay_verdicts(verdicts JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+SET search_path = public
+AS $$
+  -- Games submitted without a trace have no row yet and get one here
+  WITH judged AS (
+    INSERT INTO score_replays (submission_id, verdict, replayed_score, reason, verified_at)
+    SELECT v.submission_id, v.verdict, v.replayed_score, v.reason, NOW()
+    FROM jsonb_to_recordset(verdicts)
+      AS v(submission_id UUID, verdict TEXT, replayed_score INTEGER, reason TEXT)
+    ON CONFLICT (submission_id) DO UPDATE
+    SET verdict = EXCLUDED.verdict,
+        replayed_score = EXCLUDED.replayed_score,
+        reason = EXCLUDED.reason,
+        verified_at = EXCLUDED.verified_at
+    RETURNING 1
+  )
+  SELECT COUNT(*)::INTEGER FROM judged;
+$$;
+
+-- Only the verifier (service role) may judge replays
+REVOKE EXECUTE ON FUNCTION set_replay_verdicts(JSONB) FROM PUBLIC, anon, authenticated;
+
+-- The verifier's work queue: every game without a verdict, with its trace
+-- (NULL when none was uploaded, which the verifier judges 'invalid').
+-- Traces stay private: the view runs with the caller's rights.
+CREATE OR REPLACE VIEW replay_queue WITH (security_invoker = true) AS
+SELECT l.submission_id, l.player_name, l.score, l.difficulty, r.replay
+FROM leaderboard l
+LEFT JOIN score_replays r USING (submission_id)
+WHERE l.submission_id IS NOT NULL AND r.verdict IS NULL;
+
+REVOKE SELECT ON replay_queue FROM anon, authenticated;
+
+-- Verdicts next to the scores, e.g. to hide failed ones from a board.
+-- verification is 'missing' (no trace uploaded, not judged yet), 'pending'
+-- (trace waiting for the verifier) or the verdict.
+CREATE OR REPLACE VIEW verified_scores AS
+SELECT l.*, r.verdict, r.replayed_score,
+  CASE
+    WHEN r.submission_id IS NULL THEN 'missing'
+    WHEN r.verdict IS NULL THEN 'pending'
+    ELSE r.verdict
+  END AS verification
+FROM leaderboard l
+LEFT JOIN score_replays r USING (submission_id);
@@ -0,0 +1,106 @@
+-- Retention and roll-up for the Fruit Ninja CV leaderboard
+-- Run this SQL in your Supabase SQL Editor, then schedule
+-- scripts/compact_leaderboard.py (e.g. nightly). Safe to run more than once.
+
+-- Existing installations: the stats materialized view needed manual refreshes;
+-- it becomes a plain view over bounded inputs
+DROP MATERIALIZED VIEW IF EXISTS leaderboard_stats;
+DROP FUNCTION IF EXISTS refresh_leaderboard_stats();
+
+CREATE TABLE IF NOT EXISTS leaderboard_daily (
+  day DATE NOT NULL,
+  difficulty TEXT NOT NULL,
+  games INTEGER NOT NULL,
+  total_score BIGINT NOT NULL,
+  max_score INTEGER NOT NULL,
+  min_score INTEGER NOT NULL,
+  PRIMARY KEY (day, difficulty)
+);
+
+CREATE TABLE IF NOT EXISTS leaderboard_daily_scores (
+  day DATE NOT NULL,
+  difficulty TEXT NOT NULL,
+  score INTEGER NOT NULL,
+  games INTEGER NOT NULL,
+  PRIMARY KEY (day, difficulty, score)
+);
+
+CREATE OR REPLACE VIEW leaderboard_stats AS
+SELECT 
+  difficulty,
+  SUM(games) as total_games,
+  MAX(max_score) as highest_score,
+  SUM(total_score)::NUMERIC / SUM(games) as average_score,
+  MIN(min_score) as lowest_score
+FROM (
+  SELECT difficulty, COUNT(*) AS games, SUM(score) AS total_score,
+         MAX(score) AS max_score, MIN(score) AS min_score
+  FROM leaderboard GROUP BY difficulty
+  UNION ALL
+  SELECT difficulty, games, total_score, max_score, min_score FROM leaderboard_daily
+) AS games
+GROUP BY difficulty;
+
+ALTER TABLE leaderboard_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE leaderboard_daily_scores ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Enable read access for all users" ON leaderboard_daily;
+CREATE POLICY "Enable read access for all users" 
+ON leaderboard_daily FOR SELECT 
+USING (true);
+
+DROP POLICY IF EXISTS "Enable read access for all users" ON leaderboard_daily_scores;
+CREATE POLICY "Enable read access for all users" 
+ON leaderboard_daily_scores FOR SELECT 
+USING (true);
+
+-- Fold games older than retain_days into the daily tables and delete them,
+-- keeping each difficulty's top keep_top games and every player's best game.
+-- Returns the number of games archived. SECURITY DEFINER functions pin
+-- search_path so a caller's objects cannot shadow the tables (pg_temp last:
+-- only the doomed temp table is looked up there).
+CREATE OR REPLACE FUNCTION compact_leaderboard(retain_days INTEGER DEFAULT 90,
+                                               keep_top INTEGER DEFAULT 100)
+RETURNS INTEGER AS $$
+DECLARE
+  archived INTEGER;
+BEGIN
+  -- One compaction at a time, or two runs would archive the same games twice
+  PERFORM pg_advisory_xact_lock(hashtext('compact_leaderboard'));
+
+  CREATE TEMP TABLE doomed ON COMMIT DROP AS
+  SELECT * FROM leaderboard
+  WHERE created_at < NOW() - make_interval(days => retain_days)
+    AND id NOT IN (
+      SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY difficulty ORDER BY score DESC, id) AS rn
+        FROM leaderboard) AS ranked
+      WHERE rn <= keep_top)
+    AND id NOT IN (
+      SELECT DISTINCT ON (player_name, difficulty) id
+      FROM leaderboard
+      ORDER BY player_name, difficulty, score DESC, id);
+
+  INSERT INTO leaderboard_daily (day, difficulty, games, total_score, max_score, min_score)
+  SELECT created_at::DATE, difficulty, COUNT(*), SUM(score), MAX(score), MIN(score)
+  FROM doomed GROUP BY 1, 2
+  ON CONFLICT (day, difficulty) DO UPDATE SET
+    games = leaderboard_daily.games + EXCLUDED.games,
+    total_score = leaderboard_daily.total_score + EXCLUDED.total_score,
+    max_score = GREATEST(leaderboard_daily.max_score, EXCLUDED.max_score),
+    min_score = LEAST(leaderboard_daily.min_score, EXCLUDED.min_score);
+
+  INSERT INTO leaderboard_daily_scores (day, difficulty, score, games)
+  SELECT created_at::DATE, difficulty, score, COUNT(*)
+  FROM doomed GROUP BY 1, 2, 3
+  ON CONFLICT (day, difficulty, score) DO UPDATE SET
+    games = leaderboard_daily_scores.games + EXCLUDED.games;
+
+  DELETE FROM leaderboard WHERE id IN (SELECT id FROM doomed);
+  GET DIAGNOSTICS archived = ROW_COUNT;
+  RETURN archived;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public, pg_temp;
+
+-- Only the service role may compact
+REVOKE EXECUTE ON FUNCTION compact_leaderboard(INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
@@ -7,9 +7,13 @@ CREATE TABLE IF NOT EXISTS leaderboard (
   player_name TEXT NOT NULL,
   score INTEGER NOT NULL CHECK (score >= 0),
   difficulty TEXT NOT NULL CHECK (difficulty IN ('easy', 'medium', 'hard')),
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  submission_id UUID UNIQUE -- idempotency key from the kiosk's score journal
 );
 
+-- Existing installations: add the idempotency key column
+ALTER TABLE leaderboard ADD COLUMN IF NOT EXISTS submission_id UUID UNIQUE;
+
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_leaderboard_score 
 ON leaderboard(score DESC);
@@ -24,9 +28,14 @@ CREATE INDEX IF NOT EXISTS idx_leaderboard_created
 ON leaderboard(created_at DESC);
 
 -- Create a compound index for difficulty + score queries
+-- (top scores, and rank lookups: COUNT(*) WHERE difficulty = ? AND score > ?)
 CREATE INDEX IF NOT EXISTS idx_leaderboard_difficulty_score 
 ON leaderboard(difficulty, score DESC);
 
+-- Keyset pagination for exports: WHERE (score, id) > (?, ?) ORDER BY score, id
+CREATE INDEX IF NOT EXISTS idx_leaderboard_score_id 
+ON leaderboard(score, id);
+
 -- Enable Row Level Security (RLS)
 ALTER TABLE leaderboard ENABLE ROW LEVEL SECURITY;
 
@@ -42,6 +51,8 @@ ON leaderboard FOR INSERT
 WITH CHECK (true);
 
 -- Optional: Create a view for top scores by difficulty
+-- (Leaderboard.get_top_scores_by_difficulty reads every board in one request
+-- with WHERE rank <= N)
 CREATE OR REPLACE VIEW top_scores_by_difficulty AS
 SELECT 
   difficulty,
@@ -52,27 +63,45 @@ SELECT
 FROM leaderboard
 ORDER BY difficulty, score DESC;
 
--- Optional: Create a materialized view for better performance on large datasets
-CREATE MATERIALIZED VIEW IF NOT EXISTS leaderboard_stats AS
+-- Games archived by compact_leaderboard() (docs/retention.sql):
+-- per-day aggregates and per-day score histograms
+CREATE TABLE IF NOT EXISTS leaderboard_daily (
+  day DATE NOT NULL,
+  difficulty TEXT NOT NULL,
+  games INTEGER NOT NULL,
+  total_score BIGINT NOT NULL,
+  max_score INTEGER NOT NULL,
+  min_score INTEGER NOT NULL,
+  PRIMARY KEY (day, difficulty)
+);
+
+CREATE TABLE IF NOT EXISTS leaderboard_daily_scores (
+  day DATE NOT NULL,
+  difficulty TEXT NOT NULL,
+  score INTEGER NOT NULL,
+  games INTEGER NOT NULL,
+  PRIMARY KEY (day, difficulty, score)
+);
+
+-- Stats over every game ever played: retained rows plus archived aggregates.
+-- Both inputs stay bounded once compaction runs, so no refresh is needed.
+CREATE OR REPLACE VIEW leaderboard_stats AS
 SELECT 
   difficulty,
-  COUNT(*) as total_games,
-  MAX(score) as highest_score,
-  AVG(score) as average_score,
-  MIN(score) as lowest_score
-FROM leaderboard
+  SUM(games) as total_games,
+  MAX(max_score) as highest_score,
+  SUM(total_score)::NUMERIC / SUM(games) as average_score,
+  MIN(min_score) as lowest_score
+FROM (
+  SELECT difficulty, COUNT(*) AS games, SUM(score) AS total_score,
+         MAX(score) AS max_score, MIN(score) AS min_score
+  FROM leaderboard GROUP BY difficulty
+  UNION ALL
+  SELECT difficulty, games, total_score, max_score, min_score FROM leaderboard_daily
+) AS games
 GROUP BY difficulty;
 
--- Create an index on the materialized view
-CREATE UNIQUE INDEX ON leaderboard_stats (difficulty);
-
--- Function to refresh stats (call periodically if using materialized view)
-CREATE OR REPLACE FUNCTION refresh_leaderboard_stats()
-RETURNS void AS $$
-BEGIN
-  REFRESH MATERIALIZED VIEW CONCURRENTLY leaderboard_stats;
-END;
-$$ LANGUAGE plpgsql;
+-- Optional: per-player best scores for cheap rank lookups, see docs/personal_bests.sql
 
 -- Optional: Add a comment to the table
 COMMENT ON TABLE leaderboard IS 'Stores player scores for Fruit Ninja CV game';
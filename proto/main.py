@@ -5,6 +5,7 @@ Main entry point for the application
 """
 import argparse
 import sys
+import threading
 import os
 from dotenv import load_dotenv
 
@@ -12,9 +13,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from src.core.game import FruitNinjaGame
-from src.core.config import GameConfig, DifficultyLevel
-from src.leaderboard import Leaderboard
-from src.ui import LeaderboardUI
+from src.core.config import GameConfig, apply_difficulty
+from src.core.recording import GameplayRecorder
+from src.cv.backends import available_backends
+from src.cv.capture import CAPTURE_BACKENDS
+from src.cv.session import SessionRecorder
+from src.leaderboard import Leaderboard, ScoreHistogram, ScoreJournal, ScoreSubmitter
+from src.ui import LeaderboardOverlay, LeaderboardUI, SpectatorServer
 
 
 def parse_args():
@@ -28,6 +33,8 @@ Examples:
   %(prog)s --difficulty hard  # Start with hard difficulty
   %(prog)s --debug            # Enable debug mode with landmarks
   %(prog)s --width 1280 --height 720  # Custom resolution
+  %(prog)s --tracker tasks    # Async MediaPipe Tasks hand tracking
+  %(prog)s --tracker blob     # Lightweight tracker for low-end CPUs
         """
     )
     
@@ -42,7 +49,8 @@ Examples:
         '--width',
         type=int,
         default=640,
-        help='Window width in pixels (default: 640)'
+        help='Window width in pixels (default: 640); replay verification '
+             'accepts 640x480, 1280x720 and 1920x1080'
     )
     
     parser.add_argument(
@@ -64,6 +72,132 @@ Examples:
         help='Disable slash trail visualization'
     )
     
+    parser.add_argument(
+        '--no-particles',
+        action='store_true',
+        help='Disable juice splashes and fruit halves when a fruit is sliced'
+    )
+    
+    parser.add_argument(
+        '--tracker',
+        choices=available_backends(),
+        default=os.getenv('HAND_TRACKER_BACKEND', GameConfig.TRACKER_BACKEND),
+        help='Hand tracking backend (default: $HAND_TRACKER_BACKEND or solutions). '
+             'Run scripts/benchmark_trackers.py to pick one for this machine'
+    )
+    
+    parser.add_argument(
+        '--model-path',
+        type=str,
+        default=None,
+        help='Path to hand_landmarker.task for the tasks backend '
+             '(default: data/hand_landmarker.task)'
+    )
+    
+    parser.add_argument(
+        '--camera',
+        type=str,
+        default=GameConfig.CAMERA_SOURCE,
+        help="Frame source: camera index, device or stream URL, video file, image "
+             "directory/glob, or 'synthetic' to play without a camera (default: 0)"
+    )
+    
+    parser.add_argument(
+        '--capture-backend',
+        choices=list(CAPTURE_BACKENDS),
+        default=GameConfig.CAMERA_BACKEND,
+        help="Camera API, e.g. 'v4l2' on Linux (default: any)"
+    )
+    
+    parser.add_argument(
+        '--fourcc',
+        type=str,
+        default=None,
+        help="Camera pixel format, e.g. MJPG (high FPS over USB 2) or YUYV"
+    )
+    
+    parser.add_argument(
+        '--camera-fps',
+        type=float,
+        default=None,
+        help='Frame rate to request from the camera'
+    )
+    
+    parser.add_argument(
+        '--camera-buffer',
+        type=int,
+        default=None,
+        help='Driver frame buffers (1 always reads the newest frame)'
+    )
+    
+    parser.add_argument(
+        '--capture-stats',
+        action='store_true',
+        help='Report delivered FPS and capture-to-read latency when the game ends '
+             '(run scripts/benchmark_capture.py to compare camera modes)'
+    )
+    
+    parser.add_argument(
+        '--record-session',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Record fingertip landmarks to a .npz session for scripts/tune_thresholds.py'
+    )
+    
+    parser.add_argument(
+        '--record-video',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Record the game window to a video file (encoded off the frame loop)'
+    )
+    
+    parser.add_argument(
+        '--highlights',
+        action='store_true',
+        help="Keep the last seconds of play in memory; 'r' or a combo saves them "
+             f"as a clip in {GameConfig.HIGHLIGHT_DIR}"
+    )
+    
+    parser.add_argument(
+        '--spectator',
+        type=int,
+        default=None,
+        metavar='PORT',
+        help='Stream the game as MJPEG on this port for a big screen or monitoring '
+             'page (http://<host>:PORT/)'
+    )
+    
+    parser.add_argument(
+        '--presenter',
+        choices=['window', 'inline', 'null'],
+        default=GameConfig.PRESENTER,
+        help="Where frames are shown: 'window' (display thread, default), 'inline' "
+             "(window calls in the game loop, for macOS) or 'null' (headless, "
+             "e.g. with --spectator)"
+    )
+    
+    parser.add_argument(
+        '--present-stats',
+        action='store_true',
+        help='Report presentation latency when the game ends'
+    )
+    
+    parser.add_argument(
+        '--gc',
+        choices=['auto', 'idle'],
+        default=GameConfig.GC_MODE,
+        help="Garbage collection: 'auto' (Python default) or 'idle' (collect only "
+             "in spare time at the end of a frame) (default: auto)"
+    )
+    
+    parser.add_argument(
+        '--gc-stats',
+        action='store_true',
+        help='Report every GC pause and the frame it hit when the game ends'
+    )
+    
     parser.add_argument(
         '--player-name',
         type=str,
@@ -71,13 +205,26 @@ Examples:
         help='Player name for leaderboard (default: Player)'
     )
     
+    parser.add_argument(
+        '--submit-timeout',
+        type=float,
+        default=2.0,
+        help='Seconds to wait for the score upload before continuing in the '
+             'background (default: 2.0)'
+    )
+    
     parser.add_argument(
         '--show-leaderboard',
         action='store_true',
         help='Show leaderboard at game end'
     )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    # argparse does not check defaults against choices
+    if args.tracker not in available_backends():
+        parser.error(f"HAND_TRACKER_BACKEND={args.tracker!r} is not a tracker backend "
+                     f"(choose from {', '.join(available_backends())})")
+    return args
 
 
 def create_config(args):
@@ -89,16 +236,28 @@ def create_config(args):
     config.WINDOW_HEIGHT = args.height
     
     # Apply difficulty settings
-    difficulty_map = {
-        'easy': DifficultyLevel.EASY,
-        'medium': DifficultyLevel.MEDIUM,
-        'hard': DifficultyLevel.HARD
-    }
+    apply_difficulty(config, args.difficulty)
+    
+    # Hand tracking backend
+    config.TRACKER_BACKEND = args.tracker
+    if args.model_path:
+        config.HAND_LANDMARKER_MODEL = args.model_path
+    
+    # Garbage collection
+    config.GC_MODE = args.gc
+    config.GC_STATS = args.gc_stats
     
-    difficulty = difficulty_map[args.difficulty]
-    config.FRUIT_SPAWN_INTERVAL = difficulty['spawn_interval']
-    config.FRUIT_VELOCITY = difficulty['fruit_velocity']
-    config.MIN_SLASH_VELOCITY = difficulty['min_velocity']
+    # Capture
+    config.CAMERA_SOURCE = getattr(args, 'camera', config.CAMERA_SOURCE)
+    config.CAMERA_BACKEND = args.capture_backend
+    config.CAMERA_FOURCC = args.fourcc
+    config.CAMERA_FPS = args.camera_fps
+    config.CAMERA_BUFFER_SIZE = args.camera_buffer
+    config.CAPTURE_STATS = args.capture_stats
+    
+    # Presentation
+    config.PRESENTER = args.presenter
+    config.PRESENTER_STATS = args.present_stats
     
     # Apply debug settings
     if args.debug:
@@ -110,9 +269,24 @@ def create_config(args):
     if args.no_trail:
         config.TRAIL_LIFETIME = 0.1  # Very short trail
     
+    if args.no_particles:
+        config.PARTICLES = False
+    
     return config
 
 
+def start_leaderboard(journal):
+    """Connect to the leaderboard and start the background score uploader"""
+    try:
+        leaderboard = Leaderboard(histogram=ScoreHistogram())
+    except Exception as e:
+        print(f"⚠️  Leaderboard unavailable: {e}")
+        return None, None
+    # Fetch scores posted since the last run while the game is played
+    threading.Thread(target=leaderboard.sync_histogram, name='histogram-sync', daemon=True).start()
+    return leaderboard, ScoreSubmitter(leaderboard, journal).start()
+
+
 def main():
     """Main entry point"""
     args = parse_args()
@@ -122,6 +296,8 @@ def main():
     print("=" * 50)
     print(f"Difficulty: {args.difficulty.upper()}")
     print(f"Resolution: {args.width}x{args.height}")
+    print(f"Camera: {args.camera}")
+    print(f"Tracker: {args.tracker}")
     print(f"Debug Mode: {'ON' if args.debug else 'OFF'}")
     print(f"Player: {args.player_name}")
     print("=" * 50)
@@ -129,35 +305,107 @@ def main():
     
     try:
         config = create_config(args)
-        game = FruitNinjaGame(config=config)
+        
+        # Scores go through a local journal; earlier unsent scores upload during play
+        journal = ScoreJournal()
+        leaderboard, submitter = start_leaderboard(journal)
+        
+        recorder = None
+        if args.record_session:
+            recorder = SessionRecorder(
+                width=config.WINDOW_WIDTH,
+                height=config.WINDOW_HEIGHT,
+                metadata={'difficulty': args.difficulty, 'tracker': args.tracker}
+            )
+        # Boards for the game over and attract screens, fetched in the background
+        overlay = None
+        if leaderboard is not None:
+            overlay = LeaderboardOverlay(
+                leaderboard, LeaderboardUI(config.WINDOW_WIDTH, config.WINDOW_HEIGHT),
+                current_player=args.player_name, highlight=args.difficulty
+            ).start()
+        video_recorder = None
+        if args.record_video or args.highlights:
+            video_recorder = GameplayRecorder(
+                args.record_video, fps=config.FPS,
+                highlight_seconds=config.HIGHLIGHT_SECONDS if args.highlights else 0,
+                queue_size=config.RECORD_QUEUE_SIZE
+            ).start()
+        spectator = None
+        if args.spectator is not None:
+            spectator = SpectatorServer(
+                config.WINDOW_WIDTH, config.WINDOW_HEIGHT, fps=config.SPECTATOR_FPS,
+                quality=config.SPECTATOR_QUALITY, host=config.SPECTATOR_HOST, port=args.spectator
+            ).start()
+            print(f"📺 Spectator stream at {spectator.url}/")
+        game = FruitNinjaGame(config=config, session_recorder=recorder,
+                              leaderboard_overlay=overlay, video_recorder=video_recorder,
+                              spectator=spectator)
         final_score = game.run()
+        if overlay is not None:
+            overlay.stop(timeout=0)
+        
+        if recorder:
+            recorder.save(args.record_session)
+            print(f"📼 Session recorded to {args.record_session}")
+        
+        if spectator:
+            spectator.stop()
+        if video_recorder:
+            video_recorder.stop()
+            stats = video_recorder.stats()
+            if args.record_video:
+                print(f"🎥 {stats['written']} frames recorded to {args.record_video} "
+                      f"({stats['dropped']} dropped)")
         
         # Handle leaderboard submission
         if final_score is not None and final_score > 0:
             print(f"\n🎉 Final Score: {final_score}")
             
-            # Try to submit to leaderboard
-            try:
-                leaderboard = Leaderboard()
-                if leaderboard.submit_score(args.player_name, final_score, args.difficulty):
+            # The gameplay trace lets the leaderboard re-check the score later
+            replay = game.replay.encode()
+            if submitter is None:
+                # Keep the score; it is uploaded once the leaderboard is reachable
+                journal.append(args.player_name, final_score, args.difficulty, replay=replay)
+                print("📥 Score saved locally and will be uploaded on a later run")
+                print(f"   Make sure to set up the database table. Run: python scripts/setup_database.py")
+            else:
+                submitter.submit(args.player_name, final_score, args.difficulty, replay=replay)
+                if submitter.flush(timeout=args.submit_timeout):
                     print("✅ Score submitted to leaderboard!")
-                    
-                    # Show top scores if requested
-                    if args.show_leaderboard:
-                        print("\n" + "=" * 50)
-                        print("  TOP 10 SCORES")
-                        print("=" * 50)
-                        top_scores = leaderboard.get_top_scores(limit=10, difficulty=args.difficulty)
-                        for idx, entry in enumerate(top_scores, 1):
-                            player = entry['player_name']
-                            score = entry['score']
-                            marker = "👑" if player == args.player_name else "  "
-                            print(f"{marker} {idx:2d}. {player:20s} - {score:5d}")
                 else:
-                    print("⚠️  Could not submit score to leaderboard")
-            except Exception as e:
-                print(f"⚠️  Leaderboard unavailable: {e}")
-                print(f"   Make sure to set up the database table. Run: python scripts/setup_database.py")
+                    print("📥 Leaderboard is slow or offline - score saved locally "
+                          "and will be uploaded automatically")
+                
+                percentile = leaderboard.get_percentile(final_score, args.difficulty)
+                if percentile is not None:
+                    print(f"📈 You beat {percentile:.0f}% of {args.difficulty} games "
+                          f"(about #{leaderboard.get_approximate_rank(final_score, args.difficulty)})")
+                
+                # Show top scores if requested
+                if args.show_leaderboard:
+                    print("\n" + "=" * 50)
+                    print("  TOP 10 SCORES")
+                    print("=" * 50)
+                    standings = leaderboard.standings(args.player_name, args.difficulty, limit=10)
+                    for idx, entry in enumerate(standings['top_scores'], 1):
+                        player = entry['player_name']
+                        score = entry['score']
+                        marker = "👑" if player == args.player_name else "  "
+                        print(f"{marker} {idx:2d}. {player:20s} - {score:5d}")
+                    if standings['rank'] is not None and standings['rank'] > 10:
+                        print("   ...")
+                        for entry in leaderboard.get_players_around(args.player_name,
+                                                                    args.difficulty, k=3):
+                            player = entry['player_name']
+                            marker = "👉" if player == args.player_name else "  "
+                            print(f"{marker} {entry['rank']:2d}. {player:20s} - {entry['score']:5d}")
+                    if standings['rank'] is not None:
+                        print(f"\nYour rank: #{standings['rank']} "
+                              f"(best: {standings['best_score']})")
+        
+        if submitter is not None:
+            submitter.stop(timeout=0)
         
     except KeyboardInterrupt:
         print("\n\nGame interrupted by user")
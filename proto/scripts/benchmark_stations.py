@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark hand tracking for several stations: one process with an
+InferencePool against one process per camera
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+import time
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+os.chdir(project_root)
+
+import numpy as np
+
+from src.core.config import GameConfig
+from src.cv.backends import create_tracker
+from src.cv.capture import SyntheticSource
+from src.cv.inference_pool import InferencePool, pooled_tracker_factory
+
+
+def usage():
+    """CPU seconds and peak RSS in MB of this process"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # bytes on macOS, KB on Linux
+    return own.ru_utime + own.ru_stime, own.ru_maxrss / scale
+
+
+def make_config(args):
+    config = GameConfig()
+    config.TRACKER_BACKEND = args.tracker
+    return config
+
+
+def run_pool(args, results):
+    """Every station in this process, trackers run by args.workers threads"""
+    config = make_config(args)
+    pool = InferencePool(pooled_tracker_factory(config), args.workers)
+    stations = [pool.station() for _ in range(args.stations)]
+    deadline = time.monotonic() + args.seconds
+
+    def camera(tracker):
+        source = SyntheticSource(args.width, args.height, fps=args.camera_fps)
+        while time.monotonic() < deadline:
+            ok, frame = source.read()
+            if not ok:
+                break
+            tracker.process_frame(frame, int(time.monotonic() * 1000))
+
+    cpu_before, _ = usage()
+    threads = [threading.Thread(target=camera, args=(s,)) for s in stations]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = pool.stats()
+    pool.close(timeout=1.0)
+    cpu_after, peak_mb = usage()
+    results.put({'stations': list(stats.values()), 'cpu_s': cpu_after - cpu_before,
+                 'peak_mb': peak_mb})
+
+
+def run_process(args, results):
+    """One station: its own tracker, run synchronously on every frame"""
+    tracker = create_tracker(args.tracker, make_config(args))
+    source = SyntheticSource(args.width, args.height, fps=args.camera_fps)
+    latencies = []
+    deadline = time.monotonic() + args.seconds
+    cpu_before, _ = usage()
+    while time.monotonic() < deadline:
+        ok, frame = source.read()
+        if not ok:
+            break
+        start = time.perf_counter()
+        tracker.process_frame(frame, int(time.monotonic() * 1000))
+        latencies.append((time.perf_counter() - start) * 1000)
+    tracker.close()
+    cpu_after, peak_mb = usage()
+    latencies.sort()
+    results.put({'stations': [{
+        'processed': len(latencies), 'dropped': 0,
+        'latency_ms': sum(latencies) / len(latencies) if latencies else None,
+        'p95_ms': latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+    }], 'cpu_s': cpu_after - cpu_before, 'peak_mb': peak_mb})
+
+
+def measure(target, processes, args):
+    """Run target in fresh processes and merge what they report"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    children = [context.Process(target=target, args=(args, results)) for _ in range(processes)]
+    for child in children:
+        child.start()
+    reports = [results.get() for _ in children]
+    for child in children:
+        child.join()
+    stations = [s for report in reports for s in report['stations']]
+    return {
+        'fps': [s['processed'] / args.seconds for s in stations],
+        'latency_ms': np.mean([s['latency_ms'] for s in stations if s['latency_ms'] is not None]),
+        'p95_ms': max(s['p95_ms'] for s in stations if s['p95_ms'] is not None),
+        'dropped': sum(s['dropped'] for s in stations),
+        'cpu_s': sum(r['cpu_s'] for r in reports),
+        'peak_mb': sum(r['peak_mb'] for r in reports),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare a shared inference pool with one process per camera')
+    parser.add_argument('--stations', type=int, default=4, help='Synthetic cameras (default: 4)')
+    parser.add_argument('--workers', type=int, default=GameConfig.INFERENCE_WORKERS,
+                        help='Pool worker threads (default: %(default)s)')
+    parser.add_argument('--tracker', choices=['solutions', 'blob'], default='solutions')
+    parser.add_argument('--seconds', type=float, default=10.0, help='Run time per mode')
+    parser.add_argument('--camera-fps', type=float, default=30.0)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"  {args.stations} synthetic station(s) at {args.camera_fps:.0f} FPS, "
+          f"{args.tracker} tracker, {args.seconds:.0f}s per mode")
+    print("=" * 78)
+    modes = [(f"pool ({args.workers} workers)", run_pool, 1),
+             (f"{args.stations} processes", run_process, args.stations)]
+    for label, target, processes in modes:
+        r = measure(target, processes, args)
+        print(f"{label:20s} tracked {np.mean(r['fps']):5.1f} FPS/station (min {min(r['fps']):5.1f})  "
+              f"latency {r['latency_ms']:6.1f} ms  p95 {r['p95_ms']:6.1f} ms")
+        print(f"{'':20s} dropped {r['dropped']:5d}  CPU {r['cpu_s']:6.1f} s  "
+              f"peak RSS {r['peak_mb']:6.0f} MB")
+    print("=" * 78)
+    print("Pool latency includes waiting for a worker; process latency is inference only")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark hand tracker backends on this machine and pick the best one
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+os.chdir(project_root)
+
+import cv2
+import numpy as np
+
+from src.core.config import GameConfig
+from src.cv.backends import available_backends, create_tracker
+from src.cv.capture import SyntheticSource
+
+
+def synthetic_frames(count, width, height):
+    """Frames with a skin-colored hand blob sweeping across the screen"""
+    source = SyntheticSource(width, height, fps=None)
+    return [source.render(i) for i in range(count)]
+
+
+def camera_frames(count, width, height, camera):
+    """Grab frames from a camera (or video file) up front"""
+    cap = cv2.VideoCapture(camera)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.flip(frame, 1))
+    cap.release()
+    return frames
+
+
+def benchmark(name, config, frames, target_fps, warmup=10):
+    """
+    Return per-frame latencies in milliseconds and results delivered per second
+
+    Synchronous trackers are timed around process_frame(). Asynchronous ones
+    (with result_timestamp_ms) only queue the frame there, so they get frames
+    at target_fps and latency runs from submitting a frame until its result
+    is delivered; frames they drop deliver no result.
+    """
+    tracker = create_tracker(name, config)
+    try:
+        for frame in frames[:warmup]:
+            tracker.process_frame(frame)
+        if hasattr(tracker, 'result_timestamp_ms'):
+            return benchmark_async(tracker, frames, target_fps)
+        times = []
+        started = time.perf_counter()
+        for frame in frames:
+            start = time.perf_counter()
+            tracker.process_frame(frame, int(time.monotonic() * 1000))
+            times.append((time.perf_counter() - start) * 1000)
+        return times, len(frames) / (time.perf_counter() - started)
+    finally:
+        tracker.close()
+
+
+def benchmark_async(tracker, frames, target_fps, drain_s=1.0):
+    """Submit frames at target_fps and time each result against its submission"""
+    interval = 1.0 / target_fps
+    base_ms = int(time.monotonic() * 1000) + 1  # after the warmup frames
+    submitted = {}  # frame timestamp -> perf_counter at submission
+    times = []
+    last_result = tracker.result_timestamp_ms
+
+    def poll():
+        nonlocal last_result
+        result = tracker.result_timestamp_ms
+        if result != last_result and result in submitted:
+            times.append((time.perf_counter() - submitted[result]) * 1000)
+        last_result = result
+
+    started = time.perf_counter()
+    for i, frame in enumerate(frames):
+        while time.perf_counter() < started + i * interval:
+            poll()
+            time.sleep(0.0005)
+        timestamp_ms = base_ms + int(i * interval * 1000)
+        submitted[timestamp_ms] = time.perf_counter()
+        tracker.process_frame(frame, timestamp_ms)
+        poll()
+    deadline = time.perf_counter() + drain_s
+    while last_result < timestamp_ms and time.perf_counter() < deadline:
+        poll()
+        time.sleep(0.0005)
+    return times, len(times) / (time.perf_counter() - started)
+
+
+def write_env(backend, path='.env'):
+    """Set HAND_TRACKER_BACKEND in the local .env file"""
+    lines = []
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            lines = [l for l in f.read().splitlines()
+                     if not l.startswith('HAND_TRACKER_BACKEND=')]
+    lines.append(f"HAND_TRACKER_BACKEND={backend}")
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hand tracker backends')
+    parser.add_argument('--backends', nargs='+', default=available_backends(),
+                        help='Backends to benchmark (default: all registered)')
+    parser.add_argument('--frames', type=int, default=200, help='Frames per backend')
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--camera', default=None,
+                        help='Camera index or video file (default: synthetic frames)')
+    parser.add_argument('--target-fps', type=float, default=GameConfig.FPS,
+                        help='Frame rate the game must sustain (default: %(default)s)')
+    parser.add_argument('--prefer', nargs='+', default=['tasks', 'solutions', 'blob'],
+                        help='Preference order when several backends are fast enough')
+    parser.add_argument('--write-env', action='store_true',
+                        help='Store the recommended backend in .env for this machine')
+    args = parser.parse_args()
+
+    if args.camera is None:
+        frames = synthetic_frames(args.frames, args.width, args.height)
+        source = 'synthetic'
+    else:
+        camera = int(args.camera) if args.camera.isdigit() else args.camera
+        frames = camera_frames(args.frames, args.width, args.height, camera)
+        source = str(args.camera)
+    if not frames:
+        print("❌ No frames captured")
+        return 1
+
+    config = GameConfig()
+    budget_ms = 1000.0 / args.target_fps
+
+    print("=" * 70)
+    print(f"  Tracker benchmark ({len(frames)} frames, {args.width}x{args.height}, {source})")
+    print("=" * 70)
+
+    results, fast = {}, set()
+    for name in args.backends:
+        try:
+            times, rate = benchmark(name, config, frames, args.target_fps)
+        except Exception as e:
+            print(f"⚠️  {name:10s} unavailable: {e}")
+            continue
+        if not times:
+            print(f"❌ {name:10s} delivered no results")
+            continue
+        times = np.array(times)
+        mean, p95 = times.mean(), np.percentile(times, 95)
+        results[name] = p95
+        # Fast enough: within the frame budget, with a result for (nearly) every frame
+        if p95 <= budget_ms and rate >= 0.9 * args.target_fps:
+            fast.add(name)
+        status = "✅" if name in fast else "❌"
+        print(f"{status} {name:10s} mean {mean:6.2f} ms  p95 {p95:6.2f} ms  "
+              f"{rate:5.0f} results/s")
+
+    if not results:
+        print("❌ No backend could be benchmarked")
+        return 1
+
+    fast_enough = [name for name in args.prefer if name in fast]
+    recommended = fast_enough[0] if fast_enough else min(results, key=results.get)
+
+    print("=" * 70)
+    print(f"Recommended backend for {args.target_fps:.0f} FPS: {recommended}")
+    if args.write_env:
+        write_env(recommended)
+        print(f"✅ Wrote HAND_TRACKER_BACKEND={recommended} to .env")
+    else:
+        print(f"Use it with: python main.py --tracker {recommended}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
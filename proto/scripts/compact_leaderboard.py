@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Leaderboard retention job: archive old games into daily roll-ups
+
+Run it periodically (e.g. a nightly cron entry). Games older than the
+retention window are folded into per-day aggregates and score histograms and
+deleted, except each difficulty's top games and every player's best game,
+so the leaderboard table stays bounded while leaderboard_stats still counts
+every game ever played.
+
+Supabase needs docs/retention.sql applied and SUPABASE_SERVICE_KEY set.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(project_root, '.env'))
+
+from src.leaderboard import AdminStorage, SupabaseStorage, create_storage
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive old leaderboard games')
+    parser.add_argument('--backend', choices=['supabase', 'sqlite'],
+                        help='Storage backend (default: LEADERBOARD_BACKEND or supabase)')
+    parser.add_argument('--retain-days', type=int, default=90,
+                        help='Keep every game newer than this (default: 90)')
+    parser.add_argument('--keep-top', type=int, default=100,
+                        help='Keep this many top games per difficulty (default: 100)')
+    args = parser.parse_args()
+
+    backend = args.backend or os.getenv('LEADERBOARD_BACKEND', 'supabase')
+    if backend == 'supabase':
+        service_key = os.getenv('SUPABASE_SERVICE_KEY')
+        if not service_key:
+            print("❌ Set SUPABASE_SERVICE_KEY (compaction is not allowed with the anon key)")
+            return 1
+        from supabase import create_client
+        storage = SupabaseStorage(client=create_client(os.getenv('SUPABASE_URL'), service_key))
+    else:
+        storage = create_storage(backend)
+    if not isinstance(storage, AdminStorage):
+        storage.close()
+        print(f"❌ Compact the database itself, not the '{backend}' backend (pass --backend)")
+        return 1
+
+    try:
+        before = storage.count_scores()
+        start = time.perf_counter()
+        archived = storage.compact(args.retain_days, args.keep_top)
+        elapsed = time.perf_counter() - start
+    finally:
+        storage.close()
+
+    print(f"✅ Archived {archived} of {before} game(s) older than {args.retain_days} days "
+          f"in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
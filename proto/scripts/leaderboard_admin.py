@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Leaderboard admin tool: count, export (backup) and import (restore/migrate)
+
+Exports stream the table with keyset pagination and write rows as they
+arrive, so memory stays flat however large the leaderboard is.
+"""
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(project_root, '.env'))
+
+from src.leaderboard import Leaderboard, create_storage
+from src.leaderboard.storage import DIFFICULTIES, SCAN_ORDERS
+from src.leaderboard.transfer import FORMATS, export_scores, format_for, import_scores, read_scores
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Leaderboard backup and migration')
+    parser.add_argument('--backend', choices=['supabase', 'sqlite'],
+                        help='Storage backend (default: LEADERBOARD_BACKEND or supabase)')
+    parser.add_argument('--difficulty', choices=DIFFICULTIES, help='Only this difficulty')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('count', help='Count rows on the server')
+
+    export = commands.add_parser('export', help='Stream the table to a file')
+    export.add_argument('output', help="Output file (.csv or .jsonl; '-' for stdout)")
+    export.add_argument('--format', choices=FORMATS, help='Default: from the file extension')
+    export.add_argument('--order', choices=SCAN_ORDERS, default='score',
+                        help='Keyset column (default: score)')
+    export.add_argument('--page-size', type=int, default=1000, help='Rows per request')
+
+    restore = commands.add_parser('import', help='Upload an export in bulk chunks')
+    restore.add_argument('input', help="Input file (.csv or .jsonl; '-' for stdin)")
+    restore.add_argument('--format', choices=FORMATS, help='Default: from the file extension')
+    restore.add_argument('--chunk-size', type=int, default=500, help='Rows per request')
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    storage = create_storage(args.backend)
+
+    try:
+        if args.command == 'count':
+            print(storage.count_scores(args.difficulty))
+            return 0
+
+        if args.command == 'export':
+            fmt = args.format or format_for(args.output)
+            if args.output == '-':
+                written = export_scores(storage, sys.stdout, fmt, args.order,
+                                        args.page_size, args.difficulty)
+            else:
+                with open(args.output, 'w', newline='') as f:
+                    written = export_scores(storage, f, fmt, args.order,
+                                            args.page_size, args.difficulty)
+            print(f"✅ Exported {written} row(s)", file=sys.stderr)
+            return 0
+
+        fmt = args.format or format_for(args.input)
+        source = sys.stdin if args.input == '-' else open(args.input, newline='')
+        with source:
+            entries = read_scores(source, fmt)
+            if args.difficulty:
+                entries = (e for e in entries
+                           if 'error' in e or e['difficulty'] == args.difficulty)
+            stats = import_scores(Leaderboard(storage, cache_ttl=0), entries, args.chunk_size)
+
+        print(f"✅ Imported {stats['ok']} of {stats['rows']} row(s), {stats['rejected']} rejected "
+              "(rows already present are skipped)", file=sys.stderr)
+        for error in stats['errors']:
+            print(f"   ❌ {error}", file=sys.stderr)
+        return 1 if stats['failed'] else 0
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Run the LAN leaderboard proxy shared by several kiosks
+
+Kiosks point at it with LEADERBOARD_BACKEND=proxy and
+LEADERBOARD_PROXY_URL=http://<proxy-host>:8765.
+
+The proxy has no authentication: anyone who can reach the port can post
+scores. It listens on 127.0.0.1 unless --host says otherwise; when serving
+the LAN with --host 0.0.0.0, firewall the port to the kiosks.
+"""
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(project_root, '.env'))
+
+from src.leaderboard import LeaderboardProxy, ScoreJournal, create_storage
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Leaderboard aggregation proxy for kiosks')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="Interface to listen on (default: %(default)s; '0.0.0.0' for "
+                             "the LAN, with the port firewalled to the kiosks)")
+    parser.add_argument('--port', type=int, default=8765, help='TCP port')
+    parser.add_argument('--upstream', choices=['supabase', 'sqlite'],
+                        help='Upstream backend (default: LEADERBOARD_BACKEND or supabase)')
+    parser.add_argument('--journal', default='data/proxy_journal.db',
+                        help='Write-behind journal for scores not yet upstream')
+    parser.add_argument('--cache-ttl', type=float, default=5.0,
+                        help='Seconds reads are served from the cache')
+    parser.add_argument('--linger', type=float, default=0.2,
+                        help='Seconds to collect writes into one upstream batch')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.upstream is None and os.getenv('LEADERBOARD_BACKEND') == 'proxy':
+        print("❌ LEADERBOARD_BACKEND=proxy would forward to itself; pass --upstream")
+        return 1
+
+    proxy = LeaderboardProxy(create_storage(args.upstream), ScoreJournal(args.journal),
+                             host=args.host, port=args.port,
+                             cache_ttl=args.cache_ttl, linger=args.linger)
+    print(f"🏆 Leaderboard proxy on {proxy.url} ({proxy.submitter.pending()} score(s) queued)")
+    try:
+        proxy.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping proxy")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Build the personal_bests table from the existing leaderboard
+
+SQLite: creates the table and trigger and backfills them directly.
+Supabase: DDL cannot go through the REST API, so this prints the migration
+(docs/personal_bests.sql) to run in the SQL editor and then verifies it.
+"""
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(project_root, '.env'))
+
+from src.leaderboard import SQLiteStorage, SupabaseStorage
+
+SQL_FILE = os.path.join(project_root, 'docs', 'personal_bests.sql')
+
+
+def migrate_sqlite(path: str) -> int:
+    storage = SQLiteStorage(path)
+    storage.migrate_personal_bests()
+    games = storage.count_scores()
+    players = storage.count_personal_bests()
+    storage.close()
+    print(f"✅ personal_bests built from {games} game(s): {players} player/difficulty row(s)")
+    return 0
+
+
+def verify_supabase() -> int:
+    storage = SupabaseStorage()
+    try:
+        response = storage.client.table('personal_bests').select(
+            'score', count='exact', head=True).execute()
+    except Exception as e:
+        print("❌ personal_bests table not found. Run this in the Supabase SQL editor:")
+        print("=" * 70)
+        with open(SQL_FILE) as f:
+            print(f.read())
+        print("=" * 70)
+        print(f"   ({e})")
+        return 1
+
+    games = storage.count_scores()
+    players = response.count or 0
+    if games and not players:
+        print("❌ personal_bests is empty - run the backfill INSERT from docs/personal_bests.sql")
+        return 1
+    print(f"✅ personal_bests has {players} player/difficulty row(s) for {games} game(s)")
+    print("   Set LEADERBOARD_PERSONAL_BESTS=1 in .env to use it")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the personal_bests table')
+    parser.add_argument('--backend', choices=['supabase', 'sqlite'],
+                        default=os.getenv('LEADERBOARD_BACKEND', 'supabase'),
+                        help='Leaderboard backend (default: LEADERBOARD_BACKEND or supabase)')
+    parser.add_argument('--db', default=os.getenv('LEADERBOARD_DB_PATH', 'data/leaderboard.db'),
+                        help='SQLite database (default: LEADERBOARD_DB_PATH)')
+    args = parser.parse_args()
+
+    if args.backend == 'sqlite':
+        return migrate_sqlite(args.db)
+    return verify_supabase()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
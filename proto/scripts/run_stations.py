@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Run several camera stations from one process with a shared hand tracker pool
+
+Replaces one main.py per camera: every station keeps its own tracking
+graph, but a few shared worker threads run them, and per-station tracking
+latency is printed at the end.
+"""
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(project_root, '.env'))
+
+from main import create_config
+from src.core.stations import MultiStationRunner
+from src.cv.capture import CAPTURE_BACKENDS
+
+POOLED_TRACKERS = ['solutions', 'blob']
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Several Fruit Ninja CV stations, one process')
+    parser.add_argument('--cameras', nargs='+', default=['0', '1', '2', '3'],
+                        help="Camera indices, stream URLs, files or 'synthetic', one per "
+                             "station (default: 0 1 2 3)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Threads running the hand trackers (default: 2)')
+    parser.add_argument('--difficulty', choices=['easy', 'medium', 'hard'], default='medium')
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--tracker', choices=POOLED_TRACKERS,
+                        default=os.getenv('HAND_TRACKER_BACKEND', 'solutions'),
+                        help="Hand tracking backend (default: $HAND_TRACKER_BACKEND or "
+                             "solutions; 'tasks' cannot be pooled)")
+    parser.add_argument('--debug', action='store_true', help='Show hand landmarks')
+    parser.add_argument('--no-trail', action='store_true')
+    parser.add_argument('--no-particles', action='store_true')
+    parser.add_argument('--capture-backend', choices=list(CAPTURE_BACKENDS), default='any',
+                        help="Camera API for every station, e.g. 'v4l2'")
+    parser.add_argument('--fourcc', default=None, help='Camera pixel format, e.g. MJPG')
+    parser.add_argument('--camera-fps', type=float, default=None)
+    parser.add_argument('--camera-buffer', type=int, default=None)
+    parser.add_argument('--capture-stats', action='store_true')
+    parser.add_argument('--presenter', choices=['window', 'inline', 'null'], default='window')
+    parser.add_argument('--present-stats', action='store_true')
+    parser.add_argument('--gc', choices=['auto', 'idle'], default='auto')
+    parser.add_argument('--gc-stats', action='store_true')
+    parser.add_argument('--model-path', default=None)
+    args = parser.parse_args()
+    # argparse does not check defaults against choices
+    if args.tracker not in POOLED_TRACKERS:
+        parser.error(f"HAND_TRACKER_BACKEND={args.tracker!r} cannot be pooled; "
+                     f"pass --tracker {' or '.join(POOLED_TRACKERS)}")
+    return args
+
+
+def main():
+    args = parse_args()
+    config = create_config(args)
+    cameras = [int(c) if c.isdigit() else c for c in args.cameras]
+
+    runner = MultiStationRunner(cameras, config, workers=args.workers)
+    scores = runner.run()
+
+    print(f"\n{'Station':10s} {'Score':>6s} {'Frames':>7s} {'Dropped':>8s} "
+          f"{'Latency':>9s} {'p95':>8s}")
+    stats = runner.stats()
+    for name, score in scores.items():
+        s = stats.get(name, {})
+        latency = f"{s['latency_ms']:.1f} ms" if s.get('latency_ms') is not None else '-'
+        p95 = f"{s['p95_ms']:.1f} ms" if s.get('p95_ms') is not None else '-'
+        print(f"{name:10s} {score:6d} {s.get('processed', 0):7d} {s.get('dropped', 0):8d} "
+              f"{latency:>9s} {p95:>8s}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
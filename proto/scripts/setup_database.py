@@ -111,9 +111,9 @@ CREATE TABLE IF NOT EXISTS leaderboard (
         print("✅ Table 'leaderboard' exists and is accessible!")
         print()
         
-        # Check if there are any scores
-        count_response = client.table('leaderboard').select('*', count='exact').execute()
-        score_count = len(count_response.data) if count_response.data else 0
+        # Check if there are any scores (HEAD request: the server counts, no rows are sent)
+        count_response = client.table('leaderboard').select('id', count='exact', head=True).execute()
+        score_count = count_response.count or 0
         
         if score_count > 0:
             print(f"📊 Found {score_count} score(s) in the leaderboard")
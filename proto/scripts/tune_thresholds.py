@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Sweep gesture/slice thresholds over recorded landmark sessions
+
+Sessions are grouped by difficulty, replayed in batched form
+(src/cv/batch_replay.py) and every grid point is evaluated in a process pool.
+
+Recorded sessions carry every fruit as a target, sliced or missed, so slice
+miss rates need nothing else. Gesture error rates need per-frame slashing
+labels, which the game does not record: annotate them outside this repo and
+save them into each session file as its 'labels' array (one bool per frame;
+LandmarkSession.load(), set .labels, .save()). A setting is only suggested
+for difficulties with labeled slashes: slice misses alone always favour the
+loosest thresholds.
+"""
+import math
+import argparse
+import csv
+import glob
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+
+from src.core.config import GameConfig, DifficultyLevel
+from src.cv.batch_replay import SessionBatch, evaluate, slash_mask
+from src.cv.session import LandmarkSession
+
+PARAMETERS = ['MIN_SLASH_VELOCITY', 'GESTURE_HISTORY_SIZE', 'TRAIL_COLLISION_WINDOW', 'SLICE_THRESHOLD']
+
+# Sessions loaded once per worker process by _init_worker
+_batches = {}
+# Last gesture pass per worker; consecutive grid points usually share it
+_last_mask = {'key': None, 'mask': None}
+
+
+def load_sessions(paths):
+    """Load sessions and group them by difficulty"""
+    groups = {}
+    for path in paths:
+        session = LandmarkSession.load(path)
+        groups.setdefault(session.difficulty, []).append(session)
+    return groups
+
+
+def _init_worker(paths):
+    for difficulty, sessions in load_sessions(paths).items():
+        _batches[difficulty] = SessionBatch(sessions)
+
+
+def _evaluate(task):
+    difficulty, (velocity, history, window, threshold) = task
+    batch = _batches[difficulty]
+    key = (difficulty, history, velocity)
+    if _last_mask['key'] != key:
+        _last_mask['key'] = key
+        _last_mask['mask'] = slash_mask(batch.fingertips, history, velocity)
+
+    metrics = evaluate(
+        batch,
+        history_size=history,
+        min_velocity=velocity,
+        collision_window=window,
+        slice_threshold=threshold,
+        trail_lifetime=GameConfig.TRAIL_LIFETIME,
+        slashing=_last_mask['mask']
+    )
+    # Rates without data (NaN) are left out; no data at all costs NaN
+    rates = [metrics[k] for k in ('gesture_fp_rate', 'gesture_miss_rate', 'slice_miss_rate')
+             if not math.isnan(metrics[k])]
+    metrics['cost'] = sum(rates) if rates else math.nan
+    return difficulty, (velocity, history, window, threshold), metrics
+
+
+def _rank(result):
+    cost = result[2]['cost']
+    return math.inf if math.isnan(cost) else cost
+
+
+def _rate(value, width):
+    return f"{'-':>{width}s}" if math.isnan(value) else f"{value:{width}.1%}"
+
+
+def current_setting(difficulty):
+    """Parameters currently used for a difficulty level"""
+    level = getattr(DifficultyLevel, difficulty.upper(), DifficultyLevel.MEDIUM)
+    return (
+        level['min_velocity'],
+        level['history_size'],
+        level['collision_window'],
+        level['slice_threshold'],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Tune gesture and slice thresholds',
+        epilog="Settings are only suggested for sessions with slashing labels. The game "
+               "does not record labels: annotate them yourself and save them into each "
+               "session's 'labels' array (one bool per frame).")
+    parser.add_argument('sessions', nargs='+',
+                        help='Session files or glob patterns (.npz from --record-session)')
+    parser.add_argument('--velocity', type=float, nargs='+',
+                        default=[0.01, 0.015, 0.02, 0.03, 0.04, 0.05, 0.07])
+    parser.add_argument('--history', type=int, nargs='+', default=[4, 6, 8, 10, 14])
+    parser.add_argument('--window', type=float, nargs='+', default=[0.15, 0.2, 0.3, 0.4])
+    parser.add_argument('--threshold', type=float, nargs='+', default=[10, 15, 20, 30])
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Worker processes (default: all cores)')
+    parser.add_argument('--top', type=int, default=5, help='Settings to show per difficulty')
+    parser.add_argument('--output', help='Write every result to this CSV file')
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.sessions for p in glob.glob(pattern)})
+    if not paths:
+        print("❌ No session files found")
+        return 1
+
+    difficulties = sorted(load_sessions(paths))
+    grid = list(itertools.product(args.velocity, args.history, args.window, args.threshold))
+    tasks = [(d, setting) for d in difficulties for setting in grid]
+    for d in difficulties:
+        if current_setting(d) not in grid:
+            tasks.append((d, current_setting(d)))
+
+    print(f"📂 {len(paths)} sessions, difficulties: {', '.join(difficulties)}")
+    print(f"🔧 {len(grid)} settings x {len(difficulties)} difficulties on {args.workers} workers")
+
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(paths,)) as pool:
+        chunksize = max(1, len(tasks) // (4 * args.workers))
+        results = list(pool.map(_evaluate, tasks, chunksize=chunksize))
+    print(f"⏱️  Finished in {time.time() - start:.1f}s")
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['difficulty'] + PARAMETERS + [
+                'gesture_fp_rate', 'gesture_miss_rate', 'slice_miss_rate', 'cost'])
+            for difficulty, setting, m in results:
+                writer.writerow([difficulty, *setting, m['gesture_fp_rate'],
+                                 m['gesture_miss_rate'], m['slice_miss_rate'], m['cost']])
+        print(f"📝 Results written to {args.output}")
+
+    for difficulty in difficulties:
+        rows = sorted((r for r in results if r[0] == difficulty), key=_rank)
+        baseline = next(r for r in rows if r[1] == current_setting(difficulty))
+        stats = rows[0][2]
+
+        print()
+        print("=" * 78)
+        print(f"  {difficulty.upper()}  ({stats['labeled_slashes']} labeled slashes, "
+              f"{stats['targets']} targets)")
+        print("=" * 78)
+        print(f"  {'velocity':>8s} {'history':>7s} {'window':>6s} {'thresh':>6s}   "
+              f"{'FP':>6s} {'miss':>6s} {'slice miss':>10s}")
+        for label, (_, setting, m) in [('current', baseline)] + [
+                (f"#{i}", row) for i, row in enumerate(rows[:args.top], 1)]:
+            velocity, history, window, threshold = setting
+            print(f"{label:>8s} {velocity:8.3f} {history:7d} {window:6.2f} {threshold:6.0f}   "
+                  f"{_rate(m['gesture_fp_rate'], 6)} {_rate(m['gesture_miss_rate'], 6)} "
+                  f"{_rate(m['slice_miss_rate'], 10)}")
+
+        if not stats['labeled_slashes']:
+            print(f"\n  ⚠️  No labeled slashes for {difficulty}: not suggesting a setting "
+                  "(sessions need externally annotated labels, see --help)")
+            continue
+        velocity, history, window, threshold = rows[0][1]
+        print(f"\n  Suggested DifficultyLevel.{difficulty.upper()}: 'min_velocity': {velocity}, "
+              f"'history_size': {history}, 'collision_window': {window}, "
+              f"'slice_threshold': {threshold:g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Replay verification job: re-run submitted games and flag scores that don't reproduce
+
+Each kiosk uploads a compact gameplay trace (RNG seed, gameplay config hash
+and the fingertip at every frame) with its score. This job replays the
+traces headlessly, far faster than real time and on every core, and stores a
+verdict per game: 'ok', 'mismatch' (the trace scores differently) or
+'invalid' (no trace, undecodable, wrong config or implausible input).
+
+Run it periodically (e.g. every few minutes); only games without a verdict
+are checked, including games submitted without a trace. Supabase needs docs/replay_verification.sql applied and
+SUPABASE_SERVICE_KEY set.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(project_root, '.env'))
+
+from src.core.replay import verify_rows
+from src.leaderboard import AdminStorage, SupabaseStorage, create_storage
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify leaderboard scores against their replays')
+    parser.add_argument('--backend', choices=['supabase', 'sqlite'],
+                        help='Storage backend (default: LEADERBOARD_BACKEND or supabase)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Replay processes (default: one per core)')
+    parser.add_argument('--batch', type=int, default=500,
+                        help='Games fetched and stored per round trip (default: 500)')
+    parser.add_argument('--limit', type=int, default=None,
+                        help='Stop after this many games (default: all pending)')
+    parser.add_argument('--verbose', action='store_true', help='Print every failed game')
+    args = parser.parse_args()
+
+    backend = args.backend or os.getenv('LEADERBOARD_BACKEND', 'supabase')
+    if backend == 'supabase':
+        service_key = os.getenv('SUPABASE_SERVICE_KEY')
+        if not service_key:
+            print("❌ Set SUPABASE_SERVICE_KEY (replays cannot be read with the anon key)")
+            return 1
+        from supabase import create_client
+        storage = SupabaseStorage(client=create_client(os.getenv('SUPABASE_URL'), service_key))
+    else:
+        storage = create_storage(backend)
+    if not isinstance(storage, AdminStorage):
+        storage.close()
+        print(f"❌ Replays are verified against the database itself, not the '{backend}' backend "
+              "(pass --backend)")
+        return 1
+
+    counts = {'ok': 0, 'mismatch': 0, 'invalid': 0}
+    start = time.perf_counter()
+    after = None
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        while args.limit is None or sum(counts.values()) < args.limit:
+            batch = args.batch if args.limit is None else min(args.batch,
+                                                              args.limit - sum(counts.values()))
+            rows = storage.pending_replays(batch, after)
+            if not rows:
+                break
+            results = list(verify_rows(rows, workers=1, executor=executor))
+            storage.set_verdicts(results)
+            for row, result in zip(rows, results):
+                counts[result['verdict']] += 1
+                if args.verbose and result['verdict'] != 'ok':
+                    print(f"⚠️  {row['player_name']} {row['score']} ({row['difficulty']}) "
+                          f"{result['verdict']}: {result['reason']}")
+            after = rows[-1]['submission_id']
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        storage.close()
+
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print(f"✅ Verified {total} game(s) in {elapsed:.1f}s: {counts['ok']} ok, "
+          f"{counts['mismatch']} mismatch, {counts['invalid']} invalid")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,10 @@ Core game logic and entities
 """
 
 from .config import GameConfig, DifficultyLevel
-from .entities import Fruit, Trail, TrailPoint
+from .entities import Fruit, ObjectPool, Trail, TrailPoint
+from .gc_control import GCController, GCPauseMonitor
+from .particles import ParticleSystem
+from .recording import GameplayRecorder, HighlightBuffer
 from .game import FruitNinjaGame
 
 __all__ = [
@@ -12,5 +15,11 @@ __all__ = [
     'Fruit',
     'Trail',
     'TrailPoint',
+    'ObjectPool',
+    'GCController',
+    'GCPauseMonitor',
+    'ParticleSystem',
+    'GameplayRecorder',
+    'HighlightBuffer',
     'FruitNinjaGame',
 ]
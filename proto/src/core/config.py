@@ -8,6 +8,7 @@ class GameConfig:
     # Display settings
     WINDOW_WIDTH = 640
     WINDOW_HEIGHT = 480
+    KIOSK_RESOLUTIONS = ((640, 480), (1280, 720), (1920, 1080))  # sizes replays verify at
     WINDOW_TITLE = "Fruit Ninja CV"
     FPS = 30
     
@@ -17,10 +18,29 @@ class GameConfig:
     FRUIT_VELOCITY = 5  # pixels per frame
     FRUIT_COLOR = (0, 255, 255)  # Yellow in BGR
     
+    # Capture (see src/cv/capture.py; scripts/benchmark_capture.py picks a mode)
+    CAMERA_SOURCE = '0'  # index, device, URL, video file, image glob or 'synthetic'
+    CAMERA_BACKEND = 'any'  # 'v4l2' on Linux for FOURCC/buffer control
+    CAMERA_FOURCC = None  # e.g. 'MJPG' (compressed, high FPS) or 'YUYV'
+    CAMERA_FPS = None  # frame rate requested from the camera
+    CAMERA_BUFFER_SIZE = None  # 1: always read the newest frame
+    CAPTURE_STATS = False  # print delivered FPS and capture latency at exit
+    
     # Hand tracking settings
     MAX_HANDS = 1
     DETECTION_CONFIDENCE = 0.7
     TRACKING_CONFIDENCE = 0.7
+    TRACKER_BACKEND = 'solutions'  # see src/cv/backends.py: solutions, tasks, blob
+    HAND_LANDMARKER_MODEL = 'data/hand_landmarker.task'
+    TRACKER_STATIC_IMAGE_MODE = False  # solutions: no tracking between frames
+    
+    # Multi-station runner (scripts/run_stations.py)
+    INFERENCE_WORKERS = 2  # threads running the stations' hand trackers
+    
+    # Blob tracker (low-end CPU fallback) settings
+    BLOB_TRACKER_WIDTH = 160  # processing width in pixels
+    BLOB_MIN_AREA = 0.01  # minimum blob area as fraction of the frame
+    BLOB_USE_MOTION = True  # prefer moving skin blobs over static ones
     
     # Gesture detection settings
     GESTURE_HISTORY_SIZE = 10
@@ -33,9 +53,41 @@ class GameConfig:
     TRAIL_MAX_THICKNESS = 8
     TRAIL_COLLISION_WINDOW = 0.3  # seconds
     
+    # Slice effects (see src/core/particles.py)
+    PARTICLES = True  # juice splashes and fruit halves
+    PARTICLE_CAPACITY = 4096  # live particles; more are dropped
+    PARTICLE_GRAVITY = 900.0  # pixels/s^2
+    JUICE_PARTICLES = 40  # droplets per sliced fruit
+    
     # Collision detection
     SLICE_THRESHOLD = 20  # pixels from trail to fruit
     
+    # In-game leaderboard (shown when a LeaderboardOverlay is passed to the game)
+    ATTRACT_IDLE_SECONDS = 10.0  # show the boards after this long without a hand
+    GAME_OVER_SECONDS = 8.0  # boards stay up this long after 'q' (again to skip)
+    
+    # Gameplay recording (see src/core/recording.py)
+    RECORD_QUEUE_SIZE = 32  # frames waiting for the encoder before drops
+    HIGHLIGHT_SECONDS = 10.0  # instant-replay buffer length
+    HIGHLIGHT_COMBO = 3  # fruits sliced in a row that save a highlight clip
+    COMBO_WINDOW = 0.5  # seconds between slices that still count as a row
+    HIGHLIGHT_DIR = 'data/highlights'
+    
+    # Spectator stream (see src/ui/spectator.py)
+    SPECTATOR_FPS = 10
+    SPECTATOR_QUALITY = 70  # JPEG quality
+    SPECTATOR_HOST = '0.0.0.0'  # the big screen and monitoring page are on the LAN
+    
+    # Presentation (see src/ui/presenter.py)
+    PRESENTER = 'window'  # 'window' (display thread), 'inline' (macOS) or 'null' (headless)
+    PRESENTER_STATS = False  # print presentation latency at exit
+    
+    # Garbage collection (see src/core/gc_control.py)
+    GC_MODE = 'auto'  # 'idle': collect only in slack at the end of a frame
+    GC_FREEZE = True  # exclude startup objects from collections
+    GC_MIN_SLACK = 0.002  # seconds left in the frame needed to collect
+    GC_STATS = False  # print GC pauses and the frames they hit at exit
+    
     # Debug settings
     DEBUG_MODE = False
     SHOW_HAND_LANDMARKS = False
@@ -43,22 +95,43 @@ class GameConfig:
 
 
 class DifficultyLevel:
-    """Predefined difficulty levels"""
+    """Predefined difficulty levels (tune with scripts/tune_thresholds.py)"""
     
     EASY = {
         'spawn_interval': 2.0,
         'fruit_velocity': 3,
-        'min_velocity': 0.05
+        'min_velocity': 0.05,
+        'history_size': 10,
+        'collision_window': 0.3,
+        'slice_threshold': 20
     }
     
     MEDIUM = {
         'spawn_interval': 1.5,
         'fruit_velocity': 5,
-        'min_velocity': 0.03
+        'min_velocity': 0.03,
+        'history_size': 10,
+        'collision_window': 0.3,
+        'slice_threshold': 20
     }
     
     HARD = {
         'spawn_interval': 1.0,
         'fruit_velocity': 7,
-        'min_velocity': 0.02
+        'min_velocity': 0.02,
+        'history_size': 10,
+        'collision_window': 0.3,
+        'slice_threshold': 20
     }
+
+
+def apply_difficulty(config, difficulty):
+    """Set the gameplay values of a DifficultyLevel preset ('easy', 'medium', 'hard') on config"""
+    preset = getattr(DifficultyLevel, difficulty.upper())
+    config.FRUIT_SPAWN_INTERVAL = preset['spawn_interval']
+    config.FRUIT_VELOCITY = preset['fruit_velocity']
+    config.MIN_SLASH_VELOCITY = preset['min_velocity']
+    config.GESTURE_HISTORY_SIZE = preset['history_size']
+    config.TRAIL_COLLISION_WINDOW = preset['collision_window']
+    config.SLICE_THRESHOLD = preset['slice_threshold']
+    return config
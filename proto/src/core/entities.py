@@ -5,10 +5,46 @@ import time
 from collections import deque
 
 
+class ObjectPool:
+    """
+    Free list of entity objects, so the frame loop recycles them instead of
+    allocating new ones (fewer allocations, fewer cyclic GC passes)
+    
+    Pooled classes implement reset(*args) with the same arguments as __init__.
+    """
+    
+    def __init__(self, cls, max_size=256):
+        self.cls = cls
+        self.max_size = max_size
+        self._free = []
+    
+    def acquire(self, *args, **kwargs):
+        """A reset object from the free list, or a new one if it is empty"""
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(*args, **kwargs)
+            return obj
+        return self.cls(*args, **kwargs)
+    
+    def release(self, obj):
+        """Return an object the caller no longer references"""
+        if len(self._free) < self.max_size:
+            self._free.append(obj)
+    
+    def __len__(self):
+        return len(self._free)
+
+
 class Fruit:
     """Represents a fruit in the game"""
     
+    __slots__ = ('x', 'y', 'radius', 'color', 'alive')
+    
     def __init__(self, x, y, radius=20, color=(0, 255, 255)):
+        self.reset(x, y, radius, color)
+    
+    def reset(self, x, y, radius=20, color=(0, 255, 255)):
+        """Reinitialize a pooled fruit"""
         self.x = x
         self.y = y
         self.radius = radius
@@ -37,7 +73,13 @@ class Fruit:
 class TrailPoint:
     """Represents a point in the slash trail"""
     
+    __slots__ = ('x', 'y', 'timestamp', 'lifetime')
+    
     def __init__(self, x, y, timestamp, lifetime=0.5):
+        self.reset(x, y, timestamp, lifetime)
+    
+    def reset(self, x, y, timestamp, lifetime=0.5):
+        """Reinitialize a pooled trail point"""
         self.x = x
         self.y = y
         self.timestamp = timestamp
@@ -59,22 +101,27 @@ class Trail:
     def __init__(self, max_points=50, lifetime=0.5):
         self.points = deque(maxlen=max_points)
         self.lifetime = lifetime
+        self.pool = ObjectPool(TrailPoint, max_size=max_points)
     
-    def add_point(self, x, y):
+    def add_point(self, x, y, current_time=None):
         """Add a new point to the trail"""
-        self.points.append(TrailPoint(x, y, time.time(), self.lifetime))
+        current_time = time.time() if current_time is None else current_time
+        if len(self.points) == self.points.maxlen:
+            self.pool.release(self.points.popleft())
+        self.points.append(self.pool.acquire(x, y, current_time, self.lifetime))
     
-    def update(self):
+    def update(self, current_time=None):
         """Remove expired trail points"""
-        current_time = time.time()
+        current_time = time.time() if current_time is None else current_time
         while self.points and self.points[0].is_expired(current_time):
-            self.points.popleft()
+            self.pool.release(self.points.popleft())
     
-    def get_recent_points(self, time_window=0.3):
+    def get_recent_points(self, time_window=0.3, current_time=None):
         """Get trail points within a recent time window"""
-        current_time = time.time()
+        current_time = time.time() if current_time is None else current_time
         return [p for p in self.points if (current_time - p.timestamp) <= time_window]
     
     def clear(self):
         """Clear all trail points"""
-        self.points.clear()
+        while self.points:
+            self.pool.release(self.points.popleft())
@@ -2,34 +2,51 @@
 Main game class for Fruit Ninja CV
 """
 import cv2
+import os
 import random
 import time
 
-from ..cv.hand_tracker import HandTracker
+from ..cv.backends import create_tracker
+from ..cv.capture import open_source
 from ..cv.gesture_detector import GestureDetector, Gesture
-from .entities import Fruit, Trail
+from ..ui.presenter import create_presenter
+from .entities import Fruit, ObjectPool, Trail
+from .gc_control import GCController, GCPauseMonitor
+from .particles import ParticleSystem
 from .config import GameConfig
+from .replay import ReplayRecorder, dequantize_fingertip, quantize_fingertip
 
 
 class FruitNinjaGame:
     """Main game controller"""
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, hand_tracker=None, session_recorder=None,
+                 leaderboard_overlay=None, seed=None, record_replay=True,
+                 video_recorder=None, spectator=None, presenter=None):
         self.config = config or GameConfig()
         self.width = self.config.WINDOW_WIDTH
         self.height = self.config.WINDOW_HEIGHT
         
+        # Game logic is a function of the seed and the fingertip at each
+        # frame's game time, so a recorded game can be replayed exactly
+        self.seed = random.SystemRandom().getrandbits(63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.replay = ReplayRecorder(self.seed, self.config) if record_replay else None
+        self.clock_start = None  # time.monotonic() of the first frame
+        self.now = 0.0  # game time in seconds
+        
         # Game state
         self.fruits = []
+        self.fruit_pool = ObjectPool(Fruit)
         self.score = 0
-        self.last_spawn = time.time()
+        self.last_spawn = 0.0
         self.running = False
+        self.last_hand_seen = time.time()
+        self.game_over_until = None  # set when the game over screen is showing
         
         # Components
-        self.hand_tracker = HandTracker(
-            max_hands=self.config.MAX_HANDS,
-            detection_conf=self.config.DETECTION_CONFIDENCE,
-            tracking_conf=self.config.TRACKING_CONFIDENCE
+        self.hand_tracker = hand_tracker or create_tracker(
+            self.config.TRACKER_BACKEND, self.config
         )
         self.gesture_detector = GestureDetector(
             history_size=self.config.GESTURE_HISTORY_SIZE,
@@ -39,12 +56,29 @@ class FruitNinjaGame:
             max_points=self.config.TRAIL_MAX_POINTS,
             lifetime=self.config.TRAIL_LIFETIME
         )
+        self.particles = ParticleSystem(
+            self.config.PARTICLE_CAPACITY, self.config.PARTICLE_GRAVITY
+        ) if self.config.PARTICLES else None
+        self.session_recorder = session_recorder  # Optional SessionRecorder
+        self.video_recorder = video_recorder  # Optional GameplayRecorder
+        self.spectator = spectator  # Optional SpectatorServer
+        self.presenter = presenter  # default: created by run() from config.PRESENTER
+        self.combo = 0  # fruits sliced in a row
+        self.last_slice_time = float('-inf')
+        self.leaderboard_overlay = leaderboard_overlay  # Optional LeaderboardOverlay
+        self.gc_monitor = GCPauseMonitor() if self.config.GC_STATS else None
+        self.gc_controller = GCController(
+            self.config.GC_MODE,
+            frame_budget=1 / self.config.FPS,
+            min_slack=self.config.GC_MIN_SLACK,
+            monitor=self.gc_monitor
+        )
 
     def spawn_fruit(self):
         """Spawn a new fruit at the bottom of the screen"""
-        x = random.randint(50, self.width - 50)
+        x = self.rng.randint(50, self.width - 50)
         y = self.height + 50  # Start below screen
-        fruit = Fruit(
+        fruit = self.fruit_pool.acquire(
             x, y,
             radius=self.config.FRUIT_RADIUS,
             color=self.config.FRUIT_COLOR
@@ -56,8 +90,17 @@ class FruitNinjaGame:
         for fruit in self.fruits:
             fruit.update(self.config.FRUIT_VELOCITY)
         
-        # Remove off-screen fruits and sliced fruits
-        self.fruits = [f for f in self.fruits if f.alive and not f.is_offscreen()]
+        # Remove off-screen fruits and sliced fruits in place, recycling them
+        kept = 0
+        for fruit in self.fruits:
+            if fruit.alive and not fruit.is_offscreen():
+                self.fruits[kept] = fruit
+                kept += 1
+            else:
+                if fruit.alive and self.session_recorder:
+                    self.session_recorder.add_target(fruit, sliced=False)
+                self.fruit_pool.release(fruit)
+        del self.fruits[kept:]
 
     def check_slice(self, gesture):
         """Check if slashing gesture hits any fruits"""
@@ -66,7 +109,7 @@ class FruitNinjaGame:
         
         # Get recent trail points for collision detection
         recent_points = self.trail.get_recent_points(
-            self.config.TRAIL_COLLISION_WINDOW
+            self.config.TRAIL_COLLISION_WINDOW, self.now
         )
         
         # Check collision between trail and fruits
@@ -79,6 +122,14 @@ class FruitNinjaGame:
                 ):
                     fruit.alive = False  # Mark fruit as sliced
                     self.score += 1
+                    if self.particles is not None:
+                        self.particles.slice_fruit(fruit, self.config.JUICE_PARTICLES)
+                    if self.session_recorder:
+                        self.session_recorder.add_target(fruit)
+                    if self.now - self.last_slice_time > self.config.COMBO_WINDOW:
+                        self.combo = 0
+                    self.combo += 1
+                    self.last_slice_time = self.now
                     break  # Move to next trail point
 
     def update_trail(self, fingertip_pos):
@@ -86,16 +137,16 @@ class FruitNinjaGame:
         if fingertip_pos:
             x = int(fingertip_pos[0] * self.width)
             y = int(fingertip_pos[1] * self.height)
-            self.trail.add_point(x, y)
+            self.trail.add_point(x, y, self.now)
         
-        self.trail.update()
+        self.trail.update(self.now)
     
     def draw_trail(self, frame):
         """Draw the slash trail with fading effect"""
         if len(self.trail.points) < 2:
             return
         
-        current_time = time.time()
+        current_time = self.now
         trail_color = self.config.TRAIL_COLOR
         
         # Draw lines between consecutive points
@@ -121,68 +172,203 @@ class FruitNinjaGame:
             if fruit.alive:
                 cv2.circle(frame, (fruit.x, fruit.y), fruit.radius, fruit.color, -1)
         
+        # Juice and fruit halves (frozen while the game over screen shows)
+        if self.particles is not None:
+            self.particles.update(self.now)
+            self.particles.draw(frame)
+        
         # Draw score
         cv2.putText(frame, f"Score: {self.score}", (10, 30),
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    
+    def show_leaderboard(self):
+        """Whether the boards are up: at game over and in attract mode (no hand for a while)"""
+        if self.leaderboard_overlay is None:
+            return False
+        if self.game_over_until is not None:
+            return True
+        return time.time() - self.last_hand_seen > self.config.ATTRACT_IDLE_SECONDS
+    
+    def game_over(self):
+        """End play; with an overlay the boards show for GAME_OVER_SECONDS first"""
+        if self.leaderboard_overlay is None or self.game_over_until is not None:
+            self.stop()
+            return
+        self.game_over_until = time.time() + self.config.GAME_OVER_SECONDS
+        if self.score > 0:
+            # Submitted after the game ends; show it on the boards right away
+            self.leaderboard_overlay.add_score(self.score)
+        self.leaderboard_overlay.refresh()
+
+    def advance(self, fingertip_q, time_ms):
+        """
+        One frame of game logic; the only inputs a replay needs
+        
+        Args:
+            fingertip_q: Index fingertip from quantize_fingertip(), or None
+                when no hand was detected
+            time_ms: Game time in milliseconds since the first frame
+            
+        Returns:
+            Gesture detected this frame
+        """
+        if self.replay:
+            self.replay.add(time_ms, fingertip_q)
+        self.now = time_ms / 1000
+        
+        # Spawn fruit at configured interval
+        if self.now - self.last_spawn > self.config.FRUIT_SPAWN_INTERVAL:
+            self.spawn_fruit()
+            self.last_spawn = self.now
+        
+        fingertip_pos = dequantize_fingertip(fingertip_q) if fingertip_q else None
+        gesture = self.gesture_detector.update_fingertip(fingertip_pos)
+        self.update_trail(fingertip_pos)
+        self.update_physics()
+        if self.session_recorder:
+            self.session_recorder.track_fruits(self.fruits)
+        self.check_slice(gesture)
+        return gesture
+    
+    def step(self, frame, timestamp_ms=None):
+        """
+        Advance the game by one camera frame
+        
+        Args:
+            frame: BGR camera frame (not modified)
+            timestamp_ms: Capture time for the hand tracker (default: now)
+            
+        Returns:
+            Mirrored frame with the game drawn on it, ready to show
+        """
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+
+        # Flip for mirror effect
+        frame = cv2.flip(frame, 1)
+
+        if self.game_over_until is not None:
+            # Game over screen: play is frozen, the boards are drawn from
+            # the overlay's prefetched buffer
+            self.render(frame)
+            self.leaderboard_overlay.draw(frame)
+            cv2.putText(frame, "GAME OVER", (10, 60),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+            if time.time() > self.game_over_until:
+                self.stop()
+            self._publish(frame)
+            return frame
+
+        # Process hand (async backends return the newest finished result)
+        landmarks = self.hand_tracker.process_frame(frame, timestamp_ms)
+        if landmarks:
+            self.last_hand_seen = time.time()
+        if self.session_recorder:
+            self.session_recorder.add_frame(landmarks)
+        
+        # Game logic sees the fingertip on the replay grid, at a millisecond clock
+        if self.clock_start is None:
+            self.clock_start = time.monotonic()
+        fingertip_q = quantize_fingertip(landmarks[8]) if landmarks and len(landmarks) > 8 else None
+        gesture = self.advance(fingertip_q, int((time.monotonic() - self.clock_start) * 1000))
+        fingertip_pos = dequantize_fingertip(fingertip_q) if fingertip_q else None
+        self.render(frame)
+
+        # Debug visualizations
+        if self.config.SHOW_HAND_LANDMARKS and landmarks:
+            self.hand_tracker.draw_landmarks(frame, landmarks)
+        
+        if self.config.SHOW_FINGERTIP_MARKER and fingertip_pos:
+            fx = int(fingertip_pos[0] * self.width)
+            fy = int(fingertip_pos[1] * self.height)
+            cv2.circle(frame, (fx, fy), 8, (0, 255, 255), -1)
+                
+        # Show gesture status
+        if gesture == Gesture.SLASHING:
+            cv2.putText(frame, "SLASHING!", (10, 60),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
+        
+        # Attract mode: nobody is playing, show the boards
+        if self.show_leaderboard():
+            self.leaderboard_overlay.draw(frame)
+        
+        # A finished combo is saved once the next slice can no longer extend it
+        if (self.combo >= self.config.HIGHLIGHT_COMBO
+                and self.now - self.last_slice_time > self.config.COMBO_WINDOW):
+            self.save_highlight()
+            self.combo = 0
+        
+        self._publish(frame)
+        return frame
+    
+    def _publish(self, frame):
+        """Hand the finished frame to the recorder and spectators (neither waits)"""
+        if self.video_recorder:
+            self.video_recorder.write(frame)
+        if self.spectator:
+            self.spectator.publish(frame)
+    
+    def save_highlight(self):
+        """
+        Save the instant-replay buffer to config.HIGHLIGHT_DIR in the background
+        
+        Returns:
+            Path of the clip, or None without a highlight buffer
+        """
+        if not self.video_recorder or self.video_recorder.highlights is None:
+            return None
+        path = os.path.join(self.config.HIGHLIGHT_DIR,
+                            f"highlight-{time.strftime('%Y%m%d-%H%M%S')}-{self.combo}x.mp4")
+        if self.video_recorder.save_highlight(path) is None:
+            return None
+        print(f"🎬 Highlight saved to {path}")
+        return path
+    
+    def handle_key(self, key):
+        """React to a cv2.waitKey() result ('q' ends the game, 'r' saves a highlight)"""
+        if key & 0xFF == ord('q'):
+            self.game_over()
+        elif key & 0xFF == ord('r'):
+            self.save_highlight()
 
     def run(self):
         """Main game loop"""
-        cap = cv2.VideoCapture(0)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        cap = open_source(self.config.CAMERA_SOURCE, self.config)
         
+        if self.presenter is None:
+            self.presenter = create_presenter(self.config.PRESENTER, self.config.WINDOW_TITLE)
         self.running = True
         print(f"Starting {self.config.WINDOW_TITLE}...")
         print("Press 'q' to quit")
+        if self.video_recorder and self.video_recorder.highlights is not None:
+            print("Press 'r' to save the last few seconds as a highlight")
+        
+        # Startup allocations (tracker models, camera buffers) are done
+        self.gc_controller.start(freeze=self.config.GC_FREEZE)
 
         while self.running:
             ret, frame = cap.read()
             if not ret:
                 break
-
-            # Flip for mirror effect
-            frame = cv2.flip(frame, 1)
-
-            # Spawn fruit at configured interval
-            if time.time() - self.last_spawn > self.config.FRUIT_SPAWN_INTERVAL:
-                self.spawn_fruit()
-                self.last_spawn = time.time()
-
-            # Process hand
-            landmarks = self.hand_tracker.process_frame(frame)
-            gesture = self.gesture_detector.update(landmarks)
-            
-            # Get fingertip position for trail and collision detection
-            fingertip_pos = landmarks[8] if landmarks and len(landmarks) > 8 else None
-            
-            # Update trail
-            self.update_trail(fingertip_pos)
+            frame_start = time.perf_counter()  # waiting for the camera is slack
             
-            # Update game
-            self.update_physics()
-            self.check_slice(gesture)
-            self.render(frame)
-
-            # Debug visualizations
-            if self.config.SHOW_HAND_LANDMARKS and landmarks:
-                self.hand_tracker.draw_landmarks(frame, landmarks)
-            
-            if self.config.SHOW_FINGERTIP_MARKER and fingertip_pos:
-                fx = int(fingertip_pos[0] * self.width)
-                fy = int(fingertip_pos[1] * self.height)
-                cv2.circle(frame, (fx, fy), 8, (0, 255, 255), -1)
-                    
-            # Show gesture status
-            if gesture == Gesture.SLASHING:
-                cv2.putText(frame, "SLASHING!", (10, 60),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
-
-            cv2.imshow(self.config.WINDOW_TITLE, frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                self.stop()
+            frame = self.step(frame, int(time.monotonic() * 1000))
+            # The presenter shows the frame on its own thread; keys arrive a frame later
+            self.presenter.show(frame)
+            for key in self.presenter.keys():
+                self.handle_key(key)
+            self.gc_controller.end_frame(frame_start)
 
+        self.gc_controller.stop()
         cap.release()
-        cv2.destroyAllWindows()
+        self.hand_tracker.close()
+        self.presenter.close()
+        if self.gc_monitor:
+            print(self.gc_monitor.report())
+        if self.config.PRESENTER_STATS:
+            print(self.presenter.report())
+        if self.config.CAPTURE_STATS:
+            print(cap.report())
         print(f"Game Over! Final Score: {self.score}")
         return self.score
     
@@ -0,0 +1,180 @@
+"""
+Garbage collector control for the frame loop
+"""
+import gc
+import time
+from typing import Dict, Optional
+
+GC_MODES = ('auto', 'idle')
+
+
+class GCPauseMonitor:
+    """
+    Times every cyclic GC pass through gc.callbacks and records the frame
+    it landed on, so stutter can be matched to collections.
+    """
+
+    def __init__(self, max_events: int = 1000):
+        """
+        Args:
+            max_events: Pauses kept for the report (the longest ones win)
+        """
+        self.max_events = max_events
+        self.frame = 0  # advanced by GCController.end_frame
+        self.events = []  # dicts with frame, generation, ms, collected
+        self.count = 0
+        self.total_ms = 0.0
+        self._started = None
+
+    def start(self):
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+        return self
+
+    def stop(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase, info):
+        if phase == 'start':
+            self._started = time.perf_counter()
+            return
+        if self._started is None:
+            return
+        pause_ms = (time.perf_counter() - self._started) * 1000
+        self._started = None
+        self.count += 1
+        self.total_ms += pause_ms
+        self.events.append({'frame': self.frame, 'generation': info['generation'],
+                            'ms': pause_ms, 'collected': info['collected']})
+        if len(self.events) > 2 * self.max_events:
+            self.events.sort(key=lambda e: e['ms'], reverse=True)
+            del self.events[self.max_events:]
+
+    def summary(self) -> Dict:
+        """Pause count, total and worst pause in milliseconds"""
+        worst = max(self.events, key=lambda e: e['ms'], default=None)
+        return {'pauses': self.count, 'total_ms': self.total_ms,
+                'max_ms': worst['ms'] if worst else 0.0,
+                'max_frame': worst['frame'] if worst else None}
+
+    def report(self, top: int = 10) -> str:
+        """Human-readable summary with the longest pauses"""
+        stats = self.summary()
+        lines = [f"GC: {stats['pauses']} pause(s), {stats['total_ms']:.1f} ms total, "
+                 f"worst {stats['max_ms']:.2f} ms"]
+        for event in sorted(self.events, key=lambda e: e['ms'], reverse=True)[:top]:
+            lines.append(f"  frame {event['frame']:6d}: gen {event['generation']} "
+                         f"{event['ms']:.2f} ms ({event['collected']} collected)")
+        return "\n".join(lines)
+
+
+class GCController:
+    """
+    Keeps cyclic garbage collection out of the middle of frames.
+
+    freeze() moves everything allocated during startup (models, modules,
+    caches) into the permanent generation, so later collections never scan
+    it. In 'idle' mode automatic collection is disabled and end_frame() runs
+    the generation the collector would have picked, but only when the frame
+    finished with at least min_slack seconds of its budget left. Collections
+    deferred for too long run anyway so memory stays bounded: usually just
+    the young generation, but an older generation that keeps being skipped
+    that way is collected too. 'auto' mode
+    leaves the collector alone and only advances the monitor's frame count.
+    """
+
+    def __init__(self, mode: str = 'auto', frame_budget: float = 1 / 30,
+                 min_slack: float = 0.002, max_deferral: int = 20,
+                 monitor: Optional[GCPauseMonitor] = None):
+        """
+        Args:
+            mode: 'auto' (interpreter default) or 'idle'
+            frame_budget: Seconds per frame (1 / FPS)
+            min_slack: Seconds that must be left in the frame to collect
+            max_deferral: Collect regardless of slack once the young
+                generation holds this many times its threshold; a due older
+                generation is included once this many forced passes skipped it
+            monitor: Optional GCPauseMonitor fed with frame numbers
+        """
+        if mode not in GC_MODES:
+            raise ValueError(f"mode must be one of {', '.join(GC_MODES)}")
+        self.mode = mode
+        self.frame_budget = frame_budget
+        self.min_slack = min_slack
+        self.max_deferral = max_deferral
+        self.monitor = monitor
+        self.idle_collections = 0
+        self.forced_collections = 0
+        self._skipped = [0, 0, 0]  # forced passes that left each due generation out
+        self._was_enabled = gc.isenabled()
+
+    def freeze(self):
+        """Collect once, then exclude every surviving object from future passes"""
+        gc.collect()
+        gc.freeze()
+
+    def start(self, freeze: bool = True):
+        """Call once startup is done, right before the frame loop"""
+        if freeze:
+            self.freeze()
+        if self.monitor:
+            self.monitor.start()
+        self._was_enabled = gc.isenabled()
+        if self.mode == 'idle':
+            gc.disable()
+        return self
+
+    def stop(self):
+        """Restore the collector (frozen objects stay frozen)"""
+        if self.mode == 'idle' and self._was_enabled:
+            gc.enable()
+        if self.monitor:
+            self.monitor.stop()
+
+    def end_frame(self, frame_start: float) -> Optional[int]:
+        """
+        Call after the frame is presented
+
+        Args:
+            frame_start: time.perf_counter() when the frame started
+
+        Returns:
+            Generation collected, or None
+        """
+        if self.monitor:
+            self.monitor.frame += 1
+        if self.mode != 'idle':
+            return None
+
+        generation = self._due_generation()
+        if generation is None:
+            return None
+        slack = frame_start + self.frame_budget - time.perf_counter()
+        if slack >= self.min_slack:
+            self.idle_collections += 1
+        elif gc.get_count()[0] >= gc.get_threshold()[0] * self.max_deferral:
+            self.forced_collections += 1
+            # Only the cheap pass when over budget, until the older generation
+            # has waited long enough that its garbage would pile up
+            if generation and self._skipped[generation] < self.max_deferral:
+                self._skipped[generation] += 1
+                generation = 0
+        else:
+            return None
+        gc.collect(generation)
+        for collected in range(generation + 1):
+            self._skipped[collected] = 0
+        return generation
+
+    def _due_generation(self) -> Optional[int]:
+        """Oldest generation whose threshold is reached, as the collector decides"""
+        counts, thresholds = gc.get_count(), gc.get_threshold()
+        for generation in (2, 1, 0):
+            if thresholds[generation] and counts[generation] >= thresholds[generation]:
+                return generation
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {'idle_collections': self.idle_collections,
+                'forced_collections': self.forced_collections}
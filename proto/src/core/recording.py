@@ -0,0 +1,225 @@
+"""
+Gameplay video recording off the frame loop, with an instant-replay buffer
+"""
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class HighlightBuffer:
+    """
+    The last few seconds of gameplay as JPEG frames in memory.
+
+    A 640x480 frame takes 30-60 KB as a JPEG instead of 900 KB raw, so ten
+    seconds at 30 fps fit in about 15 MB. Frames older than the window are
+    dropped as new ones arrive.
+    """
+
+    def __init__(self, seconds: float = 10.0, quality: int = 80):
+        """
+        Args:
+            seconds: Length of the window kept
+            quality: JPEG quality (0-100)
+        """
+        self.seconds = seconds
+        self.quality = quality
+        self._frames = deque()  # (timestamp, jpeg bytes), oldest first
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, frame: np.ndarray, timestamp: float):
+        """JPEG-encode frame and drop frames that fell out of the window"""
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            return
+        jpeg = jpeg.tobytes()
+        with self._lock:
+            self._frames.append((timestamp, jpeg))
+            self._bytes += len(jpeg)
+            while self._frames and self._frames[0][0] < timestamp - self.seconds:
+                self._bytes -= len(self._frames.popleft()[1])
+
+    def snapshot(self) -> List[Tuple[float, bytes]]:
+        """The frames currently held, oldest first"""
+        with self._lock:
+            return list(self._frames)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return len(self._frames)
+
+    @staticmethod
+    def write_video(frames: List[Tuple[float, bytes]], path: str, fourcc: str = 'mp4v') -> int:
+        """
+        Decode JPEG frames into a video file at their average frame rate
+
+        Returns:
+            Number of frames written
+        """
+        if not frames:
+            return 0
+        span = frames[-1][0] - frames[0][0]
+        fps = (len(frames) - 1) / span if span > 0 else 30.0
+        first = cv2.imdecode(np.frombuffer(frames[0][1], np.uint8), cv2.IMREAD_COLOR)
+        height, width = first.shape[:2]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+        try:
+            writer.write(first)
+            for _, jpeg in frames[1:]:
+                writer.write(cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR))
+        finally:
+            writer.release()
+        return len(frames)
+
+
+class GameplayRecorder:
+    """
+    Records the game window without slowing the frame loop.
+
+    write() only puts the frame on a bounded queue; an encoder thread does
+    the cv2.VideoWriter.write (about 3 ms per 640x480 frame) and the JPEG
+    encoding for the highlight buffer. OpenCV releases the GIL while
+    encoding, so the thread runs on another core. If the encoder falls
+    behind, the queue fills and new frames are dropped (and counted) rather
+    than blocking the game.
+
+    The recorder keeps a reference to each frame it is given: frames must
+    not be drawn on after write(). FruitNinjaGame.step() returns a new
+    frame every call, so its output can be passed straight in.
+    """
+
+    def __init__(self, path: Optional[str] = None, fps: float = 30.0,
+                 highlight_seconds: float = 0.0, queue_size: int = 32,
+                 fourcc: str = 'mp4v', jpeg_quality: int = 80):
+        """
+        Args:
+            path: Video file for the whole game, or None to keep only highlights
+            fps: Frame rate written to the video file
+            highlight_seconds: Length of the in-memory instant-replay buffer
+                (0 disables it)
+            queue_size: Frames waiting for the encoder before new ones are dropped
+            fourcc: Video codec
+            jpeg_quality: JPEG quality of the highlight buffer
+        """
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self.highlights = HighlightBuffer(highlight_seconds, jpeg_quality) if highlight_seconds else None
+        self.written = 0
+        self.dropped = 0
+        self.encode_seconds = 0.0
+        self.saved = []  # highlight files written
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = None
+        self._thread = None
+        self._savers = []
+
+    def start(self):
+        """Start the encoder thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='gameplay-recorder', daemon=True)
+            self._thread.start()
+        return self
+
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """
+        Hand a frame to the encoder; never blocks
+
+        Returns:
+            False if the queue was full and the frame was dropped
+        """
+        try:
+            self._queue.put_nowait((frame, time.monotonic() if timestamp is None else timestamp))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def save_highlight(self, path: str) -> Optional[threading.Thread]:
+        """
+        Write the instant-replay buffer to a video file in the background
+
+        The buffer is copied at once (the frames keep coming); decoding and
+        writing happen on a separate thread.
+
+        Returns:
+            The thread writing the file, or None if there is nothing to save
+        """
+        if self.highlights is None or not len(self.highlights):
+            return None
+        frames = self.highlights.snapshot()
+        thread = threading.Thread(target=self._save, args=(frames, path),
+                                  name='highlight-writer', daemon=True)
+        thread.start()
+        self._savers.append(thread)
+        return thread
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Encode the frames still queued, then close the video file"""
+        if self._thread is not None:
+            # A full queue only drains while the encoder is alive; if it died,
+            # give up on the stop marker instead of blocking on put()
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while self._thread.is_alive():
+                try:
+                    self._queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    if deadline is not None and time.monotonic() > deadline:
+                        break
+            self._thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+            self._thread = None
+        for thread in self._savers:
+            thread.join(timeout)
+        self._savers = []
+
+    def stats(self):
+        """{'written', 'dropped', 'encode_ms' (mean per frame), 'highlight_mb', 'saved'}"""
+        return {
+            'written': self.written,
+            'dropped': self.dropped,
+            'encode_ms': self.encode_seconds / self.written * 1000 if self.written else None,
+            'highlight_mb': self.highlights.nbytes / 1e6 if self.highlights else 0.0,
+            'saved': list(self.saved),
+        }
+
+    def _save(self, frames, path):
+        try:
+            HighlightBuffer.write_video(frames, path, self.fourcc)
+            self.saved.append(path)
+        except Exception as e:
+            print(f"Saving highlight to {path} failed: {e}")
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                frame, timestamp = item
+                start = time.perf_counter()
+                if self.path:
+                    if self._writer is None:
+                        height, width = frame.shape[:2]
+                        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                        self._writer = cv2.VideoWriter(
+                            self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (width, height))
+                    self._writer.write(frame)
+                if self.highlights is not None:
+                    self.highlights.add(frame, timestamp)
+                self.encode_seconds += time.perf_counter() - start
+                self.written += 1
+        finally:
+            if self._writer is not None:
+                self._writer.release()
+                self._writer = None
@@ -0,0 +1,229 @@
+"""
+Compact gameplay traces and headless replay for score verification
+"""
+import base64
+import hashlib
+import json
+import os
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+from .config import GameConfig, apply_difficulty
+
+REPLAY_VERSION = 1
+
+# Every config value the simulation reads; the hash covers exactly these
+GAMEPLAY_FIELDS = (
+    'WINDOW_WIDTH', 'WINDOW_HEIGHT', 'FRUIT_SPAWN_INTERVAL', 'FRUIT_RADIUS',
+    'FRUIT_VELOCITY', 'GESTURE_HISTORY_SIZE', 'MIN_SLASH_VELOCITY', 'TRAIL_MAX_POINTS',
+    'TRAIL_LIFETIME', 'TRAIL_COLLISION_WINDOW', 'SLICE_THRESHOLD',
+)
+
+# Fingertips are quantized to 1/TIP_SCALE of the frame (about 0.01 px at
+# 640x480) before the game uses them, so the trace holds exactly what the
+# simulation saw
+TIP_SCALE = 65534
+NO_HAND = 65535
+
+# Faster than any camera; denser traces are rejected as synthetic
+MAX_FRAME_RATE = 240
+
+
+def gameplay_config(config) -> Dict:
+    return {field: getattr(config, field) for field in GAMEPLAY_FIELDS}
+
+
+def config_hash(config) -> str:
+    """Short stable hash of a config's gameplay values (config object or dict)"""
+    values = config if isinstance(config, dict) else gameplay_config(config)
+    payload = json.dumps([values[field] for field in GAMEPLAY_FIELDS])
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def quantize_fingertip(position):
+    """Normalized (x, y) -> (qx, qy) grid coordinates"""
+    return tuple(min(TIP_SCALE, max(0, int(round(v * TIP_SCALE)))) for v in position)
+
+
+def dequantize_fingertip(quantized):
+    return quantized[0] / TIP_SCALE, quantized[1] / TIP_SCALE
+
+
+class ReplayTrace:
+    """
+    Everything needed to re-run one game: RNG seed, gameplay config and the
+    quantized fingertip (or NO_HAND) at each frame's game time.
+
+    encode() packs it into a zlib-compressed, base64 string of a few
+    kilobytes per minute: frame times and fingertips are delta-coded, so a
+    steady camera and slow hand movement compress well.
+    """
+
+    def __init__(self, seed: int, config: Dict, times_ms, tips, hash_: Optional[str] = None):
+        self.seed = seed
+        self.config = config
+        self.config_hash = hash_ or config_hash(config)
+        self.times_ms = np.asarray(times_ms, dtype=np.uint32)
+        self.tips = np.asarray(tips, dtype=np.uint16).reshape(-1, 2)
+
+    def __len__(self):
+        return len(self.times_ms)
+
+    @property
+    def duration(self) -> float:
+        return float(self.times_ms[-1]) / 1000 if len(self) else 0.0
+
+    def encode(self) -> str:
+        header = json.dumps({'v': REPLAY_VERSION, 'seed': self.seed, 'config': self.config,
+                             'config_hash': self.config_hash, 'frames': len(self)})
+        # Differences wrap around in the unsigned dtype and are undone by cumsum
+        times = np.diff(self.times_ms, prepend=np.uint32(0)).astype('<u4')
+        tips = np.diff(self.tips, axis=0, prepend=np.zeros((1, 2), np.uint16)).astype('<u2')
+        payload = header.encode() + b'\0' + times.tobytes() + tips.tobytes()
+        return base64.b64encode(zlib.compress(payload, 9)).decode('ascii')
+
+    @classmethod
+    def decode(cls, text: str) -> 'ReplayTrace':
+        """Inverse of encode(); raises ValueError on malformed input"""
+        try:
+            payload = zlib.decompress(base64.b64decode(text))
+            header_bytes, body = payload.split(b'\0', 1)
+            header = json.loads(header_bytes)
+            if header.get('v') != REPLAY_VERSION:
+                raise ValueError(f"unsupported replay version {header.get('v')}")
+            frames = int(header['frames'])
+            if len(body) != frames * 8:
+                raise ValueError("replay body does not match its frame count")
+            times = np.cumsum(np.frombuffer(body[:frames * 4], '<u4'), dtype=np.uint32)
+            tips = np.cumsum(np.frombuffer(body[frames * 4:], '<u2').reshape(-1, 2),
+                             axis=0, dtype=np.uint16)
+            return cls(int(header['seed']), header['config'], times, tips, header['config_hash'])
+        except (ValueError, KeyError, TypeError, zlib.error) as e:
+            raise ValueError(f"malformed replay: {e}") from None
+
+
+class ReplayRecorder:
+    """Collects the per-frame inputs of FruitNinjaGame.advance()"""
+
+    def __init__(self, seed: int, config):
+        self.seed = seed
+        self.config = gameplay_config(config)
+        self.times_ms = []
+        self.tips = []
+
+    def add(self, time_ms: int, fingertip_q):
+        self.times_ms.append(time_ms)
+        self.tips.append(fingertip_q if fingertip_q is not None else (NO_HAND, NO_HAND))
+
+    def trace(self) -> ReplayTrace:
+        return ReplayTrace(self.seed, dict(self.config), self.times_ms, self.tips)
+
+    def encode(self) -> str:
+        return self.trace().encode()
+
+
+class _NoTracker:
+    """Stands in for the hand tracker; replays feed fingertips directly"""
+
+    def close(self):
+        pass
+
+
+def replay_score(trace: ReplayTrace) -> int:
+    """Re-run the game logic over a trace headlessly and return its score"""
+    from .game import FruitNinjaGame
+
+    config = GameConfig()
+    for field, value in trace.config.items():
+        if field in GAMEPLAY_FIELDS:
+            setattr(config, field, value)
+    config.PARTICLES = False  # effects only; they never touch the score
+    game = FruitNinjaGame(config=config, hand_tracker=_NoTracker(), seed=trace.seed,
+                          record_replay=False)
+    advance = game.advance
+    for time_ms, (qx, qy) in zip(trace.times_ms.tolist(), trace.tips.tolist()):
+        advance(None if qx == NO_HAND else (qx, qy), time_ms)
+    return game.score
+
+
+def verify_replay(score: int, difficulty: str, replay: Optional[str]) -> Dict:
+    """
+    Check that a submitted score follows from its replay
+
+    The trace must decode, carry the official gameplay config of the
+    claimed difficulty (at one of GameConfig.KIOSK_RESOLUTIONS), look like
+    camera input,
+    and replay to exactly the claimed score.
+
+    Returns:
+        {'verdict', 'replayed', 'reason'} where verdict is 'ok', 'mismatch'
+        (replays to another score) or 'invalid'
+    """
+    if not replay:
+        return {'verdict': 'invalid', 'replayed': None, 'reason': 'no replay'}
+    try:
+        trace = ReplayTrace.decode(replay)
+    except ValueError as e:
+        return {'verdict': 'invalid', 'replayed': None, 'reason': str(e)}
+
+    try:
+        official = apply_difficulty(GameConfig(), difficulty)
+        resolution = (trace.config['WINDOW_WIDTH'], trace.config['WINDOW_HEIGHT'])
+    except (AttributeError, KeyError):
+        return {'verdict': 'invalid', 'replayed': None, 'reason': 'unknown difficulty or config'}
+    # Window size changes where fruit spawn and fall, so only kiosk sizes count
+    if resolution not in official.KIOSK_RESOLUTIONS:
+        return {'verdict': 'invalid', 'replayed': None,
+                'reason': f"resolution {resolution[0]}x{resolution[1]} is not a kiosk resolution"}
+    official.WINDOW_WIDTH, official.WINDOW_HEIGHT = resolution
+    if trace.config_hash != config_hash(trace.config) or trace.config_hash != config_hash(official):
+        return {'verdict': 'invalid', 'replayed': None,
+                'reason': f"config {trace.config_hash} is not the {difficulty} preset"}
+
+    if len(trace):
+        if np.any(np.diff(trace.times_ms.astype(np.int64)) < 0):
+            return {'verdict': 'invalid', 'replayed': None, 'reason': 'frame times go backwards'}
+        if len(trace) > MAX_FRAME_RATE * (trace.duration + 1):
+            return {'verdict': 'invalid', 'replayed': None,
+                    'reason': f"more than {MAX_FRAME_RATE} frames per second"}
+
+    replayed = replay_score(trace)
+    if replayed != score:
+        return {'verdict': 'mismatch', 'replayed': replayed,
+                'reason': f"claimed {score}, replay scores {replayed}"}
+    return {'verdict': 'ok', 'replayed': replayed, 'reason': None}
+
+
+def _verify_row(row: Dict) -> Dict:
+    result = verify_replay(row['score'], row['difficulty'], row.get('replay'))
+    result['submission_id'] = row['submission_id']
+    return result
+
+
+def verify_rows(rows: Iterable[Dict], workers: Optional[int] = None,
+                chunksize: int = 16, executor: Optional[Executor] = None) -> Iterator[Dict]:
+    """
+    Verify many submissions in parallel, one process per core
+
+    Args:
+        rows: Dicts with submission_id, score, difficulty and replay
+        workers: Worker processes (default: os.cpu_count(); 1 runs inline)
+        chunksize: Rows handed to a worker at a time
+        executor: Reuse a ProcessPoolExecutor across calls (workers is
+            then ignored)
+
+    Yields:
+        verify_replay() results plus 'submission_id', in input order
+    """
+    if executor is not None:
+        yield from executor.map(_verify_row, rows, chunksize=chunksize)
+        return
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(_verify_row, rows)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_verify_row, rows, chunksize=chunksize)
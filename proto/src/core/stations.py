@@ -0,0 +1,166 @@
+"""
+Several camera stations in one process, sharing hand tracking workers
+"""
+import copy
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from ..cv.capture import open_source
+from ..cv.inference_pool import InferencePool, pooled_tracker_factory
+from ..ui.presenter import create_presenter
+from .config import GameConfig
+from .game import FruitNinjaGame
+from .gc_control import GCController, GCPauseMonitor
+
+
+class CameraReader:
+    """Reads a capture source on its own thread and keeps only the newest frame"""
+
+    def __init__(self, source, config: GameConfig):
+        self.cap = open_source(source, config)
+        self.opened = self.cap.isOpened()
+        self._lock = threading.Lock()
+        self._frame = None
+        self._sequence = 0
+        self._taken = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"camera-{source}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                self.opened = False
+                return
+            with self._lock:
+                self._frame = frame
+                self._sequence += 1
+
+    def latest(self):
+        """The newest frame if it was not returned before, else None"""
+        with self._lock:
+            if self._sequence == self._taken:
+                return None
+            self._taken = self._sequence
+            return self._frame
+
+    def close(self):
+        self._stopped.set()
+        self._thread.join(timeout=1.0)
+        self.cap.release()
+
+
+class MultiStationRunner:
+    """
+    One FruitNinjaGame per camera, all in one process.
+
+    The games' hand trackers run on an InferencePool of
+    config.INFERENCE_WORKERS threads instead of one process per camera:
+    each station keeps its own tracking graph (and its tracking state), but
+    CPU use is capped at the pool size. Each camera
+    is read on its own thread; the main thread steps whichever games have a
+    new frame and hands it to one presenter, whose display thread shows
+    every station in its own window.
+
+    Keys: '1'-'9' end that station's game, 'q' ends all of them.
+    """
+
+    def __init__(self, cameras: Sequence, config: Optional[GameConfig] = None,
+                 workers: Optional[int] = None, tracker_factory=None, presenter=None):
+        """
+        Args:
+            cameras: One capture source per station (index, URL, file or
+                'synthetic'; see open_source)
+            config: Game configuration shared by all stations
+            workers: Size of the tracker pool (default: config.INFERENCE_WORKERS)
+            tracker_factory: Callable returning a station's tracker (default:
+                the configured backend)
+            presenter: Shows every station's window (default: config.PRESENTER)
+        """
+        self.config = config or GameConfig()
+        if tracker_factory is None:
+            tracker_factory = pooled_tracker_factory(self.config)
+        self.pool = InferencePool(tracker_factory, workers or self.config.INFERENCE_WORKERS)
+        self.presenter = presenter or create_presenter(self.config.PRESENTER,
+                                                       self.config.WINDOW_TITLE)
+        self.cameras = list(cameras)
+        self.games: List[FruitNinjaGame] = []
+        for i, _ in enumerate(self.cameras):
+            config = copy.copy(self.config)
+            config.WINDOW_TITLE = f"{self.config.WINDOW_TITLE} - station {i + 1}"
+            self.games.append(FruitNinjaGame(config=config,
+                                             hand_tracker=self.pool.station(f"station{i + 1}")))
+        # The collector is process-wide: one controller for all stations
+        self.gc_monitor = GCPauseMonitor() if self.config.GC_STATS else None
+        self.gc_controller = GCController(self.config.GC_MODE,
+                                          frame_budget=1 / self.config.FPS,
+                                          min_slack=self.config.GC_MIN_SLACK,
+                                          monitor=self.gc_monitor)
+
+    def run(self) -> Dict[str, int]:
+        """
+        Run until every station's game has ended
+
+        Returns:
+            Station name -> final score
+        """
+        readers = [CameraReader(source, self.config) for source in self.cameras]
+        for game, reader, source in zip(self.games, readers, self.cameras):
+            game.running = reader.opened
+            if not reader.opened:
+                print(f"⚠️  Camera {source} could not be opened; "
+                      f"{game.config.WINDOW_TITLE} is skipped")
+        print(f"Starting {len(self.games)} station(s) on {self.pool.workers} tracker(s)")
+        print("Press 1-9 to end a station, 'q' to end all")
+        self.gc_controller.start(freeze=self.config.GC_FREEZE)
+
+        try:
+            while any(game.running for game in self.games):
+                loop_start = time.perf_counter()
+                stepped = False
+                for game, reader in zip(self.games, readers):
+                    if not game.running:
+                        continue
+                    frame = reader.latest()
+                    if frame is None:
+                        if not reader.opened:
+                            game.stop()
+                        continue
+                    frame = game.step(frame, int(time.monotonic() * 1000))
+                    stepped = True
+                    self.presenter.show(frame, game.config.WINDOW_TITLE)
+                    if not game.running:
+                        self.presenter.close_window(game.config.WINDOW_TITLE)
+
+                for key in self.presenter.keys():
+                    key &= 0xFF
+                    if key == ord('q'):
+                        for game in self.games:
+                            game.handle_key(key)
+                    elif ord('1') <= key <= ord('9') and key - ord('1') < len(self.games):
+                        self.games[key - ord('1')].handle_key(ord('q'))
+                if not stepped:
+                    time.sleep(0.001)  # no camera had a new frame; don't spin
+                    continue
+                self.gc_controller.end_frame(loop_start)
+        finally:
+            self.gc_controller.stop()
+            for reader in readers:
+                reader.close()
+            self.pool.close(timeout=1.0)
+            self.presenter.close()
+
+        if self.gc_monitor:
+            print(self.gc_monitor.report())
+        if self.config.PRESENTER_STATS:
+            print(self.presenter.report())
+        if self.config.CAPTURE_STATS:
+            for game, reader in zip(self.games, readers):
+                print(f"{game.hand_tracker.name}: {reader.cap.report()}")
+        return {game.hand_tracker.name: game.score for game in self.games}
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-station inference counters and latency (InferencePool.stats)"""
+        return self.pool.stats()
@@ -2,11 +2,20 @@
 Computer vision components for hand tracking and gesture detection
 """
 
-from .hand_tracker import HandTracker
+from .hand_tracker import HandTracker, draw_landmarks
+from .hand_landmarker import AsyncHandTracker
+from .blob_tracker import BlobHandTracker
+from .backends import register_backend, available_backends, create_tracker
 from .gesture_detector import GestureDetector, Gesture
 
 __all__ = [
     'HandTracker',
+    'draw_landmarks',
+    'AsyncHandTracker',
+    'BlobHandTracker',
+    'register_backend',
+    'available_backends',
+    'create_tracker',
     'GestureDetector',
     'Gesture',
 ]
@@ -0,0 +1,69 @@
+"""
+Registry of hand tracker backends
+
+Every backend exposes the HandTracker interface:
+process_frame(frame, timestamp_ms=None) -> list of 21 normalized (x, y)
+landmarks (index 8 = index fingertip) or None, draw_landmarks(frame, landmarks)
+and close(). Backends are created from a GameConfig so per-machine choices
+only need a name (see --tracker / HAND_TRACKER_BACKEND).
+"""
+
+TRACKER_BACKENDS = {}
+
+
+def register_backend(name):
+    """Decorator registering a factory: factory(config) -> tracker"""
+    def decorator(factory):
+        TRACKER_BACKENDS[name] = factory
+        return factory
+    return decorator
+
+
+def available_backends():
+    """Names of all registered backends"""
+    return sorted(TRACKER_BACKENDS)
+
+
+def create_tracker(name, config):
+    """Create the tracker registered under name, configured from config"""
+    if name not in TRACKER_BACKENDS:
+        raise ValueError(
+            f"Unknown tracker backend '{name}'. "
+            f"Available: {', '.join(available_backends())}"
+        )
+    return TRACKER_BACKENDS[name](config)
+
+
+@register_backend('solutions')
+def _create_solutions_tracker(config):
+    """Legacy synchronous mp.solutions.hands"""
+    from .hand_tracker import HandTracker
+    return HandTracker(
+        max_hands=config.MAX_HANDS,
+        detection_conf=config.DETECTION_CONFIDENCE,
+        tracking_conf=config.TRACKING_CONFIDENCE,
+        static_image_mode=config.TRACKER_STATIC_IMAGE_MODE
+    )
+
+
+@register_backend('tasks')
+def _create_tasks_tracker(config):
+    """MediaPipe Tasks HandLandmarker in live-stream mode"""
+    from .hand_landmarker import AsyncHandTracker
+    return AsyncHandTracker(
+        model_path=config.HAND_LANDMARKER_MODEL,
+        max_hands=config.MAX_HANDS,
+        detection_conf=config.DETECTION_CONFIDENCE,
+        tracking_conf=config.TRACKING_CONFIDENCE
+    )
+
+
+@register_backend('blob')
+def _create_blob_tracker(config):
+    """Classical skin/motion blob tracker for low-end CPUs"""
+    from .blob_tracker import BlobHandTracker
+    return BlobHandTracker(
+        process_width=config.BLOB_TRACKER_WIDTH,
+        min_area=config.BLOB_MIN_AREA,
+        use_motion=config.BLOB_USE_MOTION
+    )
@@ -0,0 +1,164 @@
+"""
+Vectorized replay of gesture detection and trail slicing over recorded sessions
+
+These functions reproduce GestureDetector.update() and
+FruitNinjaGame.check_slice() for whole sessions at once with NumPy instead of
+stepping frame by frame, so a parameter sweep over thousands of sessions stays
+cheap. Many sessions are concatenated into one SessionBatch and evaluated in a
+single pass.
+"""
+import numpy as np
+
+# Time inserted between concatenated sessions; must exceed any replay window
+SESSION_GAP = 10.0
+
+
+class SessionBatch:
+    """Many LandmarkSessions flattened into contiguous arrays"""
+
+    def __init__(self, sessions):
+        timestamps, fingertips, pixels, labels, labeled, targets = [], [], [], [], [], []
+        offset = 0.0
+        for session in sessions:
+            if len(session) == 0:
+                continue
+            ts = session.timestamps - session.timestamps[0] + offset
+            timestamps.append(ts)
+            fingertips.append(session.fingertips)
+            # The game truncates fingertip positions to integer pixels
+            pixels.append(np.floor(session.fingertips * (session.width, session.height)))
+            if session.labels is not None:
+                labels.append(session.labels)
+                labeled.append(np.ones(len(session), dtype=bool))
+            else:
+                labels.append(np.zeros(len(session), dtype=bool))
+                labeled.append(np.zeros(len(session), dtype=bool))
+            if session.targets is not None and len(session.targets):
+                shifted = session.targets.copy()
+                shifted[:, 0] += offset - session.timestamps[0]
+                targets.append(shifted)
+
+            # Separator frame without a hand resets the gesture history
+            timestamps.append(np.array([ts[-1] + SESSION_GAP / 2]))
+            fingertips.append(np.full((1, 2), np.nan))
+            pixels.append(np.full((1, 2), np.nan))
+            labels.append(np.zeros(1, dtype=bool))
+            labeled.append(np.zeros(1, dtype=bool))
+            offset = ts[-1] + SESSION_GAP
+
+        self.timestamps = np.concatenate(timestamps) if timestamps else np.zeros(0)
+        self.fingertips = np.concatenate(fingertips) if fingertips else np.zeros((0, 2))
+        self.pixels = np.concatenate(pixels) if pixels else np.zeros((0, 2))
+        self.labels = np.concatenate(labels) if labels else np.zeros(0, dtype=bool)
+        self.labeled = np.concatenate(labeled) if labeled else np.zeros(0, dtype=bool)
+        self.targets = np.concatenate(targets) if targets else np.zeros((0, 5))
+        self.valid = ~np.isnan(self.fingertips[:, 0])
+
+
+def slash_mask(fingertips, history_size, min_velocity):
+    """
+    GestureDetector for every frame at once.
+
+    fingertips: (N, 2) normalized positions, NaN where no hand was detected.
+    Returns (N,) bool, True where the detector reports Gesture.SLASHING.
+    """
+    n = len(fingertips)
+    idx = np.arange(n)
+    valid = ~np.isnan(fingertips[:, 0])
+
+    # A frame without a hand clears the history: find where each run starts
+    last_invalid = np.maximum.accumulate(np.where(valid, -1, idx)) if n else idx
+    oldest = np.maximum(last_invalid + 1, idx - history_size + 1)
+    frames = idx - oldest
+
+    ok = valid & (frames >= 1)
+    start = np.where(ok, oldest, idx)
+    delta = fingertips - fingertips[start]
+    speed = np.hypot(delta[:, 0], delta[:, 1]) / np.maximum(frames, 1)
+    return ok & (speed >= min_velocity)
+
+
+def slice_hits(batch, slashing, collision_window, slice_threshold, trail_lifetime=0.5):
+    """
+    Whether each target fruit would have been sliced.
+
+    Mirrors check_slice(): on a slashing frame, trail points from the last
+    collision_window seconds that come within radius + slice_threshold of the
+    fruit slice it. A target counts as hit if that happens on any slashing
+    frame within collision_window of the target's timestamp.
+    """
+    targets = batch.targets
+    if len(targets) == 0:
+        return np.zeros(0, dtype=bool)
+
+    window = min(collision_window, trail_lifetime)
+    ts = batch.timestamps
+    t_target = targets[:, 0]
+
+    # Candidate trail points for every target, expanded into flat pairs
+    lo = np.searchsorted(ts, t_target - 2 * window, 'left')
+    hi = np.searchsorted(ts, t_target + window, 'right')
+    lengths = hi - lo
+    owner = np.repeat(np.arange(len(targets)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    point = lo[owner] + np.arange(lengths.sum()) - starts[owner]
+
+    dx = batch.pixels[point, 0] - targets[owner, 1]
+    dy = batch.pixels[point, 1] - targets[owner, 2]
+    with np.errstate(invalid='ignore'):
+        near = batch.valid[point] & (np.hypot(dx, dy) < targets[owner, 3] + slice_threshold)
+
+    # Is there a slashing frame that still sees this point in its window?
+    first = np.maximum(ts[point], t_target[owner] - window)
+    last = np.minimum(ts[point] + window, t_target[owner] + window)
+    cumulative = np.concatenate([[0], np.cumsum(slashing)])
+    count = (cumulative[np.searchsorted(ts, last, 'right')]
+             - cumulative[np.searchsorted(ts, first, 'left')])
+
+    hit = near & (first <= last) & (count > 0)
+    return np.bincount(owner[hit], minlength=len(targets)) > 0
+
+
+def _segment_overlap(segments, other):
+    """For each run of True in segments, whether other is True anywhere in it"""
+    rising = segments & ~np.concatenate([[False], segments[:-1]])
+    ids = np.cumsum(rising) * segments
+    total = int(rising.sum())
+    touched = np.bincount(ids[segments & other], minlength=total + 1)[1:] > 0
+    return touched, total
+
+
+def evaluate(batch, history_size, min_velocity, collision_window, slice_threshold,
+             trail_lifetime=0.5, slashing=None):
+    """
+    Replay a batch with one parameter setting.
+
+    slashing may be passed in when several settings share history_size and
+    min_velocity, since the gesture pass does not depend on the others.
+
+    Returns a dict of error rates, NaN where the batch has nothing to
+    compare against (no labeled frames, no labeled slashes or no targets):
+        gesture_miss_rate: labeled slashes with no detected slashing frame
+        gesture_fp_rate:   detected slashes not overlapping any labeled slash
+        slice_miss_rate:   target fruits (sliced or missed in the recording)
+                           that would not have been sliced
+    """
+    if slashing is None:
+        slashing = slash_mask(batch.fingertips, history_size, min_velocity)
+
+    detected = slashing & batch.labeled
+    truth = batch.labels & batch.labeled
+    found, n_truth = _segment_overlap(truth, detected)
+    genuine, n_detected = _segment_overlap(detected, truth)
+
+    hits = slice_hits(batch, slashing, collision_window, slice_threshold, trail_lifetime)
+
+    return {
+        'gesture_miss_rate': float(1.0 - found.mean()) if n_truth else np.nan,
+        'gesture_fp_rate': ((float(1.0 - genuine.mean()) if n_detected else 0.0)
+                            if batch.labeled.any() else np.nan),
+        'slice_miss_rate': float(1.0 - hits.mean()) if len(hits) else np.nan,
+        'labeled_slashes': n_truth,
+        'detected_slashes': n_detected,
+        'targets': len(hits),
+    }
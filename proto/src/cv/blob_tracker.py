@@ -0,0 +1,117 @@
+"""
+Lightweight classical hand tracker for machines that cannot run MediaPipe
+"""
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 21  # Same landmark count as MediaPipe hands
+INDEX_FINGER_TIP = 8
+
+
+class BlobHandTracker:
+    """
+    Skin-color / motion blob segmentation on a downscaled frame.
+
+    The hand is taken to be the largest skin-colored blob that is moving (or
+    simply the largest skin blob when nothing moves). The fingertip is the
+    contour point above the blob centroid that lies farthest from it, which
+    matches an extended index finger. Results are returned in MediaPipe's
+    21-landmark layout so the rest of the game is unchanged: index 8 holds the
+    fingertip and every other landmark holds the centroid.
+    """
+
+    # Skin range in YCrCb (Cr, Cb); robust to brightness changes
+    SKIN_LOWER = np.array([0, 133, 77], dtype=np.uint8)
+    SKIN_UPPER = np.array([255, 173, 127], dtype=np.uint8)
+
+    def __init__(self, process_width=160, min_area=0.01, use_motion=True,
+                 motion_threshold=25):
+        self.process_width = process_width
+        self.min_area = min_area  # fraction of the downscaled frame
+        self.use_motion = use_motion
+        self.motion_threshold = motion_threshold
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self.prev_gray = None
+
+    def _segment(self, small):
+        """Return (skin mask, motion mask or None) for a downscaled frame"""
+        ycrcb = cv2.cvtColor(small, cv2.COLOR_BGR2YCrCb)
+        skin = cv2.inRange(ycrcb, self.SKIN_LOWER, self.SKIN_UPPER)
+        skin = cv2.morphologyEx(skin, cv2.MORPH_OPEN, self.kernel)
+
+        motion = None
+        if self.use_motion:
+            gray = ycrcb[:, :, 0]
+            if self.prev_gray is not None and self.prev_gray.shape == gray.shape:
+                diff = cv2.absdiff(gray, self.prev_gray)
+                _, motion = cv2.threshold(diff, self.motion_threshold, 255, cv2.THRESH_BINARY)
+                motion = cv2.dilate(motion, self.kernel, iterations=2)
+            self.prev_gray = gray.copy()
+        return skin, motion
+
+    def _pick_contour(self, contours, motion, min_pixels):
+        """Largest blob overlapping motion, else largest blob overall"""
+        candidates = [c for c in contours if cv2.contourArea(c) >= min_pixels]
+        if not candidates:
+            return None
+
+        if motion is not None:
+            moving = []
+            for contour in candidates:
+                x, y, w, h = cv2.boundingRect(contour)
+                if cv2.countNonZero(motion[y:y + h, x:x + w]) > 0:
+                    moving.append(contour)
+            if moving:
+                candidates = moving
+
+        return max(candidates, key=cv2.contourArea)
+
+    def process_frame(self, frame, timestamp_ms=None):
+        """
+        Returns list of hand landmarks (each landmark = (x, y) normalized [0,1])
+        or None if no hand-like blob is found.
+        """
+        h, w = frame.shape[:2]
+        scale = min(1.0, self.process_width / w)
+        small = cv2.resize(frame, (int(w * scale), int(h * scale)),
+                           interpolation=cv2.INTER_AREA) if scale < 1.0 else frame
+        sh, sw = small.shape[:2]
+
+        skin, motion = self._segment(small)
+        contours, _ = cv2.findContours(skin, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        contour = self._pick_contour(contours, motion, self.min_area * sw * sh)
+        if contour is None:
+            return None
+
+        moments = cv2.moments(contour)
+        if moments['m00'] == 0:
+            return None
+        cx = moments['m10'] / moments['m00']
+        cy = moments['m01'] / moments['m00']
+
+        # Extremal point: farthest contour point above the centroid
+        points = contour.reshape(-1, 2).astype(np.float32)
+        upper = points[points[:, 1] <= cy]
+        if len(upper) == 0:
+            upper = points
+        dist = (upper[:, 0] - cx) ** 2 + (upper[:, 1] - cy) ** 2
+        tip_x, tip_y = upper[int(np.argmax(dist))]
+
+        centroid = (cx / sw, cy / sh)
+        landmarks = [centroid] * NUM_LANDMARKS
+        landmarks[INDEX_FINGER_TIP] = (float(tip_x) / sw, float(tip_y) / sh)
+        return landmarks
+
+    def draw_landmarks(self, frame, landmarks):
+        """Optional: for debugging (centroid and fingertip only)"""
+        if landmarks:
+            h, w = frame.shape[:2]
+            cx, cy = landmarks[0]
+            tx, ty = landmarks[INDEX_FINGER_TIP]
+            cv2.circle(frame, (int(cx * w), int(cy * h)), 5, (0, 255, 0), -1)
+            cv2.line(frame, (int(cx * w), int(cy * h)), (int(tx * w), int(ty * h)),
+                     (0, 255, 0), 1)
+
+    def close(self):
+        """Nothing to release; present for interface parity"""
+        self.prev_gray = None
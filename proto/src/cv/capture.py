@@ -0,0 +1,356 @@
+"""
+Frame sources for the game loop: cameras, video files, image sequences and
+synthetic patterns behind one interface
+"""
+import glob
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+CAPTURE_BACKENDS = {
+    'any': cv2.CAP_ANY,
+    'v4l2': cv2.CAP_V4L2,
+    'dshow': cv2.CAP_DSHOW,
+    'msmf': cv2.CAP_MSMF,
+    'avfoundation': cv2.CAP_AVFOUNDATION,
+    'gstreamer': cv2.CAP_GSTREAMER,
+}
+
+SYNTHETIC_PATTERNS = ('hand', 'bars')
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class CaptureSource(ABC):
+    """
+    A source of BGR frames with cv2.VideoCapture's read()/release() interface.
+
+    Every source measures the frame rate it actually delivers and, where the
+    capture time is known, the latency from capture to read(). Subclasses
+    implement _read() returning (frame or None, capture time on the
+    time.monotonic() clock or None).
+    """
+
+    def __init__(self, stats_window: int = 300):
+        self.frames = 0
+        self._reads = deque(maxlen=stats_window)  # monotonic time of each read
+        self._latencies = deque(maxlen=stats_window)
+
+    def isOpened(self) -> bool:
+        return True
+
+    def read(self):
+        """(True, frame) or (False, None) at the end of the source"""
+        frame, captured = self._read()
+        if frame is None:
+            return False, None
+        now = time.monotonic()
+        self.frames += 1
+        self._reads.append(now)
+        if captured is not None:
+            self._latencies.append((now - captured) * 1000)
+        return True, frame
+
+    @abstractmethod
+    def _read(self):
+        """(frame or None at the end, capture time on the time.monotonic() clock or None)"""
+
+    def release(self):
+        pass
+
+    def describe(self) -> str:
+        """The mode the source is delivering (after negotiation with the device)"""
+        return type(self).__name__
+
+    def stats(self) -> Dict:
+        """
+        Returns:
+            {'frames', 'fps' (delivered, over the recent window),
+            'latency_ms', 'p95_ms'} where latency runs from capture to
+            read() returning and is None if the source cannot tell
+        """
+        reads = self._reads
+        fps = (len(reads) - 1) / (reads[-1] - reads[0]) if len(reads) > 1 and reads[-1] > reads[0] else None
+        latencies = sorted(self._latencies)
+        return {
+            'frames': self.frames,
+            'fps': fps,
+            'latency_ms': sum(latencies) / len(latencies) if latencies else None,
+            'p95_ms': latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+        }
+
+    def reset_stats(self):
+        """Forget the frames read so far (e.g. after warming up)"""
+        self.frames = 0
+        self._reads.clear()
+        self._latencies.clear()
+
+    def report(self) -> str:
+        stats = self.stats()
+        fps = f"{stats['fps']:.1f} FPS" if stats['fps'] is not None else "- FPS"
+        latency = (f"latency {stats['latency_ms']:.1f} ms (p95 {stats['p95_ms']:.1f} ms)"
+                   if stats['latency_ms'] is not None else "latency unknown")
+        return f"Capture: {self.describe()}: {stats['frames']} frames, {fps}, {latency}"
+
+
+class _Pacer:
+    """Sleeps until each frame's due time, like a device running at fps"""
+
+    def __init__(self, fps: Optional[float]):
+        self.interval = 1 / fps if fps else 0.0
+        self.next_due = None
+
+    def wait(self) -> float:
+        """Block until the next frame is due; returns its capture time"""
+        now = time.monotonic()
+        if not self.interval:
+            return now
+        if self.next_due is None or now - self.next_due > self.interval:
+            self.next_due = now  # first frame, or the reader fell behind: no catch-up burst
+        elif self.next_due > now:
+            time.sleep(self.next_due - now)
+        captured = self.next_due
+        self.next_due += self.interval
+        return captured
+
+
+class CameraSource(CaptureSource):
+    """
+    A camera through cv2.VideoCapture, with the capture mode spelled out.
+
+    On Linux, backend='v4l2' with fourcc='MJPG' lets many USB 2 webcams
+    deliver 30 FPS at sizes where uncompressed YUYV is limited by bandwidth
+    to far less, and buffer_size=1 stops frames from queueing in the driver
+    (the newest frame is read instead of one several frames old). V4L2
+    stamps each buffer on the monotonic clock, so capture-to-read latency
+    is measured exactly; other backends report FPS only.
+    """
+
+    def __init__(self, index=0, width: int = 640, height: int = 480, backend: str = 'any',
+                 fourcc: Optional[str] = None, fps: Optional[float] = None,
+                 buffer_size: Optional[int] = None):
+        """
+        Args:
+            index: Device index (or a device path / stream URL)
+            width: Requested frame width
+            height: Requested frame height
+            backend: One of CAPTURE_BACKENDS
+            fourcc: Pixel format to request, e.g. 'MJPG' or 'YUYV'
+            fps: Frame rate to request
+            buffer_size: Driver buffers (1 for the lowest latency)
+        """
+        super().__init__()
+        if backend not in CAPTURE_BACKENDS:
+            raise ValueError(f"Unknown capture backend '{backend}' "
+                             f"(expected one of {', '.join(CAPTURE_BACKENDS)})")
+        self.backend = backend
+        self.cap = cv2.VideoCapture(index, CAPTURE_BACKENDS[backend])
+        # FOURCC first: the sizes and rates a camera offers depend on the format
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+        if buffer_size:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+        self._device_clock = self.cap.getBackendName() == 'V4L2' if self.cap.isOpened() else False
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def _read(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            return None, None
+        captured = None
+        if self._device_clock:
+            stamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+            # Buffer timestamps are CLOCK_MONOTONIC on almost every driver;
+            # anything else would give a nonsense latency
+            if 0 <= time.monotonic() - stamp < 5:
+                captured = stamp
+        return frame, captured
+
+    def release(self):
+        self.cap.release()
+
+    def describe(self) -> str:
+        if not self.cap.isOpened():
+            return "camera (not opened)"
+        code = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        fourcc = ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip('\0') or '?'
+        return (f"{self.cap.getBackendName()} {fourcc} "
+                f"{int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x"
+                f"{int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))} "
+                f"@ {self.cap.get(cv2.CAP_PROP_FPS):.0f} FPS (driver setting)")
+
+
+class FileSource(CaptureSource):
+    """A video file played at its own frame rate (or as fast as it decodes)"""
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False):
+        """
+        Args:
+            path: Video file
+            realtime: Deliver frames at the file's frame rate, like a camera
+            loop: Start over at the end instead of ending
+        """
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        self.file_fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self._pacer = _Pacer(self.file_fps if realtime else None)
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def _read(self):
+        captured = self._pacer.wait()
+        ret, frame = self.cap.read()
+        if not ret and self.loop and self.frames:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return (frame, captured) if ret else (None, None)
+
+    def release(self):
+        self.cap.release()
+
+    def describe(self) -> str:
+        return f"file {os.path.basename(self.path)} @ {self.file_fps:.0f} FPS"
+
+
+class ImageSequenceSource(CaptureSource):
+    """Numbered images (a directory or a glob pattern) played as frames"""
+
+    def __init__(self, pattern: str, fps: Optional[float] = 30.0, loop: bool = False):
+        """
+        Args:
+            pattern: Directory of images or a glob such as 'frames/*.png'
+                (sorted by name)
+            fps: Delivery rate (None: as fast as they load)
+            loop: Start over at the end instead of ending
+        """
+        super().__init__()
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)
+                     if name.lower().endswith(IMAGE_EXTENSIONS)]
+        else:
+            paths = glob.glob(pattern)
+        self.paths = sorted(paths)
+        self.pattern = pattern
+        self.fps = fps
+        self.loop = loop
+        self._index = 0
+        self._pacer = _Pacer(fps)
+
+    def isOpened(self) -> bool:
+        return bool(self.paths)
+
+    def _read(self):
+        if self._index >= len(self.paths):
+            if not self.loop or not self.paths:
+                return None, None
+            self._index = 0
+        captured = self._pacer.wait()
+        frame = cv2.imread(self.paths[self._index])
+        self._index += 1
+        return frame, captured
+
+    def describe(self) -> str:
+        rate = f"{self.fps:.0f} FPS" if self.fps else "unpaced"
+        return f"{len(self.paths)} images from {self.pattern} @ {rate}"
+
+
+class SyntheticSource(CaptureSource):
+    """
+    Generated frames for running the pipeline without a device.
+
+    'hand' draws a skin-colored hand blob with a raised finger sweeping
+    across a dark background (the blob tracker follows it); 'bars' draws
+    color bars with the frame number.
+    """
+
+    def __init__(self, width: int = 640, height: int = 480, fps: Optional[float] = 30.0,
+                 pattern: str = 'hand', frames: Optional[int] = None):
+        """
+        Args:
+            width: Frame width
+            height: Frame height
+            fps: Delivery rate (None: as fast as they are drawn)
+            pattern: One of SYNTHETIC_PATTERNS
+            frames: End after this many frames (None: endless)
+        """
+        super().__init__()
+        if pattern not in SYNTHETIC_PATTERNS:
+            raise ValueError(f"Unknown synthetic pattern '{pattern}' "
+                             f"(expected one of {', '.join(SYNTHETIC_PATTERNS)})")
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.pattern = pattern
+        self.limit = frames
+        self._pacer = _Pacer(fps)
+
+    def render(self, index: int) -> np.ndarray:
+        """Frame number index of the pattern"""
+        width, height = self.width, self.height
+        if self.pattern == 'bars':
+            colors = [(255, 255, 255), (0, 255, 255), (255, 255, 0), (0, 255, 0),
+                      (255, 0, 255), (0, 0, 255), (255, 0, 0), (0, 0, 0)]
+            frame = np.empty((height, width, 3), dtype=np.uint8)
+            for i, color in enumerate(colors):
+                frame[:, i * width // len(colors):(i + 1) * width // len(colors)] = color
+            cv2.putText(frame, str(index), (10, height - 20), cv2.FONT_HERSHEY_SIMPLEX,
+                        1.5, (128, 128, 128), 3)
+            return frame
+
+        frame = np.full((height, width, 3), 40, dtype=np.uint8)
+        x = int((0.2 + 0.6 * (index % 60) / 60) * width)
+        y = int(0.6 * height)
+        cv2.ellipse(frame, (x, y), (width // 12, height // 8), 0, 0, 360, (80, 130, 200), -1)
+        cv2.rectangle(frame, (x - 6, y - height // 4), (x + 6, y), (80, 130, 200), -1)
+        return frame
+
+    def _read(self):
+        if self.limit is not None and self.frames >= self.limit:
+            return None, None
+        captured = self._pacer.wait()
+        return self.render(self.frames), captured
+
+    def describe(self) -> str:
+        rate = f"{self.fps:.0f} FPS" if self.fps else "unpaced"
+        return f"synthetic '{self.pattern}' {self.width}x{self.height} @ {rate}"
+
+
+def open_source(spec, config=None) -> CaptureSource:
+    """
+    Open a frame source from a command-line style spec
+
+    Args:
+        spec: Camera index ('0'), device path or stream URL, 'synthetic'
+            or 'synthetic:bars', a directory or glob of images, or a video file
+        config: GameConfig supplying the frame size and camera options
+            (CAMERA_BACKEND, CAMERA_FOURCC, CAMERA_FPS, CAMERA_BUFFER_SIZE)
+    """
+    from ..core.config import GameConfig
+    config = config or GameConfig()
+    spec = str(spec)
+    width, height = config.WINDOW_WIDTH, config.WINDOW_HEIGHT
+
+    if spec.isdigit() or spec.startswith('/dev/video') or '://' in spec:
+        return CameraSource(int(spec) if spec.isdigit() else spec, width, height,
+                            backend=config.CAMERA_BACKEND, fourcc=config.CAMERA_FOURCC,
+                            fps=config.CAMERA_FPS, buffer_size=config.CAMERA_BUFFER_SIZE)
+    if spec == 'synthetic' or spec.startswith('synthetic:'):
+        pattern = spec.partition(':')[2] or 'hand'
+        return SyntheticSource(width, height, fps=config.FPS, pattern=pattern)
+    if os.path.isdir(spec) or any(c in spec for c in '*?['):
+        return ImageSequenceSource(spec, fps=config.FPS)
+    return FileSource(spec)
@@ -17,10 +17,18 @@ class GestureDetector:
         Returns: Gesture
         """
         if not landmarks or len(landmarks) < 9:
+            return self.update_fingertip(None)
+        return self.update_fingertip(landmarks[8])  # MediaPipe index for index fingertip
+
+    def update_fingertip(self, fingertip):
+        """
+        fingertip: normalized (x, y) of the index fingertip, or None (no hand)
+        Returns: Gesture
+        """
+        if fingertip is None:
             self.history.clear()
             return Gesture.NONE
 
-        fingertip = landmarks[8]  # MediaPipe index for index fingertip
         self.history.append(fingertip)
 
         if len(self.history) < 2:
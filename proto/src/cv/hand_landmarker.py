@@ -0,0 +1,111 @@
+"""
+Asynchronous hand tracking with the MediaPipe Tasks HandLandmarker
+"""
+import os
+import threading
+import time
+
+import cv2
+import mediapipe as mp
+from mediapipe.tasks import python as mp_tasks
+from mediapipe.tasks.python import vision
+
+from .hand_tracker import draw_landmarks
+
+
+MODEL_URL = (
+    "https://storage.googleapis.com/mediapipe-models/hand_landmarker/"
+    "hand_landmarker/float16/latest/hand_landmarker.task"
+)
+
+
+class AsyncHandTracker:
+    """
+    HandLandmarker running in LIVE_STREAM mode.
+
+    process_frame() hands the frame to MediaPipe and returns immediately with
+    the newest landmarks delivered by the result callback, so inference runs
+    alongside physics and rendering instead of blocking the game loop. The
+    returned landmarks therefore lag the submitted frame by the inference
+    latency (typically one frame).
+    """
+
+    def __init__(self, model_path, max_hands=1, detection_conf=0.7, tracking_conf=0.7,
+                 create_landmarker=None):
+        """
+        Args:
+            model_path: hand_landmarker.task model file
+            create_landmarker: Callable(options) -> landmarker (default:
+                vision.HandLandmarker.create_from_options; tests pass a fake)
+        """
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(
+                f"HandLandmarker model not found at '{model_path}'. "
+                f"Download it from {MODEL_URL}"
+            )
+
+        self._lock = threading.Lock()
+        self._latest = None
+        self._latest_timestamp = -1
+        self._last_submitted = -1
+
+        options = vision.HandLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=max_hands,
+            min_hand_detection_confidence=detection_conf,
+            min_hand_presence_confidence=detection_conf,
+            min_tracking_confidence=tracking_conf,
+            result_callback=self._on_result
+        )
+        create_landmarker = create_landmarker or vision.HandLandmarker.create_from_options
+        self.landmarker = create_landmarker(options)
+
+    def _on_result(self, result, image, timestamp_ms):
+        """Result callback, invoked on MediaPipe's worker thread"""
+        landmarks = None
+        if result.hand_landmarks:
+            # Same format as HandTracker: normalized (x, y) of the first hand
+            landmarks = [(lm.x, lm.y) for lm in result.hand_landmarks[0]]
+
+        with self._lock:
+            # Results arrive in order, but never let an older one win
+            if timestamp_ms >= self._latest_timestamp:
+                self._latest = landmarks
+                self._latest_timestamp = timestamp_ms
+
+    def process_frame(self, frame, timestamp_ms=None):
+        """
+        Submit a frame for inference and return the newest available result.
+
+        Returns list of hand landmarks (each landmark = (x, y) normalized [0,1])
+        or None if no hand has been detected yet.
+        """
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+
+        # LIVE_STREAM mode rejects timestamps that do not strictly increase
+        if timestamp_ms <= self._last_submitted:
+            timestamp_ms = self._last_submitted + 1
+        self._last_submitted = timestamp_ms
+
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        self.landmarker.detect_async(image, timestamp_ms)
+
+        with self._lock:
+            return self._latest
+
+    @property
+    def result_timestamp_ms(self):
+        """Timestamp of the frame the current result was computed from"""
+        with self._lock:
+            return self._latest_timestamp
+
+    def draw_landmarks(self, frame, landmarks):
+        """Optional: for debugging"""
+        draw_landmarks(frame, landmarks)
+
+    def close(self):
+        """Stop the landmarker and release its graph"""
+        self.landmarker.close()
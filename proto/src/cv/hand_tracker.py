@@ -1,21 +1,37 @@
 import cv2
 import mediapipe as mp
 
+
+def draw_landmarks(frame, landmarks):
+    """Draw normalized (x, y) landmarks as dots (debug view shared by the trackers)"""
+    if landmarks:
+        h, w = frame.shape[:2]
+        for x, y in landmarks:
+            px, py = int(x * w), int(y * h)
+            cv2.circle(frame, (px, py), 3, (0, 255, 0), -1)
+
+
 class HandTracker:
-    def __init__(self, max_hands=1, detection_conf=0.7, tracking_conf=0.7):
+    def __init__(self, max_hands=1, detection_conf=0.7, tracking_conf=0.7,
+                 static_image_mode=False):
+        # static_image_mode treats every frame on its own (no tracking state):
+        # palm detection runs on every frame
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
+            static_image_mode=static_image_mode,
             max_num_hands=max_hands,
             min_detection_confidence=detection_conf,
             min_tracking_confidence=tracking_conf
         )
         self.mp_drawing = mp.solutions.drawing_utils
 
-    def process_frame(self, frame):
+    def process_frame(self, frame, timestamp_ms=None):
         """
         Returns list of hand landmarks (each landmark = (x, y) normalized [0,1])
         or None if no hand detected.
+
+        timestamp_ms is accepted for interface parity with AsyncHandTracker;
+        the synchronous solution does not need it.
         """
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = self.hands.process(rgb_frame)
@@ -34,8 +50,8 @@ class HandTracker:
 
     def draw_landmarks(self, frame, landmarks):
         """Optional: for debugging"""
-        if landmarks:
-            h, w = frame.shape[:2]
-            for x, y in landmarks:
-                px, py = int(x * w), int(y * h)
-                cv2.circle(frame, (px, py), 3, (0, 255, 0), -1)
\ No newline at end of file
+        draw_landmarks(frame, landmarks)
+
+    def close(self):
+        """Release the MediaPipe graph"""
+        self.hands.close()
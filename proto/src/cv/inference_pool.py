@@ -0,0 +1,219 @@
+"""
+Hand tracking for several camera stations on a shared pool of trackers
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from .backends import create_tracker
+from .hand_tracker import draw_landmarks
+
+
+class InferencePool:
+    """
+    A few worker threads running the hand trackers of many cameras.
+
+    Every station has its own tracker, so trackers keep their state between
+    frames (MediaPipe tracks the hand from the previous frame's landmarks
+    instead of running palm detection on every frame), but only `workers`
+    of them run at once: CPU use is capped at the pool size whatever the
+    number of cameras. MediaPipe releases the GIL while it runs inference,
+    so workers use separate cores.
+
+    Every station has a single frame slot: a newer frame replaces one still
+    waiting, so a backlog never builds up and a station always gets its
+    freshest frame processed. Stations with a waiting frame are served
+    first come, first served, and at most one frame per station is in
+    flight, so a fast camera cannot starve the others and a tracker is
+    never used by two workers at once.
+    """
+
+    def __init__(self, tracker_factory: Callable, workers: int = 2, latency_window: int = 300):
+        """
+        Args:
+            tracker_factory: Callable returning a new tracker (HandTracker
+                interface); called once per station
+            workers: Number of worker threads
+            latency_window: Recent frames kept per station for latency stats
+        """
+        self.workers = workers
+        self.latency_window = latency_window
+        self.tracker_factory = tracker_factory
+        self._cond = threading.Condition()
+        self._ready = deque()  # stations with a waiting frame, oldest first
+        self._stations = {}
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"inference-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def station(self, name: Optional[str] = None) -> 'PooledTracker':
+        """Register a camera, create its tracker and return its handle"""
+        tracker = self.tracker_factory()
+        with self._cond:
+            name = name or f"station{len(self._stations)}"
+            if name in self._stations:
+                tracker.close()
+                raise ValueError(f"station '{name}' already registered")
+            self._stations[name] = _StationState(tracker, self.latency_window)
+        return PooledTracker(self, name)
+
+    def submit(self, name: str, frame, timestamp_ms: int):
+        """Queue frame for the station, replacing a frame that is still waiting"""
+        frame = frame.copy()  # the caller draws on its frame right after
+        with self._cond:
+            state = self._stations[name]
+            state.submitted += 1
+            if state.pending is not None:
+                state.dropped += 1
+            state.pending = (frame, timestamp_ms, time.perf_counter())
+            if not state.busy and not state.queued:
+                state.queued = True
+                self._ready.append(name)
+                self._cond.notify()
+
+    def result(self, name: str):
+        """Newest landmarks computed for the station (None if no hand)"""
+        with self._cond:
+            return self._stations[name].latest
+
+    def remove(self, name: str):
+        """Forget a station and close its tracker (its queued frame is discarded)"""
+        with self._cond:
+            state = self._stations.pop(name, None)
+            if state is None:
+                return
+            state.removed = True
+            if state.busy:
+                return  # the worker running it closes it when done
+        state.tracker.close()
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Per-station counters and latency
+
+        Returns:
+            Station name -> {'submitted', 'processed', 'dropped',
+            'latency_ms', 'p95_ms'} where latency runs from submit() to the
+            result being available (queueing plus inference)
+        """
+        with self._cond:
+            return {name: state.summary() for name, state in self._stations.items()}
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop the workers and release the trackers"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        for name in list(self._stations):
+            self.remove(name)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._ready and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                name = self._ready.popleft()
+                state = self._stations.get(name)
+                if state is None:
+                    continue
+                frame, timestamp_ms, submitted_at = state.pending
+                state.pending = None
+                state.queued = False
+                state.busy = True
+
+            try:
+                landmarks = state.tracker.process_frame(frame, timestamp_ms)
+            except Exception as e:
+                print(f"Hand tracking failed for {name}: {e}")
+                landmarks = None
+
+            with self._cond:
+                state.busy = False
+                if state.removed:
+                    state.tracker.close()
+                    continue
+                if state.timestamp_ms <= timestamp_ms:
+                    state.latest = landmarks
+                    state.timestamp_ms = timestamp_ms
+                state.processed += 1
+                state.latencies.append((time.perf_counter() - submitted_at) * 1000)
+                # A frame that arrived meanwhile goes to the back of the line
+                if state.pending is not None and name in self._stations:
+                    state.queued = True
+                    self._ready.append(name)
+                    self._cond.notify()
+
+
+class _StationState:
+    def __init__(self, tracker, latency_window: int):
+        self.tracker = tracker
+        self.removed = False
+        self.pending = None  # (frame, timestamp_ms, submitted perf_counter)
+        self.queued = False
+        self.busy = False
+        self.latest = None
+        self.timestamp_ms = -1
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.latencies = deque(maxlen=latency_window)
+
+    def summary(self) -> Dict:
+        latencies = sorted(self.latencies)
+        return {
+            'submitted': self.submitted,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'latency_ms': sum(latencies) / len(latencies) if latencies else None,
+            'p95_ms': latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+        }
+
+
+class PooledTracker:
+    """
+    HandTracker interface for one station of an InferencePool.
+
+    process_frame() queues the frame and returns at once with the newest
+    finished result, like AsyncHandTracker: landmarks lag the frame by the
+    pool's latency (see InferencePool.stats).
+    """
+
+    def __init__(self, pool: InferencePool, name: str):
+        self.pool = pool
+        self.name = name
+
+    def process_frame(self, frame, timestamp_ms=None):
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+        self.pool.submit(self.name, frame, timestamp_ms)
+        return self.pool.result(self.name)
+
+    def draw_landmarks(self, frame, landmarks):
+        """Optional: for debugging"""
+        draw_landmarks(frame, landmarks)
+
+    def close(self):
+        """Leave the pool (the pool itself keeps running)"""
+        self.pool.remove(self.name)
+
+
+def pooled_tracker_factory(config) -> Callable:
+    """
+    Factory for the configured backend's per-station trackers
+
+    The Tasks backend runs inference on MediaPipe's own threads, outside the
+    pool's workers, so it cannot be pooled.
+    """
+    if config.TRACKER_BACKEND == 'tasks':
+        raise ValueError("The 'tasks' tracker runs on its own threads and cannot be "
+                         "pooled; use 'solutions' or 'blob'")
+    return lambda: create_tracker(config.TRACKER_BACKEND, config)
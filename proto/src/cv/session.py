@@ -0,0 +1,143 @@
+"""
+Recorded landmark sessions for offline analysis and tuning
+"""
+import json
+import math
+import time
+
+import numpy as np
+
+
+class LandmarkSession:
+    """
+    Fingertip track of one play session.
+
+    Arrays:
+        timestamps: (N,) seconds since the first frame
+        fingertips: (N, 2) normalized index fingertip, NaN when no hand
+        labels:     (N,) bool ground truth "player is slashing" (optional)
+        targets:    (M, 5) fruits as (timestamp, x_px, y_px, radius_px, sliced)
+                    (optional)
+
+    The game records every fruit it spawned as a target: a sliced fruit where
+    it was sliced, a missed one where it came closest to the fingertip, with
+    sliced 1.0 or 0.0. Nothing in the game writes labels; they are annotated
+    outside it and saved into the session file. Sessions without them can
+    still be replayed but do not contribute to gesture error rates.
+    """
+
+    def __init__(self, timestamps, fingertips, labels=None, targets=None,
+                 width=640, height=480, metadata=None):
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.fingertips = np.asarray(fingertips, dtype=np.float64).reshape(-1, 2)
+        self.labels = None if labels is None else np.asarray(labels, dtype=bool)
+        self.targets = None
+        if targets is not None:
+            targets = np.asarray(targets, dtype=np.float64)
+            targets = targets.reshape(-1, targets.shape[-1] if targets.size else 5)
+            if targets.shape[1] == 4:  # recorded when only sliced fruits were
+                targets = np.column_stack([targets, np.ones(len(targets))])
+            self.targets = targets
+        self.width = width
+        self.height = height
+        self.metadata = metadata or {}
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def difficulty(self):
+        return self.metadata.get('difficulty', 'medium')
+
+    def save(self, path):
+        """Save as a compressed .npz file"""
+        arrays = {
+            'timestamps': self.timestamps,
+            'fingertips': self.fingertips,
+            'size': np.array([self.width, self.height]),
+            'metadata': np.array(json.dumps(self.metadata)),
+        }
+        if self.labels is not None:
+            arrays['labels'] = self.labels
+        if self.targets is not None:
+            arrays['targets'] = self.targets
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Load a session saved with save()"""
+        with np.load(path) as data:
+            width, height = data['size']
+            return cls(
+                data['timestamps'],
+                data['fingertips'],
+                labels=data['labels'] if 'labels' in data else None,
+                targets=data['targets'] if 'targets' in data else None,
+                width=int(width),
+                height=int(height),
+                metadata=json.loads(str(data['metadata']))
+            )
+
+
+class SessionRecorder:
+    """
+    Collects per-frame fingertips from the game loop into a LandmarkSession,
+    with every fruit as a target
+    """
+
+    def __init__(self, width=640, height=480, metadata=None):
+        self.width = width
+        self.height = height
+        self.metadata = metadata or {}
+        self.start_time = None
+        self.timestamps = []
+        self.fingertips = []
+        self.targets = []
+        self._nearest = {}  # id(fruit) -> (distance, timestamp, x, y, radius)
+
+    def add_frame(self, landmarks, timestamp=None):
+        """Record one frame; landmarks as returned by the hand tracker"""
+        timestamp = time.time() if timestamp is None else timestamp
+        if self.start_time is None:
+            self.start_time = timestamp
+        self.timestamps.append(timestamp - self.start_time)
+        if landmarks and len(landmarks) > 8:
+            self.fingertips.append(landmarks[8])
+        else:
+            self.fingertips.append((np.nan, np.nan))
+
+    def track_fruits(self, fruits):
+        """Remember where each live fruit came closest to the latest fingertip"""
+        if not self.timestamps:
+            return
+        tip_x, tip_y = self.fingertips[-1]
+        for fruit in fruits:
+            if not fruit.alive:
+                continue
+            distance = math.hypot(tip_x * self.width - fruit.x, tip_y * self.height - fruit.y)
+            if math.isnan(distance):  # no hand this frame
+                distance = math.inf
+            nearest = self._nearest.get(id(fruit))
+            if nearest is None or distance < nearest[0]:
+                self._nearest[id(fruit)] = (distance, self.timestamps[-1],
+                                            fruit.x, fruit.y, fruit.radius)
+
+    def add_target(self, fruit, sliced=True):
+        """
+        Record a fruit leaving play: sliced on the latest frame, at its pixel
+        position, or missed, where track_fruits() saw it closest to the hand
+        """
+        nearest = self._nearest.pop(id(fruit), None)
+        if sliced and self.timestamps:
+            self.targets.append((self.timestamps[-1], fruit.x, fruit.y, fruit.radius, 1.0))
+        elif not sliced and nearest is not None:
+            self.targets.append(nearest[1:] + (0.0,))
+
+    def to_session(self):
+        return LandmarkSession(
+            self.timestamps, self.fingertips, targets=np.reshape(self.targets, (-1, 5)),
+            width=self.width, height=self.height, metadata=dict(self.metadata)
+        )
+
+    def save(self, path):
+        self.to_session().save(path)
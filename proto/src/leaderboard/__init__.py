@@ -1,7 +1,31 @@
 """
-Leaderboard functionality with Supabase integration
+Leaderboard functionality with Supabase or local SQLite storage
 """
 
 from .leaderboard import Leaderboard
+from .cache import TTLCache
+from .histogram import ScoreHistogram
+from .journal import ScoreJournal, ScoreSubmitter
+from .storage import AdminStorage, LeaderboardStorage, create_storage
+from .supabase_storage import SupabaseStorage
+from .sqlite_storage import SQLiteStorage
+from .proxy import LeaderboardProxy, ProxyStorage
+from .transfer import export_scores, import_scores, read_scores
 
-__all__ = ['Leaderboard']
+__all__ = [
+    'Leaderboard',
+    'TTLCache',
+    'ScoreHistogram',
+    'ScoreJournal',
+    'ScoreSubmitter',
+    'LeaderboardStorage',
+    'AdminStorage',
+    'create_storage',
+    'SupabaseStorage',
+    'SQLiteStorage',
+    'LeaderboardProxy',
+    'ProxyStorage',
+    'export_scores',
+    'import_scores',
+    'read_scores',
+]
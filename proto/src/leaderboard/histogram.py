@@ -0,0 +1,163 @@
+"""
+Local score histogram for instant percentile and rank estimates
+"""
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from .storage import DIFFICULTIES
+
+
+class ScoreHistogram:
+    """
+    Per-difficulty score counts mirrored from the leaderboard table.
+
+    sync() only fetches rows with an id above the last one seen, less a
+    margin, so keeping the histogram current costs one small request per
+    game. Queries bisect a sorted cumulative table built on first use after
+    a change and take microseconds. The counts and the cursor are saved to a
+    JSON file.
+
+    The cursor is the row id rather than created_at: scores uploaded late
+    from a kiosk's journal keep their original created_at and would
+    otherwise be skipped. Ids are handed out when an insert starts, so a
+    row can commit after rows with higher ids; sync() re-reads the last
+    margin ids and skips the ones already counted. A row that commits more
+    than margin ids late is never counted, so counts are approximate.
+    """
+
+    def __init__(self, path: Optional[str] = 'data/score_histogram.json', margin: int = 100):
+        """
+        Args:
+            path: JSON file the histogram is kept in (None: memory only)
+            margin: Ids below the cursor that every sync reads again
+        """
+        self.path = path
+        self.margin = margin
+        self.cursor = 0
+        self._floor = 0  # rows with an id up to this are never counted again
+        self._recent = set()  # counted ids above _floor
+        self._counts = {difficulty: Counter() for difficulty in DIFFICULTIES}
+        self._tables = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.RLock()  # overlapping syncs would count rows twice
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self.cursor = state['cursor']
+            # Files from before the overlap: the rows below the cursor are unknown
+            self._floor = state.get('floor', self.cursor)
+            self._recent = set(state.get('recent', ()))
+            for difficulty, counts in state['counts'].items():
+                self._counts[difficulty] = Counter({int(s): n for s, n in counts.items()})
+
+    def add(self, rows: Iterable[Dict]) -> int:
+        """
+        Count rows (dicts with id, score and difficulty) and advance the
+        cursor; rows counted before are skipped
+        """
+        added = 0
+        with self._lock:
+            for row in rows:
+                if row['id'] <= self._floor or row['id'] in self._recent:
+                    continue
+                self._counts.setdefault(row['difficulty'], Counter())[row['score']] += 1
+                self._recent.add(row['id'])
+                self.cursor = max(self.cursor, row['id'])
+                added += 1
+            if added:
+                self._tables.clear()
+                self._floor = max(self._floor, self.cursor - self.margin)
+                self._recent = {i for i in self._recent if i > self._floor}
+        return added
+
+    def sync(self, storage, page_size: int = 1000) -> int:
+        """
+        Fetch rows added since the last sync, re-reading the last margin ids
+
+        Returns:
+            Number of new rows (progress is kept if a later page fails)
+        """
+        added = 0
+        with self._sync_lock:
+            try:
+                page = []
+                for row in storage.iter_scores('id', page_size, after=(self._floor, self._floor)):
+                    page.append(row)
+                    if len(page) == page_size:
+                        added += self.add(page)
+                        page = []
+                added += self.add(page)
+            finally:
+                if added:
+                    self.save()
+        return added
+
+    def rebuild(self, storage, page_size: int = 1000) -> int:
+        """Discard the local counts and sync from scratch (after rows were deleted)"""
+        with self._sync_lock, self._lock:
+            self.cursor = self._floor = 0
+            self._recent = set()
+            self._counts = {difficulty: Counter() for difficulty in DIFFICULTIES}
+            self._tables.clear()
+        return self.sync(storage, page_size)
+
+    def save(self):
+        """Write the histogram atomically (no-op for memory-only histograms)"""
+        if not self.path:
+            return
+        with self._lock:
+            state = {
+                'cursor': self.cursor,
+                'floor': self._floor,
+                'recent': sorted(self._recent),
+                'counts': {d: {str(s): n for s, n in c.items()} for d, c in self._counts.items()}
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def _table(self, difficulty: Optional[str]):
+        """Sorted distinct scores and the running count of scores up to each"""
+        with self._lock:
+            table = self._tables.get(difficulty)
+            if table is None:
+                if difficulty:
+                    counts = self._counts.get(difficulty, Counter())
+                else:
+                    counts = sum(self._counts.values(), Counter())
+                values = sorted(counts)
+                cumulative, running = [], 0
+                for value in values:
+                    running += counts[value]
+                    cumulative.append(running)
+                table = self._tables[difficulty] = (values, cumulative)
+            return table
+
+    def total(self, difficulty: Optional[str] = None) -> int:
+        cumulative = self._table(difficulty)[1]
+        return cumulative[-1] if cumulative else 0
+
+    def count_below(self, score: int, difficulty: Optional[str] = None) -> int:
+        values, cumulative = self._table(difficulty)
+        index = bisect_left(values, score)
+        return cumulative[index - 1] if index else 0
+
+    def count_above(self, score: int, difficulty: Optional[str] = None) -> int:
+        values, cumulative = self._table(difficulty)
+        index = bisect_right(values, score)
+        total = cumulative[-1] if cumulative else 0
+        return total - (cumulative[index - 1] if index else 0)
+
+    def percentile(self, score: int, difficulty: Optional[str] = None) -> Optional[float]:
+        """Percentage of recorded scores strictly below score (None if none recorded)"""
+        total = self.total(difficulty)
+        if not total:
+            return None
+        return 100.0 * self.count_below(score, difficulty) / total
@@ -0,0 +1,294 @@
+"""
+Durable write-behind queue for score submission
+"""
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class ScoreJournal:
+    """
+    Local SQLite journal of scores waiting to be uploaded.
+
+    Every append is committed with synchronous=FULL before returning, so a
+    score survives crashes, power loss and network outages. Rows carry a
+    submission_id that doubles as the upstream idempotency key.
+    """
+
+    def __init__(self, path: str = 'data/score_journal.db'):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=FULL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS pending_scores (
+                submission_id TEXT PRIMARY KEY,
+                player_name TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                difficulty TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                replay TEXT
+            )
+        ''')
+        # Dead letters: rows that can never be accepted (they fail validation)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS rejected_scores (
+                submission_id TEXT PRIMARY KEY,
+                player_name TEXT,
+                score INTEGER,
+                difficulty TEXT,
+                created_at TEXT,
+                replay TEXT,
+                error TEXT NOT NULL,
+                rejected_at TEXT NOT NULL
+            )
+        ''')
+        # Journals created before replays were recorded
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(pending_scores)')]
+        if 'replay' not in columns:
+            self._conn.execute('ALTER TABLE pending_scores ADD COLUMN replay TEXT')
+        self._conn.commit()
+
+    def append(self, player_name: str, score: int, difficulty: str = 'medium',
+               submission_id: Optional[str] = None, created_at: Optional[str] = None,
+               replay: Optional[str] = None) -> str:
+        """
+        Durably record a score
+
+        Args:
+            submission_id: Keep an id assigned elsewhere (appending the same
+                id twice records the score once)
+            created_at: Keep the original timestamp
+            replay: Encoded gameplay trace uploaded with the score
+
+        Returns:
+            The submission_id assigned to the entry
+        """
+        submission_id = submission_id or str(uuid.uuid4())
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO pending_scores '
+                '(submission_id, player_name, score, difficulty, created_at, replay) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (submission_id, player_name, score, difficulty,
+                 created_at or datetime.utcnow().isoformat(), replay)
+            )
+            self._conn.commit()
+        return submission_id
+
+    def due(self, limit: int = 50, now: Optional[float] = None) -> List[Dict]:
+        """Oldest entries whose backoff has elapsed"""
+        now = time.time() if now is None else now
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT submission_id, player_name, score, difficulty, created_at, attempts, replay '
+                'FROM pending_scores WHERE next_attempt <= ? ORDER BY created_at LIMIT ?',
+                (now, limit)
+            )
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def next_due_time(self) -> Optional[float]:
+        """When the earliest pending entry becomes due (None if empty)"""
+        with self._lock:
+            row = self._conn.execute('SELECT MIN(next_attempt) FROM pending_scores').fetchone()
+        return row[0]
+
+    def mark_sent(self, submission_ids: List[str]):
+        """Remove entries that reached the server"""
+        with self._lock:
+            self._conn.executemany(
+                'DELETE FROM pending_scores WHERE submission_id = ?',
+                [(sid,) for sid in submission_ids]
+            )
+            self._conn.commit()
+
+    def mark_failed(self, submission_ids: List[str], error: str, next_attempt: float):
+        """Record a failed attempt and schedule the retry"""
+        with self._lock:
+            self._conn.executemany(
+                'UPDATE pending_scores SET attempts = attempts + 1, next_attempt = ?, last_error = ? '
+                'WHERE submission_id = ?',
+                [(next_attempt, error, sid) for sid in submission_ids]
+            )
+            self._conn.commit()
+
+    def mark_rejected(self, submission_ids: List[str], error: str):
+        """Move entries that can never be accepted to rejected_scores"""
+        rejected_at = datetime.utcnow().isoformat()
+        with self._lock:
+            for sid in submission_ids:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO rejected_scores '
+                    '(submission_id, player_name, score, difficulty, created_at, replay, '
+                    'error, rejected_at) '
+                    'SELECT submission_id, player_name, score, difficulty, created_at, replay, ?, ? '
+                    'FROM pending_scores WHERE submission_id = ?',
+                    (error, rejected_at, sid)
+                )
+                self._conn.execute('DELETE FROM pending_scores WHERE submission_id = ?', (sid,))
+            self._conn.commit()
+
+    def rejected(self, limit: int = 100) -> List[Dict]:
+        """Most recently rejected entries with their error"""
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT submission_id, player_name, score, difficulty, created_at, error, rejected_at '
+                'FROM rejected_scores ORDER BY rejected_at DESC LIMIT ?', (limit,)
+            )
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM pending_scores').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ScoreSubmitter:
+    """
+    Background worker that drains a ScoreJournal into the leaderboard.
+
+    submit() only appends to the journal and returns immediately. The worker
+    uploads due entries with Leaderboard.submit_scores in batches; failed
+    rows are retried with capped, jittered exponential backoff. Rows that
+    fail validation would fail every retry, so they are logged and moved to
+    the journal's rejected_scores table instead. Uploads are
+    idempotent on submission_id, so a batch that reached the server before a
+    timeout is never duplicated.
+    """
+
+    def __init__(self, leaderboard, journal: ScoreJournal, batch_size: int = 50,
+                 base_delay: float = 1.0, max_delay: float = 300.0, linger: float = 0.0):
+        """
+        Args:
+            leaderboard: Leaderboard the entries are uploaded to
+            journal: Journal to drain
+            batch_size: Maximum rows per upload
+            base_delay: First retry delay in seconds (doubles per attempt)
+            max_delay: Retry delay cap in seconds
+            linger: Seconds to wait after being woken before uploading, so
+                scores arriving together go up in one request
+        """
+        self.leaderboard = leaderboard
+        self.journal = journal
+        self.batch_size = batch_size
+        self.linger = linger
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        # Held by submit() around append + clear and by the worker around its
+        # "nothing due" check + set, so idle is never set over a fresh score
+        self._idle_lock = threading.Lock()
+        self._stopping = False
+        self._thread = None
+        self.sent = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def submit(self, player_name: str, score: int, difficulty: str = 'medium',
+               submission_id: Optional[str] = None, created_at: Optional[str] = None,
+               replay: Optional[str] = None) -> str:
+        """Journal a score for background upload; never blocks on the network"""
+        with self._idle_lock:
+            submission_id = self.journal.append(player_name, score, difficulty,
+                                                submission_id, created_at, replay)
+            self._idle.clear()
+        self._wake.set()
+        return submission_id
+
+    def start(self):
+        """Start the background worker (also drains entries left from earlier runs)"""
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='score-submitter', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        """Give pending uploads up to timeout seconds, then stop the worker"""
+        if self._thread is None:
+            return
+        self.flush(timeout)
+        self._stopping = True
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the worker has nothing left to send right now
+
+        Returns:
+            True if the journal is empty, False on timeout or while failed
+            entries are waiting out their backoff
+        """
+        self._wake.set()
+        self._idle.wait(timeout)
+        return len(self.journal) == 0
+
+    def pending(self) -> int:
+        return len(self.journal)
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** attempts))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _set_idle_if_drained(self):
+        """Signal flush() unless a score became due since the last check"""
+        with self._idle_lock:
+            if not self.journal.due(1):
+                self._idle.set()
+
+    def _run(self):
+        while not self._stopping:
+            batch = self.journal.due(self.batch_size)
+            if not batch:
+                self._set_idle_if_drained()
+                next_due = self.journal.next_due_time()
+                wait = None if next_due is None else max(0.05, next_due - time.time())
+                self._wake.wait(wait)
+                self._wake.clear()
+                if self.linger and not self._stopping:
+                    time.sleep(self.linger)
+                continue
+
+            results = self.leaderboard.submit_scores(batch, chunk_size=self.batch_size)
+            sent = [r['submission_id'] for r in results if r['ok']]
+            if sent:
+                self.journal.mark_sent(sent)
+                self.sent += len(sent)
+
+            for entry, result in zip(batch, results):
+                if result.get('rejected'):
+                    print(f"Rejected score {entry['submission_id']} "
+                          f"({entry['player_name']!r}, {entry['score']}, {entry['difficulty']!r}): "
+                          f"{result['error']}")
+                    self.journal.mark_rejected([entry['submission_id']], result['error'])
+                    self.rejected += 1
+
+            failed = [(entry, r) for entry, r in zip(batch, results)
+                      if not r['ok'] and not r.get('rejected')]
+            if failed:
+                self.failures += 1
+                for entry, result in failed:
+                    retry_at = time.time() + self._backoff(entry['attempts'])
+                    self.journal.mark_failed([entry['submission_id']], result['error'], retry_at)
+                # Nothing else can be sent until the backoff elapses
+                self._set_idle_if_drained()
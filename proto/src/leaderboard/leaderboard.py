@@ -1,30 +1,42 @@
 """
-Leaderboard management with Supabase backend
+Leaderboard management with pluggable storage (Supabase or local SQLite)
 """
-import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Optional
 from datetime import datetime
-from supabase import create_client, Client
+
+from .cache import TTLCache, record_new_score
+from .histogram import ScoreHistogram
+from .storage import DIFFICULTIES, LeaderboardStorage, create_storage, validate_score_row
 
 
 class Leaderboard:
-    """Manages game leaderboard with Supabase backend"""
+    """Manages game leaderboard on top of a storage backend"""
     
-    def __init__(self):
-        """Initialize Supabase client"""
-        self.supabase_url = os.getenv('SUPABASE_URL')
-        self.supabase_key = os.getenv('SUPABASE_KEY')
-        
-        if not self.supabase_url or not self.supabase_key:
-            raise ValueError(
-                "Supabase credentials not found. "
-                "Please set SUPABASE_URL and SUPABASE_KEY environment variables."
-            )
+    def __init__(self, storage: Optional[LeaderboardStorage] = None, cache_ttl: float = 30.0,
+                 cache_size: int = 256, histogram: Optional[ScoreHistogram] = None):
+        """
+        Initialize the leaderboard
         
-        self.client: Client = create_client(self.supabase_url, self.supabase_key)
-        self.table_name = 'leaderboard'
+        Args:
+            storage: Storage backend; by default chosen by LEADERBOARD_BACKEND
+                (Supabase unless set to 'sqlite')
+            cache_ttl: Seconds read queries are served from the local cache
+                (0 disables caching)
+            cache_size: Maximum number of cached queries (LRU eviction)
+            histogram: Local score histogram for percentile and approximate
+                rank lookups (default: in memory, filled by sync_histogram)
+        """
+        self.storage = storage or create_storage()
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self.histogram = histogram or ScoreHistogram(path=None)
     
-    def submit_score(self, player_name: str, score: int, difficulty: str = 'medium') -> bool:
+    def submit_score(self, player_name: str, score: int, difficulty: str = 'medium',
+                     submission_id: Optional[str] = None, replay: Optional[str] = None) -> bool:
         """
         Submit a score to the leaderboard
         
@@ -32,6 +44,8 @@ class Leaderboard:
             player_name: Name of the player
             score: Score achieved
             difficulty: Game difficulty level
+            submission_id: Idempotency key; resubmitting the same id is a no-op
+            replay: Encoded gameplay trace (FruitNinjaGame.replay.encode())
             
         Returns:
             True if submission was successful, False otherwise
@@ -41,18 +55,76 @@ class Leaderboard:
                 'player_name': player_name,
                 'score': score,
                 'difficulty': difficulty,
-                'created_at': datetime.utcnow().isoformat()
+                'created_at': datetime.utcnow().isoformat(),
+                'submission_id': submission_id or str(uuid.uuid4())
             }
+            if replay:
+                data['replay'] = replay
             
-            response = self.client.table(self.table_name).insert(data).execute()
-            if hasattr(response, 'error') and response.error:
-                print(f"Error submitting score: {response.error}")
-                return False
+            self._insert_rows([data])
             return True
         except Exception as e:
             print(f"Error submitting score: {e}")
             return False
     
+    def submit_scores(self, entries: List[Dict], chunk_size: int = 500,
+                      stop_on_error: bool = True) -> List[Dict]:
+        """
+        Submit many scores with one request per chunk
+        
+        Args:
+            entries: Dicts with player_name, score, difficulty and optionally
+                created_at, submission_id (idempotency key, generated if missing)
+                and replay
+            chunk_size: Maximum rows per request
+            stop_on_error: After a chunk fails, skip the remaining chunks (they
+                are reported as failed) instead of waiting on each one
+            
+        Returns:
+            One result per entry, in order: {'submission_id', 'ok', 'error',
+            'rejected'}; rejected rows failed validation and will fail the
+            same way on every retry
+        """
+        rows, results = [], []
+        for entry in entries:
+            row = {
+                'player_name': entry.get('player_name'),
+                'score': entry.get('score'),
+                'difficulty': entry.get('difficulty', 'medium'),
+                'created_at': entry.get('created_at') or datetime.utcnow().isoformat(),
+                'submission_id': entry.get('submission_id') or str(uuid.uuid4())
+            }
+            if entry.get('replay'):
+                row['replay'] = entry['replay']
+            # Invalid rows are rejected locally so they cannot fail a whole chunk
+            error = validate_score_row(row)
+            results.append({'submission_id': row['submission_id'], 'ok': False, 'error': error,
+                            'rejected': error is not None})
+            if error is None:
+                rows.append((len(results) - 1, row))
+        
+        failure = None
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            if failure is None:
+                try:
+                    self._insert_rows([row for _, row in chunk])
+                except Exception as e:
+                    print(f"Error submitting scores: {e}")
+                    failure = str(e)
+                    for idx, _ in chunk:
+                        results[idx]['error'] = failure
+                    if not stop_on_error:
+                        failure = None
+                    continue
+                for idx, _ in chunk:
+                    results[idx]['ok'] = True
+            else:
+                for idx, _ in chunk:
+                    results[idx]['error'] = f"not attempted: {failure}"
+        
+        return results
+    
     def get_top_scores(self, limit: int = 10, difficulty: Optional[str] = None) -> List[Dict]:
         """
         Get top scores from the leaderboard
@@ -65,21 +137,47 @@ class Leaderboard:
             List of score entries
         """
         try:
-            query = self.client.table(self.table_name).select('*')
-            
-            if difficulty:
-                query = query.eq('difficulty', difficulty)
-            
-            response = query.order('score', desc=True).limit(limit).execute()
-            return response.data
+            return self.cached(('top', difficulty, limit),
+                               lambda: self._fetch_top_scores(limit, difficulty))
         except Exception as e:
             print(f"Error fetching leaderboard: {e}")
             return []
     
+    def get_top_scores_by_difficulty(self, limit: int = 10) -> Dict[str, List[Dict]]:
+        """
+        Get the top scores of every difficulty in one request
+        
+        Args:
+            limit: Maximum number of scores per difficulty
+            
+        Returns:
+            {'easy': [...], 'medium': [...], 'hard': [...]}, each list best
+            first; the shape LeaderboardUI.draw_boards renders
+        """
+        try:
+            return self.fetch_top_scores_by_difficulty(limit)
+        except Exception as e:
+            print(f"Error fetching leaderboards: {e}")
+            return {difficulty: [] for difficulty in DIFFICULTIES}
+    
+    def fetch_top_scores_by_difficulty(self, limit: int = 10) -> Dict[str, List[Dict]]:
+        """
+        get_top_scores_by_difficulty for callers that keep their own fallback
+        
+        Served through the read cache (a miss refreshes it), but a failure
+        raises instead of returning empty boards.
+        """
+        return self.cached(('boards', None, limit),
+                           lambda: self._fetch_top_scores_by_difficulty(limit))
+    
     def get_player_rank(self, player_name: str, difficulty: Optional[str] = None) -> Optional[int]:
         """
         Get the rank of a specific player
         
+        The rank is 1 + the number of scores above the player's best, counted
+        by the storage backend (served from idx_leaderboard_difficulty_score),
+        so no leaderboard rows are downloaded.
+        
         Args:
             player_name: Name of the player
             difficulty: Filter by difficulty level
@@ -88,22 +186,57 @@ class Leaderboard:
             Player's rank (1-indexed) or None if not found
         """
         try:
-            query = self.client.table(self.table_name).select('player_name, score')
-            
-            if difficulty:
-                query = query.eq('difficulty', difficulty)
-            
-            response = query.order('score', desc=True).execute()
-            
-            for idx, entry in enumerate(response.data, 1):
-                if entry['player_name'] == player_name:
-                    return idx
-            
-            return None
+            return self.cached(('rank', difficulty, player_name),
+                               lambda: self._fetch_player_rank(player_name, difficulty))
         except Exception as e:
             print(f"Error getting player rank: {e}")
             return None
     
+    def get_players_around(self, player_name: str, difficulty: Optional[str] = None,
+                           k: int = 5) -> List[Dict]:
+        """
+        Get the player's best entry with up to k entries above and below it
+        
+        Two limited queries on idx_leaderboard_difficulty_score fetch the
+        neighbours and the rank comes from the cached rank lookup, so the
+        cost does not depend on how deep in the rankings the player is.
+        
+        Args:
+            player_name: Name of the player
+            difficulty: Filter by difficulty level
+            k: Entries to show on each side
+            
+        Returns:
+            Entries best first, each with its board position in 'rank' (ties
+            are ordered like the top_scores_by_difficulty view); empty if the
+            player has no scores
+        """
+        try:
+            return self.cached(('around', difficulty, (player_name, k)),
+                               lambda: self._fetch_players_around(player_name, difficulty, k))
+        except Exception as e:
+            print(f"Error fetching players around {player_name}: {e}")
+            return []
+    
+    def standings(self, player_name: str, difficulty: Optional[str] = None,
+                  limit: int = 10) -> Dict:
+        """
+        Everything the results screen shows, fetched concurrently
+        
+        The three lookups run on their own threads, so the screen waits for
+        the slowest one instead of the sum; the rank's best-score lookup
+        shares the best-score request.
+        
+        Returns:
+            Dict with 'top_scores', 'rank' and 'best_score'
+        """
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix='standings') as pool:
+            top_scores = pool.submit(self.get_top_scores, limit, difficulty)
+            rank = pool.submit(self.get_player_rank, player_name, difficulty)
+            best_score = pool.submit(self.get_player_best_score, player_name, difficulty)
+        return {'top_scores': top_scores.result(), 'rank': rank.result(),
+                'best_score': best_score.result()}
+    
     def get_player_best_score(self, player_name: str, difficulty: Optional[str] = None) -> Optional[int]:
         """
         Get the best score for a specific player
@@ -116,17 +249,147 @@ class Leaderboard:
             Best score or None if not found
         """
         try:
-            query = self.client.table(self.table_name).select('score')
-            query = query.eq('player_name', player_name)
-            
-            if difficulty:
-                query = query.eq('difficulty', difficulty)
-            
-            response = query.order('score', desc=True).limit(1).execute()
-            
-            if response.data:
-                return response.data[0]['score']
-            return None
+            return self.cached(('best', difficulty, player_name),
+                               lambda: self._fetch_player_best_score(player_name, difficulty))
         except Exception as e:
             print(f"Error getting player best score: {e}")
             return None
+    
+    def sync_histogram(self) -> int:
+        """
+        Bring the local score histogram up to date
+        
+        Only rows added since the previous sync are fetched.
+        
+        Returns:
+            Number of new rows (0 on error)
+        """
+        try:
+            return self.histogram.sync(self.storage)
+        except Exception as e:
+            print(f"Error syncing score histogram: {e}")
+            return 0
+    
+    def get_percentile(self, score: int, difficulty: Optional[str] = None) -> Optional[float]:
+        """
+        Percentage of leaderboard scores below score, from the local histogram
+        
+        Args:
+            score: Score to place
+            difficulty: Filter by difficulty level (None for all)
+            
+        Returns:
+            0-100, or None if the histogram is empty
+        """
+        return self.histogram.percentile(score, difficulty)
+    
+    def get_approximate_rank(self, score: int, difficulty: Optional[str] = None) -> int:
+        """
+        Rank score would have, from the local histogram (no network)
+        
+        Exact as of the last sync_histogram().
+        """
+        return self.histogram.count_above(score, difficulty) + 1
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Cache hit/miss counters (hits never leave the machine)"""
+        return self.cache.stats()
+    
+    def clear_cache(self):
+        """Forget all cached query results"""
+        self.cache.clear()
+    
+    def cached(self, key, fetch):
+        """
+        Read-through lookup; errors propagate and are never cached
+        
+        Threads that miss on the same key while a fetch is running wait for
+        its result instead of sending their own request.
+        
+        Args:
+            key: (kind, difficulty, arguments). New scores invalidate every
+                key of their difficulty (or None) except 'best' keys, which
+                are patched in place, so callers caching their own reads
+                follow the same layout
+            fetch: Called on a miss; its result is cached
+        """
+        found, value = self.cache.get(key)
+        if found:
+            return value
+        
+        with self._pending_lock:
+            future = self._pending.get(key)
+            leader = future is None
+            if leader:
+                future = self._pending[key] = Future()
+        if not leader:
+            return future.result()
+        
+        try:
+            value = fetch()
+            self.cache.set(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._pending_lock:
+                del self._pending[key]
+    
+    def _on_score_added(self, player_name: str, score: int, difficulty: str):
+        """Keep cached reads consistent with a newly stored score"""
+        record_new_score(self.cache, player_name, score, difficulty)
+    
+    def _insert_rows(self, rows: List[Dict]):
+        """
+        Insert rows in one request, skipping submission_ids already stored
+        
+        Raises on failure.
+        """
+        self.storage.insert_scores(rows)
+        for row in rows:
+            self._on_score_added(row['player_name'], row['score'], row['difficulty'])
+    
+    def _fetch_top_scores(self, limit: int, difficulty: Optional[str]) -> List[Dict]:
+        return self.storage.top_scores(limit, difficulty)
+    
+    def _fetch_top_scores_by_difficulty(self, limit: int) -> Dict[str, List[Dict]]:
+        boards = {difficulty: [] for difficulty in DIFFICULTIES}
+        for row in self.storage.top_scores_by_difficulty(limit):
+            boards.setdefault(row['difficulty'], []).append(row)
+        return boards
+    
+    def _fetch_player_rank(self, player_name: str, difficulty: Optional[str]) -> Optional[int]:
+        best_score = self.cached(('best', difficulty, player_name),
+                                 lambda: self._fetch_player_best_score(player_name, difficulty))
+        if best_score is None:
+            return None
+        return self.storage.count_above(best_score, difficulty) + 1
+    
+    def _fetch_players_around(self, player_name: str, difficulty: Optional[str],
+                              k: int) -> List[Dict]:
+        best_score = self.cached(('best', difficulty, player_name),
+                                 lambda: self._fetch_player_best_score(player_name, difficulty))
+        if best_score is None:
+            return []
+        rank = self.cached(('rank', difficulty, player_name),
+                           lambda: self._fetch_player_rank(player_name, difficulty))
+        
+        above = self.storage.scores_above(best_score, k, difficulty)[::-1]
+        # Only the best row itself is replaced by the player's entry: their
+        # other games still hold board positions below it
+        below = self.storage.scores_below(best_score, k + 1, difficulty)
+        for i, entry in enumerate(below):
+            if entry['player_name'] == player_name and entry['score'] == best_score:
+                del below[i]
+                break
+        below = below[:k]
+        me = {'player_name': player_name, 'score': best_score, 'difficulty': difficulty}
+        
+        first_rank = rank - len(above)
+        return [dict(entry, rank=first_rank + offset)
+                for offset, entry in enumerate(above + [me] + below)]
+    
+    def _fetch_player_best_score(self, player_name: str, difficulty: Optional[str]) -> Optional[int]:
+        return self.storage.best_score(player_name, difficulty)
@@ -0,0 +1,239 @@
+"""
+LAN aggregation proxy shared by several kiosks, and the storage backend
+kiosks use to reach it
+"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+from .journal import ScoreJournal, ScoreSubmitter
+from .leaderboard import Leaderboard
+from .storage import LeaderboardStorage, validate_score_row
+
+
+class LeaderboardProxy:
+    """
+    One upstream connection for every kiosk on the LAN.
+
+    Reads go through a Leaderboard read cache whose concurrent misses share a
+    single upstream request, so ten kiosks asking for the same top-10 cost one
+    query. Writes are journalled durably and acknowledged at once; a
+    ScoreSubmitter uploads them in batches, lingering briefly so scores from
+    several kiosks go up together. Scores become visible to reads once they
+    reach upstream.
+    """
+
+    def __init__(self, upstream: LeaderboardStorage, journal: Optional[ScoreJournal] = None,
+                 host: str = '127.0.0.1', port: int = 8765, cache_ttl: float = 5.0,
+                 linger: float = 0.2, batch_size: int = 200):
+        """
+        Args:
+            upstream: Storage backend the proxy forwards to (usually Supabase)
+            journal: Write-behind journal (default: data/proxy_journal.db)
+            host: Interface to listen on ('0.0.0.0' for the whole LAN)
+            port: TCP port (0 picks a free one)
+            cache_ttl: Seconds reads are served from the cache
+            linger: Seconds to collect writes before an upstream batch
+            batch_size: Maximum rows per upstream insert
+        """
+        self.upstream = upstream
+        self.leaderboard = Leaderboard(upstream, cache_ttl=cache_ttl, cache_size=1024)
+        self.journal = journal or ScoreJournal('data/proxy_journal.db')
+        self.submitter = ScoreSubmitter(self.leaderboard, self.journal,
+                                        batch_size=batch_size, linger=linger)
+        self.server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread"""
+        self.submitter.start()
+        self._thread = threading.Thread(target=self.server.serve_forever,
+                                        name='leaderboard-proxy', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted"""
+        self.submitter.start()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop accepting requests and give queued writes up to timeout seconds"""
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+        self.submitter.stop(timeout)
+
+    # Request handling; every method returns a JSON-serializable value and
+    # lets upstream errors propagate (the handler answers 502)
+
+    def submit(self, rows: List[Dict]) -> Dict:
+        errors = [error for error in map(validate_score_row, rows) if error]
+        if errors:
+            raise ValueError(errors[0])
+        for row in rows:
+            self.submitter.submit(row['player_name'], row['score'], row['difficulty'],
+                                  row.get('submission_id'), row.get('created_at'),
+                                  row.get('replay'))
+        return {'accepted': len(rows)}
+
+    def top_scores(self, limit: int, difficulty: Optional[str]) -> List[Dict]:
+        return self.leaderboard.cached(('top', difficulty, limit),
+                                       lambda: self.upstream.top_scores(limit, difficulty))
+
+    def top_scores_by_difficulty(self, limit: int) -> List[Dict]:
+        return self.leaderboard.cached(('boards', None, limit),
+                                       lambda: self.upstream.top_scores_by_difficulty(limit))
+
+    def best_score(self, player_name: str, difficulty: Optional[str]) -> Optional[int]:
+        return self.leaderboard.cached(('best', difficulty, player_name),
+                                       lambda: self.upstream.best_score(player_name, difficulty))
+
+    def neighbours(self, direction: str, score: int, limit: int,
+                   difficulty: Optional[str]) -> List[Dict]:
+        if direction == 'above':
+            fetch = lambda: self.upstream.scores_above(score, limit, difficulty)
+        else:
+            fetch = lambda: self.upstream.scores_below(score, limit, difficulty)
+        return self.leaderboard.cached((direction, difficulty, (score, limit)), fetch)
+
+    def count(self, difficulty: Optional[str], above: Optional[int]) -> int:
+        if above is None:
+            fetch = lambda: self.upstream.count_scores(difficulty)
+        else:
+            fetch = lambda: self.upstream.count_above(above, difficulty)
+        return self.leaderboard.cached(('count', difficulty, above), fetch)
+
+    def page(self, after: Optional[Tuple], order: str, limit: int,
+             difficulty: Optional[str]) -> List[Dict]:
+        # Scans are rare (exports, histogram syncs) and not worth caching
+        return self.upstream.scores_after(after, order, limit, difficulty)
+
+    def health(self) -> Dict:
+        return {'pending': self.submitter.pending(), 'cache': self.leaderboard.cache_stats()}
+
+
+def _make_handler(proxy: LeaderboardProxy):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive for kiosk connection pools
+
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status: int, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _dispatch(self, route):
+            try:
+                self._reply(200, route())
+            except (KeyError, ValueError) as e:
+                self._reply(400, {'error': str(e)})
+            except Exception as e:
+                self._reply(502, {'error': f"upstream: {e}"})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            difficulty = query.get('difficulty')
+            routes = {
+                '/scores/top': lambda: proxy.top_scores(int(query.get('limit', 10)), difficulty),
+                '/scores/boards': lambda: proxy.top_scores_by_difficulty(int(query.get('limit', 10))),
+                '/scores/best': lambda: proxy.best_score(query['player_name'], difficulty),
+                '/scores/above': lambda: proxy.neighbours(
+                    'above', int(query['score']), int(query.get('limit', 5)), difficulty),
+                '/scores/below': lambda: proxy.neighbours(
+                    'below', int(query['score']), int(query.get('limit', 5)), difficulty),
+                '/scores/count': lambda: proxy.count(
+                    difficulty, int(query['above']) if 'above' in query else None),
+                '/scores/page': lambda: proxy.page(
+                    tuple(json.loads(query['after'])) if 'after' in query else None,
+                    query.get('order', 'score'), int(query.get('limit', 1000)), difficulty),
+                '/health': proxy.health,
+            }
+            if url.path not in routes:
+                return self._reply(404, {'error': f"unknown path {url.path}"})
+            self._dispatch(routes[url.path])
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/scores':
+                return self._reply(404, {'error': f"unknown path {self.path}"})
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            self._dispatch(lambda: proxy.submit(json.loads(body)))
+
+    return Handler
+
+
+class ProxyStorage(LeaderboardStorage):
+    """Leaderboard rows behind a LeaderboardProxy on the LAN"""
+
+    def __init__(self, url: Optional[str] = None, timeout: float = 2.0):
+        """
+        Args:
+            url: Proxy address (default: LEADERBOARD_PROXY_URL)
+            timeout: Seconds per request
+        """
+        url = url or os.getenv('LEADERBOARD_PROXY_URL')
+        if not url:
+            raise ValueError("Leaderboard proxy not configured. "
+                             "Please set the LEADERBOARD_PROXY_URL environment variable.")
+        self.url = url
+        self.client = httpx.Client(base_url=url, timeout=timeout)
+
+    def _get(self, path: str, **params):
+        params = {k: v for k, v in params.items() if v is not None}
+        response = self.client.get(path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def insert_scores(self, rows: List[Dict]):
+        self.client.post('/scores', json=rows).raise_for_status()
+
+    def top_scores(self, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        return self._get('/scores/top', limit=limit, difficulty=difficulty)
+
+    def top_scores_by_difficulty(self, limit: int) -> List[Dict]:
+        return self._get('/scores/boards', limit=limit)
+
+    def best_score(self, player_name: str, difficulty: Optional[str] = None) -> Optional[int]:
+        return self._get('/scores/best', player_name=player_name, difficulty=difficulty)
+
+    def scores_above(self, score: int, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        return self._get('/scores/above', score=score, limit=limit, difficulty=difficulty)
+
+    def scores_below(self, score: int, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        return self._get('/scores/below', score=score, limit=limit, difficulty=difficulty)
+
+    def count_above(self, score: int, difficulty: Optional[str] = None) -> int:
+        return self._get('/scores/count', above=score, difficulty=difficulty)
+
+    def count_scores(self, difficulty: Optional[str] = None) -> int:
+        return self._get('/scores/count', difficulty=difficulty)
+
+    def scores_after(self, key: Optional[Tuple], order: str = 'score', limit: int = 1000,
+                     difficulty: Optional[str] = None) -> List[Dict]:
+        return self._get('/scores/page', order=order, limit=limit, difficulty=difficulty,
+                         after=json.dumps(list(key)) if key is not None else None)
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,372 @@
+"""
+Local SQLite leaderboard storage for LAN-only venues and offline tests
+"""
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .storage import SCAN_ORDERS, AdminStorage, LeaderboardStorage
+
+# Gameplay traces of submitted scores and the verifier's verdicts
+REPLAYS_TABLE = """
+CREATE TABLE IF NOT EXISTS score_replays (
+  submission_id TEXT PRIMARY KEY,
+  replay TEXT,
+  verdict TEXT CHECK (verdict IN ('ok', 'mismatch', 'invalid')),
+  replayed_score INTEGER,
+  reason TEXT,
+  verified_at TEXT,
+  CHECK (replay IS NOT NULL OR verdict IS NOT NULL)
+)
+"""
+
+REPLAYS_PENDING_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_score_replays_pending
+ON score_replays(submission_id) WHERE verdict IS NULL
+"""
+
+# Mirrors docs/supabase_schema.sql
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaderboard (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  player_name TEXT NOT NULL,
+  score INTEGER NOT NULL CHECK (score >= 0),
+  difficulty TEXT NOT NULL CHECK (difficulty IN ('easy', 'medium', 'hard')),
+  created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+  submission_id TEXT UNIQUE
+);
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_score
+ON leaderboard(score DESC);
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_difficulty
+ON leaderboard(difficulty);
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_player
+ON leaderboard(player_name);
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_created
+ON leaderboard(created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_difficulty_score
+ON leaderboard(difficulty, score DESC);
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_score_id
+ON leaderboard(score, id);
+
+CREATE VIEW IF NOT EXISTS top_scores_by_difficulty AS
+SELECT
+  difficulty,
+  player_name,
+  score,
+  created_at,
+  ROW_NUMBER() OVER (PARTITION BY difficulty ORDER BY score DESC) as rank
+FROM leaderboard
+ORDER BY difficulty, score DESC;
+
+""" + REPLAYS_TABLE + ";" + REPLAYS_PENDING_INDEX + """;
+
+-- Games archived by compact(): per-day aggregates and score histograms
+CREATE TABLE IF NOT EXISTS leaderboard_daily (
+  day TEXT NOT NULL,
+  difficulty TEXT NOT NULL,
+  games INTEGER NOT NULL,
+  total_score INTEGER NOT NULL,
+  max_score INTEGER NOT NULL,
+  min_score INTEGER NOT NULL,
+  PRIMARY KEY (day, difficulty)
+);
+
+CREATE TABLE IF NOT EXISTS leaderboard_daily_scores (
+  day TEXT NOT NULL,
+  difficulty TEXT NOT NULL,
+  score INTEGER NOT NULL,
+  games INTEGER NOT NULL,
+  PRIMARY KEY (day, difficulty, score)
+);
+
+-- Every game ever played: retained rows plus the archived aggregates
+DROP VIEW IF EXISTS leaderboard_stats;
+CREATE VIEW leaderboard_stats AS
+SELECT
+  difficulty,
+  SUM(games) as total_games,
+  MAX(max_score) as highest_score,
+  SUM(total_score) * 1.0 / SUM(games) as average_score,
+  MIN(min_score) as lowest_score
+FROM (
+  SELECT difficulty, COUNT(*) AS games, SUM(score) AS total_score,
+         MAX(score) AS max_score, MIN(score) AS min_score
+  FROM leaderboard GROUP BY difficulty
+  UNION ALL
+  SELECT difficulty, games, total_score, max_score, min_score FROM leaderboard_daily
+)
+GROUP BY difficulty;
+"""
+
+# Mirrors compact_leaderboard() in docs/retention.sql: pick the old games that
+# are neither in a difficulty's top N nor a player's best, then fold them into
+# the daily tables and delete them
+COMPACT_SELECT = """
+    CREATE TEMP TABLE doomed AS
+    SELECT * FROM leaderboard
+    WHERE created_at < strftime('%Y-%m-%dT%H:%M:%f', 'now', :age)
+      AND id NOT IN (
+        SELECT id FROM (
+          SELECT id, ROW_NUMBER() OVER (PARTITION BY difficulty ORDER BY score DESC, id) AS rn
+          FROM leaderboard) WHERE rn <= :keep_top)
+      AND id NOT IN (
+        SELECT id FROM (
+          SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY player_name, difficulty ORDER BY score DESC, id) AS rn
+          FROM leaderboard) WHERE rn = 1)
+"""
+
+COMPACT_SQL = (
+    """
+    INSERT INTO leaderboard_daily (day, difficulty, games, total_score, max_score, min_score)
+    SELECT substr(created_at, 1, 10), difficulty, COUNT(*), SUM(score), MAX(score), MIN(score)
+    FROM doomed WHERE true GROUP BY 1, 2
+    ON CONFLICT (day, difficulty) DO UPDATE SET
+      games = games + excluded.games,
+      total_score = total_score + excluded.total_score,
+      max_score = MAX(max_score, excluded.max_score),
+      min_score = MIN(min_score, excluded.min_score)
+    """,
+    """
+    INSERT INTO leaderboard_daily_scores (day, difficulty, score, games)
+    SELECT substr(created_at, 1, 10), difficulty, score, COUNT(*)
+    FROM doomed WHERE true GROUP BY 1, 2, 3
+    ON CONFLICT (day, difficulty, score) DO UPDATE SET games = games + excluded.games
+    """,
+    "DELETE FROM score_replays WHERE submission_id IN (SELECT submission_id FROM doomed)",
+    "DELETE FROM leaderboard WHERE id IN (SELECT id FROM doomed)",
+)
+
+# Mirrors docs/personal_bests.sql: one row per (player, difficulty), kept
+# current by a trigger in the same transaction as the game insert
+PERSONAL_BESTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS personal_bests (
+  player_name TEXT NOT NULL,
+  difficulty TEXT NOT NULL CHECK (difficulty IN ('easy', 'medium', 'hard')),
+  score INTEGER NOT NULL CHECK (score >= 0),
+  created_at TEXT,
+  PRIMARY KEY (player_name, difficulty)
+);
+
+CREATE INDEX IF NOT EXISTS idx_personal_bests_difficulty_score
+ON personal_bests(difficulty, score DESC);
+
+CREATE TRIGGER IF NOT EXISTS leaderboard_personal_best
+AFTER INSERT ON leaderboard
+BEGIN
+  INSERT INTO personal_bests (player_name, difficulty, score, created_at)
+  VALUES (NEW.player_name, NEW.difficulty, NEW.score, NEW.created_at)
+  ON CONFLICT (player_name, difficulty) DO UPDATE SET
+    score = MAX(personal_bests.score, excluded.score),
+    created_at = CASE WHEN excluded.score > personal_bests.score
+                      THEN excluded.created_at ELSE personal_bests.created_at END;
+END;
+"""
+
+PERSONAL_BESTS_BACKFILL = """
+INSERT INTO personal_bests (player_name, difficulty, score, created_at)
+-- SQLite takes the bare created_at from the row holding MAX(score)
+SELECT player_name, difficulty, MAX(score), created_at
+FROM leaderboard
+WHERE true
+GROUP BY player_name, difficulty
+ON CONFLICT (player_name, difficulty) DO UPDATE SET
+  score = MAX(personal_bests.score, excluded.score),
+  created_at = CASE WHEN excluded.score > personal_bests.score
+                    THEN excluded.created_at ELSE personal_bests.created_at END;
+"""
+
+
+class SQLiteStorage(LeaderboardStorage, AdminStorage):
+    """Leaderboard rows in a local SQLite database"""
+
+    def __init__(self, path: str = 'data/leaderboard.db', personal_bests: bool = False):
+        """
+        Args:
+            path: Database file (':memory:' for a throwaway database)
+            personal_bests: Answer best-score, rank and rank-window queries
+                from the personal_bests table (one row per player and
+                difficulty); it is created and backfilled on first use
+        """
+        self.path = path
+        self.personal_bests = personal_bests
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._migrate_score_replays()
+
+        # Per-player queries read the board table; ties are broken by a unique column
+        self._board, self._tiebreak = 'leaderboard', 'id'
+        if personal_bests:
+            exists = self._query(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'personal_bests'")
+            self.migrate_personal_bests(backfill=not exists)
+            self._board, self._tiebreak = 'personal_bests', 'player_name'
+
+    def _migrate_score_replays(self):
+        """Let databases from before traceless games were judged store their verdicts"""
+        columns = {row['name']: row for row in self._query('PRAGMA table_info(score_replays)')}
+        if not columns['replay']['notnull']:
+            return
+        with self._lock, self._conn:
+            self._conn.execute('ALTER TABLE score_replays RENAME TO score_replays_old')
+            self._conn.execute(REPLAYS_TABLE)
+            self._conn.execute('INSERT INTO score_replays SELECT * FROM score_replays_old')
+            # The pending index goes with the old table
+            self._conn.execute('DROP TABLE score_replays_old')
+            self._conn.execute(REPLAYS_PENDING_INDEX)
+
+    def migrate_personal_bests(self, backfill: bool = True):
+        """Create the personal_bests table and trigger, then fold in existing games"""
+        with self._lock, self._conn:
+            self._conn.executescript(PERSONAL_BESTS_SCHEMA)
+            if backfill:
+                self._conn.execute(PERSONAL_BESTS_BACKFILL)
+
+    def count_personal_bests(self, difficulty: Optional[str] = None) -> int:
+        """Number of personal_bests rows (player/difficulty pairs)"""
+        where, params = self._where(difficulty)
+        return self._query(f'SELECT COUNT(*) FROM personal_bests{where}', params)[0][0]
+
+    def _query(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _where(self, difficulty: Optional[str], *conditions):
+        """Build a WHERE clause from optional difficulty plus extra conditions"""
+        clauses = list(conditions)
+        params = []
+        if difficulty:
+            clauses.insert(0, 'difficulty = ?')
+            params.append(difficulty)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def insert_scores(self, rows: List[Dict]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO leaderboard '
+                '(player_name, score, difficulty, created_at, submission_id) '
+                "VALUES (:player_name, :score, :difficulty, "
+                "COALESCE(:created_at, strftime('%Y-%m-%dT%H:%M:%f', 'now')), :submission_id) "
+                # Only duplicate submissions are skipped; CHECK violations still raise
+                'ON CONFLICT(submission_id) DO NOTHING',
+                [{'created_at': None, 'submission_id': None, **row} for row in rows]
+            )
+            # Same transaction: a game and its replay are stored together
+            self._conn.executemany(
+                'INSERT INTO score_replays (submission_id, replay) VALUES (?, ?) '
+                'ON CONFLICT(submission_id) DO NOTHING',
+                [(row['submission_id'], row['replay']) for row in rows
+                 if row.get('replay') and row.get('submission_id')]
+            )
+
+    def top_scores(self, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        where, params = self._where(difficulty)
+        rows = self._query(
+            f'SELECT * FROM leaderboard{where} ORDER BY score DESC LIMIT ?',
+            params + [limit]
+        )
+        return [dict(row) for row in rows]
+
+    def top_scores_by_difficulty(self, limit: int) -> List[Dict]:
+        rows = self._query(
+            'SELECT * FROM top_scores_by_difficulty WHERE rank <= ? ORDER BY difficulty, rank',
+            (limit,)
+        )
+        return [dict(row) for row in rows]
+
+    def best_score(self, player_name: str, difficulty: Optional[str] = None) -> Optional[int]:
+        where, params = self._where(difficulty, 'player_name = ?')
+        row = self._query(f'SELECT MAX(score) FROM {self._board}{where}', params + [player_name])
+        return row[0][0]
+
+    def count_above(self, score: int, difficulty: Optional[str] = None) -> int:
+        where, params = self._where(difficulty, 'score > ?')
+        return self._query(f'SELECT COUNT(*) FROM {self._board}{where}', params + [score])[0][0]
+
+    def scores_above(self, score: int, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        where, params = self._where(difficulty, 'score > ?')
+        rows = self._query(
+            f'SELECT * FROM {self._board}{where} ORDER BY score, {self._tiebreak} DESC LIMIT ?',
+            params + [score, limit]
+        )
+        return [dict(row) for row in rows]
+
+    def scores_below(self, score: int, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        where, params = self._where(difficulty, 'score <= ?')
+        rows = self._query(
+            f'SELECT * FROM {self._board}{where} ORDER BY score DESC, {self._tiebreak} LIMIT ?',
+            params + [score, limit]
+        )
+        return [dict(row) for row in rows]
+
+    def count_scores(self, difficulty: Optional[str] = None) -> int:
+        where, params = self._where(difficulty)
+        return self._query(f'SELECT COUNT(*) FROM leaderboard{where}', params)[0][0]
+
+    def scores_after(self, key: Optional[Tuple], order: str = 'score', limit: int = 1000,
+                     difficulty: Optional[str] = None) -> List[Dict]:
+        if order not in SCAN_ORDERS:
+            raise ValueError(f"order must be one of {', '.join(SCAN_ORDERS)}")
+        conditions, params = [], []
+        if key is not None:
+            conditions.append(f'({order}, id) > (?, ?)')
+            params.extend(key)
+        where, filter_params = self._where(difficulty, *conditions)
+        rows = self._query(
+            f'SELECT * FROM leaderboard{where} ORDER BY {order}, id LIMIT ?',
+            filter_params + params + [limit]
+        )
+        return [dict(row) for row in rows]
+
+    def compact(self, retain_days: int = 90, keep_top: int = 100) -> int:
+        with self._lock, self._conn:
+            self._conn.execute('DROP TABLE IF EXISTS temp.doomed')
+            self._conn.execute(COMPACT_SELECT, {'age': f'-{int(retain_days)} days',
+                                                'keep_top': keep_top})
+            for statement in COMPACT_SQL:
+                cursor = self._conn.execute(statement)
+            archived = cursor.rowcount
+            self._conn.execute('DROP TABLE temp.doomed')
+        return archived
+
+    def pending_replays(self, limit: int = 500, after: Optional[str] = None) -> List[Dict]:
+        rows = self._query(
+            # Games without an uploaded trace come back with replay None
+            'SELECT l.submission_id, r.replay, l.player_name, l.score, l.difficulty '
+            'FROM leaderboard l LEFT JOIN score_replays r USING (submission_id) '
+            'WHERE r.verdict IS NULL AND l.submission_id > ? '
+            'ORDER BY l.submission_id LIMIT ?',
+            (after or '', limit)
+        )
+        return [dict(row) for row in rows]
+
+    def set_verdicts(self, results: List[Dict]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO score_replays '
+                '(submission_id, verdict, replayed_score, reason, verified_at) '
+                'VALUES (:submission_id, :verdict, :replayed, :reason, '
+                "strftime('%Y-%m-%dT%H:%M:%f', 'now')) "
+                'ON CONFLICT(submission_id) DO UPDATE SET verdict = excluded.verdict, '
+                'replayed_score = excluded.replayed_score, reason = excluded.reason, '
+                'verified_at = excluded.verified_at',
+                [{'replayed': None, 'reason': None, **result} for result in results]
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
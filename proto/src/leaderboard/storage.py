@@ -0,0 +1,192 @@
+"""
+Leaderboard storage backend interface
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+# Columns rows can be streamed in, each paired with id as a unique tie-breaker
+SCAN_ORDERS = ('score', 'created_at', 'id')
+
+
+def validate_score_row(row: Dict) -> Optional[str]:
+    """Check a row against the table constraints; returns an error or None"""
+    if not isinstance(row.get('player_name'), str) or not row['player_name']:
+        return "player_name must be a non-empty string"
+    score = row.get('score')
+    if not isinstance(score, int) or isinstance(score, bool) or score < 0:
+        return "score must be a non-negative integer"
+    if row.get('difficulty') not in DIFFICULTIES:
+        return f"difficulty must be one of {', '.join(DIFFICULTIES)}"
+    if row.get('replay') is not None and not isinstance(row['replay'], str):
+        return "replay must be an encoded string"
+    return None
+
+
+class LeaderboardStorage(ABC):
+    """
+    Where leaderboard rows live.
+
+    Backends raise on failure; Leaderboard turns errors into the
+    False/None/[] results its callers expect and caches successful reads.
+    Rows are dicts with the columns of docs/supabase_schema.sql.
+    """
+
+    @abstractmethod
+    def insert_scores(self, rows: List[Dict]):
+        """
+        Insert rows; rows whose submission_id already exists are skipped
+
+        A row's optional 'replay' (src/core/replay.py) is stored in the
+        score_replays table, keyed by submission_id, so board reads never
+        carry it.
+        """
+
+    @abstractmethod
+    def top_scores(self, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        """Highest scores first"""
+
+    # Backends built with personal_bests=True answer best_score, count_above,
+    # scores_above and scores_below from the personal_bests table, one row
+    # per (player, difficulty), so ranks count players rather than games
+
+    @abstractmethod
+    def best_score(self, player_name: str, difficulty: Optional[str] = None) -> Optional[int]:
+        """Player's highest score, or None if the player has no scores"""
+
+    @abstractmethod
+    def count_above(self, score: int, difficulty: Optional[str] = None) -> int:
+        """Number of scores strictly greater than score"""
+
+    def top_scores_by_difficulty(self, limit: int) -> List[Dict]:
+        """
+        Top limit rows of every difficulty, ordered by difficulty then rank
+
+        Rows carry a 1-based 'rank'. Backends answer from the
+        top_scores_by_difficulty view in one query; this fallback runs one
+        query per difficulty.
+        """
+        return [dict(row, rank=rank)
+                for difficulty in DIFFICULTIES
+                for rank, row in enumerate(self.top_scores(limit, difficulty), 1)]
+
+    @abstractmethod
+    def scores_above(self, score: int, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        """The limit rows with the lowest scores strictly above score, closest first"""
+
+    @abstractmethod
+    def scores_below(self, score: int, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        """The limit rows with the highest scores at or below score, closest first"""
+
+    @abstractmethod
+    def count_scores(self, difficulty: Optional[str] = None) -> int:
+        """Number of rows, counted by the backend without transferring them"""
+
+    @abstractmethod
+    def scores_after(self, key: Optional[Tuple], order: str = 'score', limit: int = 1000,
+                     difficulty: Optional[str] = None) -> List[Dict]:
+        """
+        One keyset page: up to limit rows ordered by (order, id) ascending
+
+        Args:
+            key: (order value, id) of the last row of the previous page, or
+                None for the first page
+            order: One of SCAN_ORDERS
+        """
+
+    def iter_scores(self, order: str = 'score', page_size: int = 1000,
+                    difficulty: Optional[str] = None, after: Optional[Tuple] = None) -> Iterator[Dict]:
+        """
+        Stream every row with keyset pagination
+
+        Each page seeks past the previous one on (order, id), so pages cost
+        the same however deep the scan is and memory is bounded by page_size.
+        Pass after=(order value, id) to resume behind a row seen earlier.
+        """
+        if order not in SCAN_ORDERS:
+            raise ValueError(f"order must be one of {', '.join(SCAN_ORDERS)}")
+        key = after
+        while True:
+            rows = self.scores_after(key, order, page_size, difficulty)
+            yield from rows
+            if len(rows) < page_size:
+                return
+            key = (rows[-1][order], rows[-1]['id'])
+
+    def close(self):
+        """Release connections"""
+
+
+class AdminStorage(ABC):
+    """
+    Maintenance jobs that run against the database itself.
+
+    Implemented by the database backends (SupabaseStorage, SQLiteStorage)
+    alongside LeaderboardStorage; a kiosk's ProxyStorage only serves the
+    game and does not offer them.
+    """
+
+    @abstractmethod
+    def compact(self, retain_days: int = 90, keep_top: int = 100) -> int:
+        """
+        Archive old games into per-day aggregates and score histograms
+
+        Games older than retain_days are folded into leaderboard_daily and
+        leaderboard_daily_scores and deleted, except each difficulty's top
+        keep_top games and every player's best game. leaderboard_stats keeps
+        counting archived games.
+
+        Returns:
+            Number of games archived
+        """
+
+    @abstractmethod
+    def pending_replays(self, limit: int = 500, after: Optional[str] = None) -> List[Dict]:
+        """
+        Games without a verdict, ordered by submission_id
+
+        Games submitted without a replay are included (replay None) so the
+        verifier judges them too.
+
+        Args:
+            after: submission_id of the last row of the previous page
+
+        Returns:
+            Dicts with submission_id, replay, and the game's player_name,
+            score and difficulty
+        """
+
+    @abstractmethod
+    def set_verdicts(self, results: List[Dict]):
+        """
+        Store verify_replay() results ({'submission_id', 'verdict', 'replayed',
+        'reason'}) in one round trip
+        """
+
+
+def create_storage(backend: Optional[str] = None) -> LeaderboardStorage:
+    """
+    Create the storage backend selected by LEADERBOARD_BACKEND
+
+    Args:
+        backend: 'supabase' (default), 'sqlite' or 'proxy' (a LeaderboardProxy
+            at LEADERBOARD_PROXY_URL); overrides the environment
+    """
+    backend = backend or os.getenv('LEADERBOARD_BACKEND', 'supabase')
+    personal_bests = os.getenv('LEADERBOARD_PERSONAL_BESTS', '').lower() in ('1', 'true', 'yes')
+
+    if backend == 'supabase':
+        from .supabase_storage import SupabaseStorage
+        return SupabaseStorage(personal_bests=personal_bests)
+    if backend == 'sqlite':
+        from .sqlite_storage import SQLiteStorage
+        return SQLiteStorage(os.getenv('LEADERBOARD_DB_PATH', 'data/leaderboard.db'),
+                             personal_bests=personal_bests)
+    if backend == 'proxy':
+        from .proxy import ProxyStorage
+        return ProxyStorage()
+
+    raise ValueError(f"Unknown leaderboard backend '{backend}' "
+                     "(expected 'supabase', 'sqlite' or 'proxy')")
@@ -0,0 +1,195 @@
+"""
+Supabase (PostgREST) leaderboard storage
+"""
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .storage import SCAN_ORDERS, AdminStorage, LeaderboardStorage
+
+# PostgREST (schema cache) and Postgres error codes for a table that does not exist
+MISSING_TABLE_CODES = ('PGRST205', '42P01')
+
+
+def _missing_table(error) -> bool:
+    return getattr(error, 'code', None) in MISSING_TABLE_CODES
+
+
+class SupabaseStorage(LeaderboardStorage, AdminStorage):
+    """Leaderboard rows in a Supabase table"""
+
+    def __init__(self, client=None, table_name: str = 'leaderboard', personal_bests: bool = False,
+                 store_replays: bool = True):
+        """
+        Args:
+            client: Existing Supabase (or PostgREST-compatible) client; by
+                default one is created from SUPABASE_URL / SUPABASE_KEY
+            table_name: Leaderboard table
+            personal_bests: Answer best-score, rank and rank-window queries
+                from the personal_bests table (docs/personal_bests.sql)
+            store_replays: Upload replays to score_replays
+                (docs/replay_verification.sql, optional); turned off by
+                itself when the table does not exist
+        """
+        if client is None:
+            supabase_url = os.getenv('SUPABASE_URL')
+            supabase_key = os.getenv('SUPABASE_KEY')
+
+            if not supabase_url or not supabase_key:
+                raise ValueError(
+                    "Supabase credentials not found. "
+                    "Please set SUPABASE_URL and SUPABASE_KEY environment variables."
+                )
+
+            from supabase import create_client
+            client = create_client(supabase_url, supabase_key)
+
+        self.client = client
+        self.table_name = table_name
+        self.personal_bests = personal_bests
+        self.store_replays = store_replays
+
+        # Per-player queries read the board table; ties are broken by a unique column
+        self._board, self._tiebreak = table_name, 'id'
+        if personal_bests:
+            self._board, self._tiebreak = 'personal_bests', 'player_name'
+
+    def _check(self, response):
+        if hasattr(response, 'error') and response.error:
+            raise RuntimeError(response.error)
+        return response
+
+    def insert_scores(self, rows: List[Dict]):
+        replays = [{'submission_id': row['submission_id'], 'replay': row['replay']}
+                   for row in rows if row.get('replay') and row.get('submission_id')]
+        rows = [{k: v for k, v in row.items() if k != 'replay'} for row in rows]
+        self._check(self.client.table(self.table_name).upsert(
+            rows, on_conflict='submission_id', ignore_duplicates=True
+        ).execute())
+        # After the games, so every replay has its row (score_replays has a
+        # foreign key). The scores are stored by now: a failed upload only
+        # leaves them unverified, so it is logged rather than raised (raising
+        # would have the journal retry rows that are already on the board).
+        # returning='minimal': the anon key may insert replays but not read them
+        if replays and self.store_replays:
+            try:
+                self._check(self.client.table('score_replays').upsert(
+                    replays, on_conflict='submission_id', ignore_duplicates=True,
+                    returning='minimal'
+                ).execute())
+            except Exception as e:
+                if not _missing_table(e):
+                    print(f"Error uploading replays: {e}")
+                    return
+                self.store_replays = False
+                print("Replay upload disabled: no score_replays table "
+                      "(apply docs/replay_verification.sql to verify scores)")
+
+    def top_scores(self, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        query = self.client.table(self.table_name).select('*')
+
+        if difficulty:
+            query = query.eq('difficulty', difficulty)
+
+        return self._check(query.order('score', desc=True).limit(limit).execute()).data
+
+    def top_scores_by_difficulty(self, limit: int) -> List[Dict]:
+        # One request: the view ranks each difficulty with ROW_NUMBER() and the
+        # rank filter keeps only the top rows of every partition
+        query = self.client.table('top_scores_by_difficulty').select('*').lte('rank', limit)
+        return self._check(query.order('difficulty').order('rank').execute()).data
+
+    def best_score(self, player_name: str, difficulty: Optional[str] = None) -> Optional[int]:
+        query = self.client.table(self._board).select('score')
+        query = query.eq('player_name', player_name)
+
+        if difficulty:
+            query = query.eq('difficulty', difficulty)
+
+        response = self._check(query.order('score', desc=True).limit(1).execute())
+
+        if response.data:
+            return response.data[0]['score']
+        return None
+
+    def count_above(self, score: int, difficulty: Optional[str] = None) -> int:
+        # HEAD request with count=exact: served from the (difficulty, score DESC) index
+        query = self.client.table(self._board).select('score', count='exact', head=True)
+
+        if difficulty:
+            query = query.eq('difficulty', difficulty)
+
+        return self._check(query.gt('score', score).execute()).count or 0
+
+    def scores_above(self, score: int, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        query = self.client.table(self._board).select('*')
+
+        if difficulty:
+            query = query.eq('difficulty', difficulty)
+
+        query = query.gt('score', score).order('score').order(self._tiebreak, desc=True).limit(limit)
+        return self._check(query.execute()).data
+
+    def scores_below(self, score: int, limit: int, difficulty: Optional[str] = None) -> List[Dict]:
+        query = self.client.table(self._board).select('*')
+
+        if difficulty:
+            query = query.eq('difficulty', difficulty)
+
+        query = query.lte('score', score).order('score', desc=True).order(self._tiebreak).limit(limit)
+        return self._check(query.execute()).data
+
+    def count_scores(self, difficulty: Optional[str] = None) -> int:
+        query = self.client.table(self.table_name).select('id', count='exact', head=True)
+
+        if difficulty:
+            query = query.eq('difficulty', difficulty)
+
+        return self._check(query.execute()).count or 0
+
+    def scores_after(self, key: Optional[Tuple], order: str = 'score', limit: int = 1000,
+                     difficulty: Optional[str] = None) -> List[Dict]:
+        if order not in SCAN_ORDERS:
+            raise ValueError(f"order must be one of {', '.join(SCAN_ORDERS)}")
+        query = self.client.table(self.table_name).select('*')
+
+        if difficulty:
+            query = query.eq('difficulty', difficulty)
+
+        if key is not None:
+            # Row comparison (order, id) > (value, id); values are quoted
+            # because timestamps contain PostgREST's reserved '.' and ':'
+            value, row_id = key
+            query = query.or_(f'{order}.gt."{value}",and({order}.eq."{value}",id.gt.{row_id})')
+
+        return self._check(query.order(order).order('id').limit(limit).execute()).data
+
+    def compact(self, retain_days: int = 90, keep_top: int = 100) -> int:
+        # compact_leaderboard() from docs/retention.sql runs in one transaction
+        # server-side; it needs the service role key
+        response = self._check(self.client.rpc(
+            'compact_leaderboard', {'retain_days': retain_days, 'keep_top': keep_top}
+        ).execute())
+        return response.data or 0
+
+    def pending_replays(self, limit: int = 500, after: Optional[str] = None) -> List[Dict]:
+        # replay_queue (docs/replay_verification.sql) lists every game without a
+        # verdict, with replay None when the kiosk uploaded no trace
+        query = (self.client.table('replay_queue')
+                 .select('submission_id,player_name,score,difficulty,replay'))
+        if after is not None:
+            query = query.gt('submission_id', after)
+        return self._check(query.order('submission_id').limit(limit).execute()).data
+
+    def set_verdicts(self, results: List[Dict]):
+        # One request for the whole batch: set_replay_verdicts() from
+        # docs/replay_verification.sql upserts every row in one statement,
+        # adding rows for games submitted without a trace. Needs the service
+        # role key.
+        if not results:
+            return
+        self._check(self.client.rpc('set_replay_verdicts', {'verdicts': [{
+            'submission_id': result['submission_id'],
+            'verdict': result['verdict'],
+            'replayed_score': result.get('replayed'),
+            'reason': result.get('reason'),
+        } for result in results]}).execute())
@@ -0,0 +1,124 @@
+"""
+Streaming leaderboard export and import (CSV or JSON Lines)
+"""
+import csv
+import json
+import uuid
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, TextIO
+
+FIELDS = ('id', 'player_name', 'score', 'difficulty', 'created_at', 'submission_id')
+FORMATS = ('csv', 'jsonl')
+
+# Rows exported before submission_id existed get a stable id derived from
+# their content, so importing the same file twice does not duplicate them
+_LEGACY_NAMESPACE = uuid.UUID('6f1c7d3e-4b59-4f0a-9a61-2d8e5c0b7a14')
+
+
+def format_for(path: str) -> str:
+    """Pick the file format from the extension (JSON Lines unless .csv)"""
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+def export_scores(storage, out: TextIO, fmt: str = 'jsonl', order: str = 'score',
+                  page_size: int = 1000, difficulty: Optional[str] = None) -> int:
+    """
+    Write every row of storage to out, one page at a time
+
+    Args:
+        storage: LeaderboardStorage to read
+        out: Text stream to write to
+        fmt: 'csv' or 'jsonl'
+        order: Keyset column, 'score' or 'created_at'
+        page_size: Rows fetched per request
+        difficulty: Only export this difficulty
+
+    Returns:
+        Number of rows written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {', '.join(FORMATS)}")
+
+    if fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        write = writer.writerow
+    else:
+        def write(row):
+            out.write(json.dumps({field: row.get(field) for field in FIELDS}) + '\n')
+
+    written = 0
+    for row in storage.iter_scores(order, page_size, difficulty):
+        write(row)
+        written += 1
+    return written
+
+
+def read_scores(source: TextIO, fmt: str = 'jsonl') -> Iterator[Dict]:
+    """
+    Lazily parse an export back into score entries
+
+    A row that cannot be parsed yields {'error': message} instead, so one
+    bad line does not abort the import; import_scores() rejects it.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {', '.join(FORMATS)}")
+
+    if fmt == 'csv':
+        rows = csv.DictReader(source)
+    else:
+        rows = (line for line in source if line.strip())
+
+    for number, row in enumerate(rows, 1):
+        try:
+            if fmt == 'jsonl':
+                row = json.loads(row)
+            entry = {
+                'player_name': row.get('player_name'),
+                'score': int(row['score']) if row.get('score') not in (None, '') else None,
+                'difficulty': row.get('difficulty'),
+                'created_at': row.get('created_at') or None,
+                'submission_id': row.get('submission_id') or None,
+            }
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            yield {'error': f"row {number}: cannot parse ({type(e).__name__}: {e})"}
+            continue
+        if entry['submission_id'] is None:
+            fingerprint = '|'.join(str(row.get(field)) for field in FIELDS[:5])
+            entry['submission_id'] = str(uuid.uuid5(_LEGACY_NAMESPACE, fingerprint))
+        yield entry
+
+
+def import_scores(leaderboard, entries: Iterable[Dict], chunk_size: int = 500) -> Dict:
+    """
+    Upload entries with Leaderboard.submit_scores, chunk_size rows per request
+
+    Only one chunk is held in memory. Re-running an import is safe: rows
+    keep their submission_id, so ones already stored are skipped. Entries
+    read_scores() could not parse are rejected without being sent.
+
+    Returns:
+        {'rows', 'ok', 'failed', 'rejected', 'errors'} with up to 10 sample
+        error messages; rejected rows (unparsable or invalid) count as failed
+    """
+    stats = {'rows': 0, 'ok': 0, 'failed': 0, 'rejected': 0, 'errors': []}
+    entries = iter(entries)
+    while True:
+        chunk = list(islice(entries, chunk_size))
+        if not chunk:
+            return stats
+        results = [{'submission_id': None, 'ok': False, 'error': entry['error'], 'rejected': True}
+                   for entry in chunk if 'error' in entry]
+        valid = [entry for entry in chunk if 'error' not in entry]
+        if valid:
+            results.extend(leaderboard.submit_scores(valid, chunk_size=chunk_size))
+        for result in results:
+            stats['rows'] += 1
+            if result['ok']:
+                stats['ok'] += 1
+                continue
+            stats['failed'] += 1
+            stats['rejected'] += result['rejected']
+            if len(stats['errors']) < 10:
+                stats['errors'].append(f"{result['submission_id']}: {result['error']}"
+                                       if result['submission_id'] else result['error'])
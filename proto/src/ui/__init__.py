@@ -3,5 +3,15 @@ User interface components
 """
 
 from .leaderboard_ui import LeaderboardUI
+from .leaderboard_overlay import LeaderboardOverlay
+from .spectator import SpectatorServer
+from .presenter import NullPresenter, WindowPresenter, create_presenter
 
-__all__ = ['LeaderboardUI']
+__all__ = [
+    'LeaderboardUI',
+    'LeaderboardOverlay',
+    'SpectatorServer',
+    'NullPresenter',
+    'WindowPresenter',
+    'create_presenter',
+]
@@ -0,0 +1,126 @@
+"""
+In-game leaderboard overlay fed by a background prefetch thread
+"""
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from ..leaderboard.storage import DIFFICULTIES
+from .leaderboard_ui import LeaderboardUI
+
+
+class LeaderboardOverlay:
+    """
+    Leaderboard boards drawn over live game frames without waiting on the
+    network.
+
+    A daemon thread fetches the boards through the Leaderboard read cache
+    into a back buffer, and a finished fetch is swapped in with a single
+    reference assignment. draw() only renders the current front buffer (well
+    under a millisecond at 640x480), so the render loop never waits on the
+    network. Until the first fetch finishes the boards show placeholder
+    rows, and a failed fetch keeps the last good boards.
+
+    Scores added with add_score() (the game just played) are merged into the
+    boards at once, since they reach the leaderboard only after the game
+    over screen.
+    """
+
+    def __init__(self, leaderboard, ui: Optional[LeaderboardUI] = None, limit: int = 10,
+                 refresh_interval: float = 30.0, current_player: Optional[str] = None,
+                 highlight: Optional[str] = None):
+        """
+        Args:
+            leaderboard: Leaderboard to read the boards from
+            ui: Renderer sized like the game frames (default: 640x480)
+            limit: Rows per difficulty
+            refresh_interval: Seconds between background refreshes
+            current_player: Highlight this player's name
+            highlight: Difficulty whose column header is highlighted
+        """
+        self.leaderboard = leaderboard
+        self.ui = ui or LeaderboardUI()
+        self.limit = limit
+        self.refresh_interval = refresh_interval
+        self.current_player = current_player
+        self.highlight = highlight
+        self.updated_at = None  # time.time() of the last successful fetch
+        self._local = []  # scores added here, merged into every fetched board
+
+        placeholder = [{'player_name': '...', 'score': '-'}] * limit
+        self._front = {difficulty: placeholder for difficulty in DIFFICULTIES}
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self) -> bool:
+        """True once real scores have replaced the placeholders"""
+        return self.updated_at is not None
+
+    def start(self):
+        """Start prefetching in the background"""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='leaderboard-overlay',
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the prefetch thread (an in-flight fetch is abandoned after timeout)"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh(self):
+        """Ask for a fetch now (e.g. at game over) without waiting for it"""
+        self._wake.set()
+
+    def add_score(self, score: int, player_name: Optional[str] = None,
+                  difficulty: Optional[str] = None):
+        """
+        Show a score on the boards before the leaderboard has it
+
+        Args:
+            score: Score to show
+            player_name: Default: current_player
+            difficulty: Default: the highlighted difficulty
+        """
+        self._local.append({'player_name': player_name or self.current_player,
+                            'score': score, 'difficulty': difficulty or self.highlight})
+        self._front = self._merge(self._front)
+
+    def draw(self, frame: np.ndarray) -> np.ndarray:
+        """Draw the latest boards onto frame; never blocks"""
+        return self.ui.draw_boards(frame, self._front, self.current_player, self.highlight)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.clear()
+            try:
+                boards = self.leaderboard.fetch_top_scores_by_difficulty(self.limit)
+            except Exception as e:
+                print(f"Error prefetching leaderboards: {e}")
+            else:
+                self._front = self._merge(boards)  # the swap
+                self.updated_at = time.time()
+            self._wake.wait(self.refresh_interval)
+
+    def _merge(self, boards):
+        """Copy of boards with the local scores ranked in (once each)"""
+        merged = dict(boards)
+        for entry in self._local:
+            board = merged.get(entry['difficulty'])
+            if board is None or any(row.get('player_name') == entry['player_name']
+                                    and row.get('score') == entry['score'] for row in board):
+                continue
+            # Placeholder rows ('-') rank below every score
+            board = sorted(board + [entry], reverse=True,
+                           key=lambda row: row['score'] if isinstance(row['score'], int) else -1)
+            merged[entry['difficulty']] = board[:self.limit]
+        return merged
@@ -3,7 +3,7 @@ Leaderboard UI rendering
 """
 import cv2
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 
 class LeaderboardUI:
@@ -100,8 +100,8 @@ class LeaderboardUI:
             # Determine text color
             text_color = self.highlight_color if player_name == current_player else self.text_color
             
-            # Draw rank and name
-            rank_text = f"{idx}."
+            # Draw rank and name (entries from a rank window carry their own)
+            rank_text = f"{entry.get('rank', idx)}."
             name_text = player_name[:15]  # Truncate long names
             score_text = str(score)
             
@@ -146,6 +146,97 @@ class LeaderboardUI:
         
         return frame
     
+    def draw_boards(self, frame: np.ndarray, boards: Dict[str, List[Dict]],
+                    current_player: Optional[str] = None, highlight: Optional[str] = None) -> np.ndarray:
+        """
+        Draw one leaderboard column per difficulty, side by side
+        
+        Args:
+            frame: Video frame to draw on
+            boards: Difficulty -> score entries, as returned by
+                Leaderboard.get_top_scores_by_difficulty
+            current_player: Highlight this player's name
+            highlight: Difficulty whose column header is highlighted
+            
+        Returns:
+            Frame with leaderboard overlay
+        """
+        overlay = frame.copy()
+        
+        # One column per difficulty across most of the frame
+        margin = 20
+        column_width = (self.width - 2 * margin) // max(1, len(boards))
+        rows = max((len(scores) for scores in boards.values()), default=0)
+        board_height = min(self.height - 2 * margin, 80 + rows * 28)
+        y_offset = (self.height - board_height) // 2
+        scale = self.text_scale * 0.8
+        
+        cv2.rectangle(
+            overlay,
+            (margin, y_offset),
+            (self.width - margin, y_offset + board_height),
+            self.bg_color,
+            -1
+        )
+        
+        for column, (difficulty, scores) in enumerate(boards.items()):
+            x_offset = margin + column * column_width
+            header_color = self.highlight_color if difficulty == highlight else self.header_color
+            
+            # Column frame and title
+            cv2.rectangle(
+                overlay,
+                (x_offset, y_offset),
+                (x_offset + column_width, y_offset + board_height),
+                header_color,
+                2
+            )
+            title = difficulty.upper()
+            title_size = cv2.getTextSize(title, self.font, self.text_scale, self.thickness)[0]
+            cv2.putText(
+                overlay,
+                title,
+                (x_offset + (column_width - title_size[0]) // 2, y_offset + 35),
+                self.font,
+                self.text_scale,
+                header_color,
+                self.thickness
+            )
+            
+            # Scores; as many as fit in the column
+            y_pos = y_offset + 70
+            for idx, entry in enumerate(scores, 1):
+                if y_pos > y_offset + board_height - 8:
+                    break
+                player_name = entry.get('player_name', 'Unknown')
+                score_text = str(entry.get('score', 0))
+                text_color = self.highlight_color if player_name == current_player else self.text_color
+                
+                cv2.putText(
+                    overlay,
+                    f"{idx}. {player_name[:10]}",
+                    (x_offset + 10, y_pos),
+                    self.font,
+                    scale,
+                    text_color,
+                    1
+                )
+                score_size = cv2.getTextSize(score_text, self.font, scale, 1)[0]
+                cv2.putText(
+                    overlay,
+                    score_text,
+                    (x_offset + column_width - 10 - score_size[0], y_pos),
+                    self.font,
+                    scale,
+                    text_color,
+                    1
+                )
+                y_pos += 28
+        
+        cv2.addWeighted(overlay, self.overlay_alpha, frame, 1 - self.overlay_alpha, 0, frame)
+        
+        return frame
+    
     def draw_score_submission(self, frame: np.ndarray, message: str) -> np.ndarray:
         """
         Draw score submission notification
@@ -0,0 +1,204 @@
+"""
+Presentation stages: show finished frames and collect key presses
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+import cv2
+
+
+class NullPresenter:
+    """
+    Headless presenter for servers and tests.
+
+    Frames are counted and dropped; keys come from press() (e.g. a test
+    script or a remote control) instead of a window.
+    """
+
+    def __init__(self, latency_window: int = 300):
+        self.shown = 0
+        self.superseded = 0
+        self._keys = deque()
+        self._latencies = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+
+    def show(self, frame, window: Optional[str] = None):
+        """Present frame (in window, for presenters with several)"""
+        self.shown += 1
+        self._latencies.append(0.0)
+
+    def press(self, key: int):
+        """Queue a key as if it was pressed in the window"""
+        with self._lock:
+            self._keys.append(key)
+
+    def keys(self) -> List[int]:
+        """Keys pressed since the last call, oldest first"""
+        with self._lock:
+            keys = list(self._keys)
+            self._keys.clear()
+        return keys
+
+    def close_window(self, window: str):
+        pass
+
+    def stats(self) -> Dict:
+        """
+        Returns:
+            {'shown', 'superseded' (replaced by a newer frame before being
+            shown), 'latency_ms', 'p95_ms'} where latency runs from show()
+            to the frame being on screen
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        return {
+            'shown': self.shown,
+            'superseded': self.superseded,
+            'latency_ms': sum(latencies) / len(latencies) if latencies else None,
+            'p95_ms': latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+        }
+
+    def report(self) -> str:
+        stats = self.stats()
+        if not stats['shown']:
+            return "Presenter: no frames shown"
+        return (f"Presenter: {stats['shown']} frames shown, {stats['superseded']} superseded, "
+                f"latency {stats['latency_ms']:.1f} ms (p95 {stats['p95_ms']:.1f} ms)")
+
+    def close(self):
+        pass
+
+
+class WindowPresenter(NullPresenter):
+    """
+    OpenCV windows driven by a dedicated display thread.
+
+    cv2.imshow and cv2.waitKey take a variable time that depends on the
+    window system. Here they run on their own thread, so the game loop only
+    drops the finished frame into a per-window slot and reads the keys
+    collected since the last frame. The display thread always shows the
+    newest frame of each window (older ones are superseded, never queued)
+    and keeps pumping window events while the game is busy.
+
+    HighGUI windows belong to the thread that created them; every window
+    call happens on the display thread. On macOS, where windows must live on
+    the main thread, pass threaded=False to present inline.
+    """
+
+    def __init__(self, title: str = 'Fruit Ninja CV', threaded: bool = True,
+                 latency_window: int = 300):
+        """
+        Args:
+            title: Default window title
+            threaded: Present on a display thread (False: inline in show())
+            latency_window: Recent frames kept for latency stats
+        """
+        super().__init__(latency_window)
+        self.title = title
+        self.threaded = threaded
+        self._cond = threading.Condition(self._lock)
+        self._slots = {}  # window -> (frame, show() perf_counter)
+        self._closing = []  # windows to destroy
+        self._stopped = False
+        self._thread = None
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name='presenter', daemon=True)
+            self._thread.start()
+
+    def show(self, frame, window: Optional[str] = None):
+        window = window or self.title
+        submitted = time.perf_counter()
+        if not self.threaded:
+            self._present(window, frame, submitted)
+            return
+        with self._cond:
+            if window in self._slots:
+                self.superseded += 1
+            self._slots[window] = (frame, submitted)
+            self._cond.notify()
+
+    def close_window(self, window: str):
+        if not self.threaded:
+            self._destroy(window)
+            return
+        with self._cond:
+            self._slots.pop(window, None)
+            self._closing.append(window)
+            self._cond.notify()
+
+    def close(self, timeout: float = 1.0):
+        """Stop the display thread and destroy the windows"""
+        if self._thread is not None:
+            with self._cond:
+                self._stopped = True
+                self._cond.notify()
+            self._thread.join(timeout)
+            self._thread = None
+        elif not self.threaded:
+            self._destroy()
+
+    # Window system calls (all made on the display thread when threaded)
+
+    def _draw(self, window, frame):
+        cv2.imshow(window, frame)
+
+    def _poll_key(self) -> int:
+        return cv2.waitKey(1)
+
+    def _destroy(self, window: Optional[str] = None):
+        if window is None:
+            cv2.destroyAllWindows()
+        else:
+            cv2.destroyWindow(window)
+
+    def _present(self, window, frame, submitted):
+        self._draw(window, frame)
+        key = self._poll_key()
+        with self._lock:
+            self.shown += 1
+            self._latencies.append((time.perf_counter() - submitted) * 1000)
+            if key != -1:
+                self._keys.append(key)
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    # Wake for new frames; otherwise pump window events every 10 ms
+                    if not self._slots and not self._closing and not self._stopped:
+                        self._cond.wait(0.01)
+                    if self._stopped:
+                        return
+                    slots, self._slots = self._slots, {}
+                    closing, self._closing = self._closing, []
+
+                for window in closing:
+                    self._destroy(window)
+                if not slots:
+                    key = self._poll_key()
+                    if key != -1:
+                        with self._lock:
+                            self._keys.append(key)
+                    continue
+                for window, (frame, submitted) in slots.items():
+                    self._present(window, frame, submitted)
+        finally:
+            self._destroy()
+
+
+def create_presenter(kind: str = 'window', title: str = 'Fruit Ninja CV'):
+    """
+    Args:
+        kind: 'window' (display thread), 'inline' (window calls on the
+            caller's thread, e.g. macOS) or 'null' (headless)
+        title: Default window title
+    """
+    if kind == 'window':
+        return WindowPresenter(title)
+    if kind == 'inline':
+        return WindowPresenter(title, threaded=False)
+    if kind == 'null':
+        return NullPresenter()
+    raise ValueError(f"Unknown presenter '{kind}' (expected 'window', 'inline' or 'null')")
@@ -0,0 +1,265 @@
+"""
+Spectator MJPEG stream served from a separate encoder process
+"""
+import json
+import multiprocessing
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict
+
+import cv2
+import numpy as np
+
+PAGE = b"""<!DOCTYPE html>
+<html><head><title>Fruit Ninja CV</title>
+<style>body{margin:0;background:#000}img{width:100vw;height:100vh;object-fit:contain}</style>
+</head><body><img src="/stream.mjpg" alt="live game"></body></html>
+"""
+
+
+class SpectatorServer:
+    """
+    Live view of the game for a big screen or a monitoring page.
+
+    The game loop copies a rendered frame into shared memory at the
+    spectator frame rate (a memcpy of well under a millisecond at 640x480)
+    and returns. A separate process encodes each frame to JPEG once and
+    serves it to every viewer over HTTP, so neither encoding nor viewer
+    connections compete with the game for the GIL.
+
+    Endpoints: / (full-window page), /stream.mjpg (MJPEG), /snapshot.jpg
+    (latest frame) and /health (JSON counters).
+    """
+
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 10.0,
+                 quality: int = 70, host: str = '127.0.0.1', port: int = 8090):
+        """
+        Args:
+            width: Frame width streamed (other sizes are resized)
+            height: Frame height streamed
+            fps: Frames per second sent to spectators; others are not copied
+            quality: JPEG quality (0-100)
+            host: Interface to listen on ('0.0.0.0' for the whole LAN)
+            port: TCP port (0 picks a free one)
+        """
+        self.shape = (height, width, 3)
+        self.fps = fps
+        self.quality = quality
+        self.host = host
+        self.port = port
+        self.published = 0
+        self.skipped = 0  # frames dropped because the encoder was copying the last one
+        self._interval = 1 / fps
+        self._last_publish = float('-inf')
+        self._process = None
+        self._shm = None
+        self._frame = None
+
+    @property
+    def url(self) -> str:
+        host = '127.0.0.1' if self.host in ('0.0.0.0', '') else self.host
+        return f"http://{host}:{self.port}"
+
+    def start(self, timeout: float = 30.0):
+        """Start the encoder process and wait until it is listening"""
+        # spawn: the child must not inherit the game's camera, tracker or GUI state
+        ctx = multiprocessing.get_context('spawn')
+        self._shm = SharedMemory(create=True, size=int(np.prod(self.shape)))
+        self._frame = np.ndarray(self.shape, np.uint8, buffer=self._shm.buf)
+        self._frame.fill(0)  # fault the pages in now rather than on the first publish
+        self._lock = ctx.Lock()
+        self._sequence = ctx.Value('Q', 0, lock=False)
+        # A semaphore, not an Event: Event.set() waits for the woken process
+        self._new_frame = ctx.Semaphore(0)
+        self._stop = ctx.Event()
+        receiver, sender = ctx.Pipe(duplex=False)
+        self._process = ctx.Process(
+            target=_encode_and_serve, name='spectator-encoder', daemon=True,
+            args=(self._shm.name, self.shape, self._lock, self._sequence, self._new_frame,
+                  self._stop, self.quality, self.host, self.port, sender))
+        self._process.start()
+        sender.close()
+        try:
+            if not receiver.poll(timeout):
+                raise EOFError
+            result = receiver.recv()
+        except EOFError:
+            self.stop()
+            raise RuntimeError("spectator encoder did not start") from None
+        if isinstance(result, str):
+            self.stop()
+            raise RuntimeError(f"spectator server failed: {result}")
+        self.port = result
+        return self
+
+    def publish(self, frame: np.ndarray) -> bool:
+        """
+        Offer a rendered frame; never waits on the encoder
+
+        Returns:
+            True if the frame was handed to the encoder, False if it was
+            skipped by the frame rate limit or because the encoder was busy
+            copying
+        """
+        now = time.perf_counter()
+        if self._frame is None or now - self._last_publish < self._interval:
+            return False
+        if frame.shape != self.shape:
+            frame = cv2.resize(frame, (self.shape[1], self.shape[0]))
+        if not self._lock.acquire(block=False):
+            self.skipped += 1
+            return False
+        try:
+            np.copyto(self._frame, frame)
+            self._sequence.value += 1
+        finally:
+            self._lock.release()
+        self._new_frame.release()
+        self._last_publish = now
+        self.published += 1
+        return True
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the encoder process and free the shared memory"""
+        if self._process is not None:
+            self._stop.set()
+            self._new_frame.release()
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        if self._shm is not None:
+            self._frame = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def stats(self) -> Dict:
+        return {'published': self.published, 'skipped': self.skipped}
+
+
+class _JpegHub:
+    """Latest encoded frame, shared by every viewer thread"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.jpeg = None
+        self.sequence = 0
+        self.viewers = 0
+        self.closed = False
+
+    def publish(self, jpeg: bytes):
+        with self.cond:
+            self.jpeg = jpeg
+            self.sequence += 1
+            self.cond.notify_all()
+
+    def wait_newer(self, sequence: int, timeout: float = 1.0):
+        """(sequence, jpeg) once a frame newer than sequence exists, else (sequence, None)"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.sequence > sequence or self.closed, timeout)
+            if self.closed or self.sequence <= sequence:
+                return sequence, None
+            return self.sequence, self.jpeg
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+def _make_handler(hub: _JpegHub):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, content_type: str, body: bytes):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if path == '/':
+                self._send(200, 'text/html', PAGE)
+            elif path == '/snapshot.jpg':
+                jpeg = hub.jpeg
+                if jpeg is None:
+                    self._send(503, 'application/json', b'{"error": "no frame yet"}')
+                else:
+                    self._send(200, 'image/jpeg', jpeg)
+            elif path == '/health':
+                self._send(200, 'application/json', json.dumps(
+                    {'frames': hub.sequence, 'viewers': hub.viewers}).encode())
+            elif path == '/stream.mjpg':
+                self._stream()
+            else:
+                self._send(404, 'application/json', b'{"error": "unknown path"}')
+
+        def _stream(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=frame')
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            with hub.cond:
+                hub.viewers += 1
+            sequence = 0
+            try:
+                while not hub.closed:
+                    sequence, jpeg = hub.wait_newer(sequence)
+                    if jpeg is None:
+                        continue
+                    self.wfile.write(b'--frame\r\nContent-Type: image/jpeg\r\n'
+                                     b'Content-Length: %d\r\n\r\n' % len(jpeg))
+                    self.wfile.write(jpeg)
+                    self.wfile.write(b'\r\n')
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # viewer left
+            finally:
+                with hub.cond:
+                    hub.viewers -= 1
+
+    return Handler
+
+
+def _encode_and_serve(shm_name, shape, lock, sequence, new_frame, stop, quality, host, port, conn):
+    """Encoder process: JPEG-encode each new shared frame once and serve it over HTTP"""
+    try:
+        hub = _JpegHub()
+        server = ThreadingHTTPServer((host, port), _make_handler(hub))
+        server.daemon_threads = True
+    except OSError as e:
+        conn.send(str(e))
+        return
+    shm = SharedMemory(name=shm_name)
+    shared = np.ndarray(shape, np.uint8, buffer=shm.buf)
+    frame = np.empty(shape, np.uint8)
+    thread = threading.Thread(target=server.serve_forever, name='spectator-http', daemon=True)
+    thread.start()
+    conn.send(server.server_address[1])
+    conn.close()
+
+    seen = 0
+    try:
+        while not stop.is_set():
+            if not new_frame.acquire(timeout=0.5):
+                continue
+            with lock:
+                if sequence.value == seen:
+                    continue
+                seen = sequence.value
+                np.copyto(frame, shared)
+            ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if ok:
+                hub.publish(jpeg.tobytes())
+    finally:
+        hub.close()
+        server.shutdown()
+        server.server_close()
+        del shared
+        shm.close()
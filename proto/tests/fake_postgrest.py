@@ -0,0 +1,302 @@
+"""
+In-memory stand-in for the Supabase/PostgREST query builder used in tests
+
+Supports the subset of the fluent API the leaderboard uses and records how
+many requests were made and how many rows each one returned, so tests can
+assert on round trips and bandwidth.
+"""
+import itertools
+import time
+from datetime import datetime, timezone
+
+
+class APIError(Exception):
+    """Like postgrest.exceptions.APIError: the PostgREST error body as attributes"""
+
+    def __init__(self, error):
+        super().__init__(error.get('message'))
+        self.code = error.get('code')
+        self.message = error.get('message')
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.action = 'select'
+        self.columns = None
+        self.count = None
+        self.head = False
+        self.filters = []
+        self.ordering = []
+        self.row_limit = None
+        self.payload = None
+        self.upsert_options = None
+
+    # Actions
+    def select(self, *columns, count=None, head=None):
+        self.columns = [c.strip() for c in ','.join(columns).split(',')] if columns else ['*']
+        self.count = count
+        self.head = bool(head)
+        return self
+
+    def insert(self, data):
+        self.action = 'insert'
+        self.payload = data if isinstance(data, list) else [data]
+        return self
+
+    def upsert(self, data, on_conflict='', ignore_duplicates=False, returning=None):
+        self.insert(data)
+        self.upsert_options = (on_conflict, ignore_duplicates)
+        return self
+
+    def delete(self):
+        self.action = 'delete'
+        return self
+
+    def update(self, values):
+        self.action = 'update'
+        self.payload = values
+        return self
+
+    # Filters
+    def _filter(self, column, op, value):
+        self.filters.append((column, op, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, lambda a, b: a == b, value)
+
+    def neq(self, column, value):
+        return self._filter(column, lambda a, b: a != b, value)
+
+    def gt(self, column, value):
+        return self._filter(column, lambda a, b: a > b, value)
+
+    def gte(self, column, value):
+        return self._filter(column, lambda a, b: a >= b, value)
+
+    def lt(self, column, value):
+        return self._filter(column, lambda a, b: a < b, value)
+
+    def lte(self, column, value):
+        return self._filter(column, lambda a, b: a <= b, value)
+
+    def in_(self, column, values):
+        return self._filter(column, lambda a, b: a in b, list(values))
+
+    def is_(self, column, value):
+        # Whole-row filter: the column filters skip NULLs
+        expected = None if value == 'null' else value
+        self.filters.append((None, lambda row, _: row.get(column) is expected, None))
+        return self
+
+    def or_(self, filters):
+        tree = _parse_logic(f"or({filters})")
+        self.filters.append((None, lambda row, _: _evaluate(tree, row), None))
+        return self
+
+    def order(self, column, desc=False):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, size):
+        self.row_limit = size
+        return self
+
+    # Execution
+    def _matching(self):
+        rows = [r for r in self.client._rows(self.table)
+                if all(op(r, v) if c is None else r.get(c) is not None and op(r.get(c), v)
+                       for c, op, v in self.filters)]
+        for column, desc in reversed(self.ordering):
+            rows.sort(key=lambda r: r[column], reverse=desc)
+        return rows
+
+    def execute(self):
+        self.client.requests += 1
+        if self.client.latency:
+            time.sleep(self.client.latency)
+        if self.client.fail:
+            raise ConnectionError("fake upstream unavailable")
+        if self.table in self.client.missing_tables:
+            # PostgREST answers 404 for a table that is not in its schema cache
+            raise APIError({'code': 'PGRST205', 'message':
+                            f"Could not find the table 'public.{self.table}' in the schema cache"})
+
+        if self.action == 'insert':
+            return FakeResponse(self.client._insert(self.table, self.payload, self.upsert_options))
+
+        if self.action == 'update':
+            rows = self._matching()
+            for row in rows:
+                row.update(self.payload)
+            return FakeResponse([dict(r) for r in rows])
+
+        if self.action == 'delete':
+            rows = self._matching()
+            ids = {id(r) for r in rows}
+            self.client.tables[self.table] = [r for r in self.client.tables[self.table]
+                                              if id(r) not in ids]
+            return FakeResponse(rows)
+
+        rows = self._matching()
+        total = len(rows) if self.count else None
+        if self.row_limit is not None:
+            rows = rows[:self.row_limit]
+        if self.head:
+            rows = []
+        elif self.columns != ['*']:
+            rows = [{c: r.get(c) for c in self.columns} for r in rows]
+        else:
+            rows = [dict(r) for r in rows]
+        self.client.rows_returned += len(rows)
+        return FakeResponse(rows, total)
+
+
+class FakeRPC:
+    """The SQL functions from docs/ that the leaderboard calls"""
+
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        self.client.requests += 1
+        if self.client.fail:
+            raise ConnectionError("fake upstream unavailable")
+        if self.name != 'set_replay_verdicts':
+            raise APIError({'code': 'PGRST202', 'message': f"Could not find the function {self.name}"})
+        # docs/replay_verification.sql
+        verified_at = datetime.now(timezone.utc).isoformat()
+        replays = {row['submission_id']: row for row in self.client._rows('score_replays')}
+        for verdict in self.params['verdicts']:
+            row = replays.get(verdict['submission_id'])
+            if row is None:  # game submitted without a trace
+                row = {'submission_id': verdict['submission_id'], 'replay': None}
+                self.client._rows('score_replays').append(row)
+            row.update(verdict, verified_at=verified_at)
+        return FakeResponse(len(self.params['verdicts']))
+
+
+_OPERATORS = {
+    'eq': lambda a, b: a == b,
+    'neq': lambda a, b: a != b,
+    'gt': lambda a, b: a > b,
+    'gte': lambda a, b: a >= b,
+    'lt': lambda a, b: a < b,
+    'lte': lambda a, b: a <= b,
+}
+
+
+def _split_top_level(text):
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        depth += char == '('
+        depth -= char == ')'
+        if char == ',' and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _parse_logic(expr):
+    """Parse PostgREST logic trees like or(score.gt.5,and(score.eq.5,id.gt.3))"""
+    for kind, combine in (('and(', all), ('or(', any)):
+        if expr.startswith(kind):
+            return combine, [_parse_logic(part) for part in _split_top_level(expr[len(kind):-1])]
+    column, op, value = expr.split('.', 2)
+    return column, _OPERATORS[op], _parse_value(value.strip('"'))
+
+
+def _evaluate(tree, row):
+    if callable(tree[0]):
+        return tree[0](_evaluate(node, row) for node in tree[1])
+    column, op, value = tree
+    return row.get(column) is not None and op(row[column], value)
+
+
+class FakeSupabaseClient:
+    """Minimal Supabase client replacement backed by Python lists"""
+
+    def __init__(self):
+        self.tables = {}
+        self.ids = itertools.count(1)
+        self.requests = 0
+        self.rows_returned = 0
+        self.fail = False
+        self.latency = 0.0
+        self.missing_tables = set()  # tables whose migration was not applied
+        self._bests = {}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRPC(self, name, params)
+
+    def _insert(self, table, rows, upsert_options=None):
+        stored = []
+        existing = self.tables.setdefault(table, [])
+        for row in rows:
+            if upsert_options:
+                key = upsert_options[0]
+                if any(r.get(key) == row.get(key) for r in existing):
+                    continue
+            row = dict(row)
+            row.setdefault('id', next(self.ids))
+            row.setdefault('created_at', datetime.now(timezone.utc).isoformat())
+            existing.append(row)
+            stored.append(dict(row))
+            if table == 'leaderboard':
+                self._update_personal_best(row)
+        return stored
+
+    def _update_personal_best(self, row):
+        """The leaderboard_personal_best trigger from docs/personal_bests.sql"""
+        key = (row['player_name'], row['difficulty'])
+        best = self._bests.get(key)
+        if best is None:
+            best = self._bests[key] = {k: row[k] for k in
+                                       ('player_name', 'difficulty', 'score', 'created_at')}
+            self.tables.setdefault('personal_bests', []).append(best)
+        elif row['score'] > best['score']:
+            best.update(score=row['score'], created_at=row['created_at'])
+
+    def _rows(self, table):
+        if table == 'top_scores_by_difficulty':
+            # ROW_NUMBER() OVER (PARTITION BY difficulty ORDER BY score DESC)
+            ranked = []
+            rows = sorted(self.tables.get('leaderboard', []), key=lambda r: -r['score'])
+            for difficulty in sorted({r['difficulty'] for r in rows}):
+                partition = [r for r in rows if r['difficulty'] == difficulty]
+                ranked.extend({'difficulty': difficulty, 'player_name': r['player_name'],
+                               'score': r['score'], 'created_at': r['created_at'], 'rank': rank}
+                              for rank, r in enumerate(partition, 1))
+            return ranked
+        if table == 'replay_queue':
+            # leaderboard LEFT JOIN score_replays WHERE verdict IS NULL
+            replays = {r['submission_id']: r for r in self.tables.get('score_replays', [])}
+            return [{'submission_id': r['submission_id'], 'player_name': r['player_name'],
+                     'score': r['score'], 'difficulty': r['difficulty'],
+                     'replay': replays.get(r['submission_id'], {}).get('replay')}
+                    for r in self.tables.get('leaderboard', [])
+                    if r.get('submission_id') is not None
+                    and replays.get(r['submission_id'], {}).get('verdict') is None]
+        return self.tables.setdefault(table, [])
+
+    def seed(self, rows, table='leaderboard'):
+        """Insert rows directly without counting a request"""
+        self._insert(table, rows)
+
+
+def _parse_value(value):
+    return int(value) if value.lstrip('-').isdigit() else value
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests that the batched replay matches the frame-by-frame game logic, and
+that sessions record what the replay is scored against
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.cv.batch_replay import SessionBatch, evaluate, slash_mask
+from src.cv.gesture_detector import GestureDetector, Gesture
+from src.cv.session import LandmarkSession
+
+
+def random_track(n=600, seed=1):
+    """Random-walk fingertip with bursts of fast motion and dropouts"""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.01, (n, 2)) * rng.choice([1, 6], size=(n, 1), p=[0.8, 0.2])
+    track = np.clip(0.5 + np.cumsum(steps, axis=0), 0, 1)
+    track[rng.random(n) < 0.05] = np.nan
+    return track
+
+
+def test_slash_mask_matches_detector():
+    """Vectorized detector agrees with GestureDetector on every frame"""
+    track = random_track()
+    for history, velocity in [(10, 0.03), (4, 0.01), (2, 0.05)]:
+        detector = GestureDetector(history_size=history, min_velocity=velocity)
+        expected = []
+        for tip in track:
+            landmarks = None if np.isnan(tip[0]) else [tuple(tip)] * 21
+            expected.append(detector.update(landmarks) == Gesture.SLASHING)
+        assert np.array_equal(slash_mask(track, history, velocity), np.array(expected))
+    print("✅ Batched gesture detection matches GestureDetector")
+
+
+def test_evaluate_rates():
+    """A clean horizontal slash through a target is detected and sliced"""
+    ts = np.arange(60) / 30.0
+    tips = np.full((60, 2), 0.5)
+    tips[:, 0] = np.interp(np.arange(60), [20, 29], [0.2, 0.8])  # fast swipe
+    labels = np.zeros(60, dtype=bool)
+    labels[20:30] = True
+    hit = [ts[25], tips[25, 0] * 640, 240, 20]
+    miss = [ts[50], 50, 50, 20]
+    session = LandmarkSession(ts, tips, labels=labels, targets=[hit, miss])
+
+    batch = SessionBatch([session, session])
+    metrics = evaluate(batch, history_size=10, min_velocity=0.03,
+                       collision_window=0.3, slice_threshold=20)
+    assert metrics['labeled_slashes'] == 2
+    assert metrics['gesture_miss_rate'] == 0.0
+    assert metrics['gesture_fp_rate'] == 0.0
+    assert metrics['slice_miss_rate'] == 0.5
+    print("✅ Replay error rates")
+
+
+def test_unlabeled_sessions_have_no_rates():
+    """Sessions without labels or targets yield NaN, not a perfect score"""
+    ts = np.arange(60) / 30.0
+    session = LandmarkSession(ts, random_track(60))
+    metrics = evaluate(SessionBatch([session]), history_size=10, min_velocity=0.03,
+                       collision_window=0.3, slice_threshold=20)
+    assert np.isnan(metrics['gesture_miss_rate'])
+    assert np.isnan(metrics['gesture_fp_rate'])
+    assert np.isnan(metrics['slice_miss_rate'])
+    print("✅ Unlabeled sessions are not scored")
+
+
+def test_game_records_every_fruit_as_a_target():
+    """A recorded game stores sliced fruits where they were sliced, missed ones
+    where they came closest to the hand"""
+    from src.core import FruitNinjaGame, Fruit
+    from src.core.replay import _NoTracker
+    from src.cv.session import SessionRecorder
+
+    recorder = SessionRecorder()
+    game = FruitNinjaGame(hand_tracker=_NoTracker(), session_recorder=recorder, seed=1)
+    for i in range(5):
+        recorder.add_frame(None, timestamp=i / 30)
+    game.fruits.append(Fruit(320, 240))
+    game.trail.add_point(320, 240, game.now)
+    game.check_slice(Gesture.SLASHING)
+    assert game.score == 1
+
+    # Rises past a fingertip at (100, 96) without being sliced, then leaves the screen
+    missed = Fruit(100, 100)
+    game.fruits.append(missed)
+    hand = [(0, 0)] * 8 + [(100 / 640, 96 / 480)]
+    for i in range(5, 40):
+        recorder.add_frame(hand, timestamp=i / 30)
+        game.update_physics()
+        recorder.track_fruits(game.fruits)
+    assert missed not in game.fruits
+
+    session = recorder.to_session()
+    assert session.targets.tolist() == [[4 / 30, 320, 240, 20, 1.0],
+                                        [5 / 30, 100, 95, 20, 0.0]]
+    assert SessionRecorder().to_session().targets.shape == (0, 5)
+    legacy = LandmarkSession([0.0], [(0.5, 0.5)], targets=[[0.0, 1, 2, 3]])
+    assert legacy.targets.tolist() == [[0.0, 1, 2, 3, 1.0]]
+    print("✅ Every fruit recorded as a target")
+
+
+def main():
+    """Run all tests"""
+    tests = [v for k, v in globals().items() if k.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,675 @@
+#!/usr/bin/env python3
+"""
+Leaderboard tests against the local SQLite backend and an in-memory
+PostgREST stand-in (no network required)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_postgrest import FakeSupabaseClient
+from src.leaderboard import Leaderboard, SQLiteStorage, SupabaseStorage
+
+BACKENDS = ('supabase', 'sqlite')
+
+
+def make_leaderboard(rows=(), backend='supabase'):
+    """
+    Leaderboard seeded with (player, score, difficulty) rows
+
+    Returns (leaderboard, fake client) for 'supabase' and
+    (leaderboard, storage) for 'sqlite'.
+    """
+    rows = [{'player_name': name, 'score': score, 'difficulty': difficulty}
+            for name, score, difficulty in rows]
+    if backend == 'sqlite':
+        storage = SQLiteStorage(':memory:')
+        storage.insert_scores(rows)
+        return Leaderboard(storage), storage
+
+    client = FakeSupabaseClient()
+    client.seed(rows)
+    return Leaderboard(SupabaseStorage(client=client)), client
+
+
+def test_player_rank():
+    """Rank counts scores above the player's best"""
+    for backend in BACKENDS:
+        leaderboard, _ = make_leaderboard([
+            ('alice', 50, 'medium'),
+            ('bob', 40, 'medium'),
+            ('carol', 30, 'medium'),
+            ('bob', 10, 'medium'),
+            ('dave', 90, 'hard'),
+        ], backend)
+        assert leaderboard.get_player_rank('alice', 'medium') == 1
+        assert leaderboard.get_player_rank('bob', 'medium') == 2
+        assert leaderboard.get_player_rank('carol', 'medium') == 3
+        assert leaderboard.get_player_rank('carol') == 4
+        assert leaderboard.get_player_rank('dave', 'medium') is None
+    print("✅ Player rank")
+
+
+def test_submit_and_read():
+    """Submitted scores show up in top scores and best-score lookups"""
+    for backend in BACKENDS:
+        leaderboard, _ = make_leaderboard([('alice', 50, 'easy')], backend)
+        assert leaderboard.submit_score('bob', 70, 'easy')
+        assert leaderboard.submit_score('bob', 20, 'hard')
+        assert leaderboard.submit_score('bob', 20, 'hard', submission_id='fixed')
+        assert leaderboard.submit_score('bob', 20, 'hard', submission_id='fixed')
+
+        top = leaderboard.get_top_scores(limit=10, difficulty='easy')
+        assert [(e['player_name'], e['score']) for e in top] == [('bob', 70), ('alice', 50)]
+        assert len(leaderboard.get_top_scores(limit=10, difficulty='hard')) == 2
+        assert leaderboard.get_player_best_score('bob') == 70
+        assert leaderboard.get_player_best_score('bob', 'hard') == 20
+        assert leaderboard.get_player_best_score('nobody') is None
+    print("✅ Submit and read back")
+
+
+def test_sqlite_mirrors_schema():
+    """SQLite backend has the Supabase indexes and rejects invalid rows"""
+    storage = SQLiteStorage(':memory:')
+    indexes = {row[0] for row in storage._query(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'idx_leaderboard_difficulty_score', 'idx_leaderboard_player'} <= indexes
+
+    plan = ' '.join(row[3] for row in storage._query(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM leaderboard WHERE difficulty = 'easy' AND score > 5"))
+    assert 'idx_leaderboard_difficulty_score' in plan
+
+    leaderboard = Leaderboard(storage)
+    assert not leaderboard.submit_score('cheater', -1, 'easy')
+    assert not leaderboard.submit_score('alice', 1, 'impossible')
+    print("✅ SQLite backend mirrors the Supabase schema")
+
+
+def test_top_scores_by_difficulty():
+    """All three boards come back from one cached query and render"""
+    import numpy as np
+    from src.ui import LeaderboardUI
+
+    rows = [(f"{d}{i}", i, d) for d in ('easy', 'medium', 'hard') for i in range(20)]
+    for backend in BACKENDS:
+        leaderboard, upstream = make_leaderboard(rows, backend)
+        boards = leaderboard.get_top_scores_by_difficulty(limit=5)
+        assert list(boards) == ['easy', 'medium', 'hard']
+        assert [e['score'] for e in boards['hard']] == [19, 18, 17, 16, 15]
+        assert [e['rank'] for e in boards['easy']] == [1, 2, 3, 4, 5]
+        assert leaderboard.get_top_scores_by_difficulty(limit=5) is boards
+        if backend == 'supabase':
+            assert upstream.requests == 1 and upstream.rows_returned == 15
+
+        assert leaderboard.submit_score('ace', 99, 'medium')
+        assert leaderboard.get_top_scores_by_difficulty(limit=5)['medium'][0]['player_name'] == 'ace'
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    LeaderboardUI(640, 480).draw_boards(frame, boards, current_player='ace', highlight='medium')
+    assert frame.any()
+    print("✅ Top scores for every difficulty in one query")
+
+
+def test_player_rank_does_not_scan_table():
+    """Rank lookup transfers at most one row, whatever the table size"""
+    rows = [(f"player{i}", i, 'medium') for i in range(5000)]
+    leaderboard, client = make_leaderboard(rows)
+
+    assert leaderboard.get_player_rank('player4000', 'medium') == 1000
+    assert client.requests == 2
+    assert client.rows_returned <= 1
+    print("✅ Player rank is computed server-side")
+
+
+def test_players_around():
+    """The rank window costs a fixed number of small queries at any depth"""
+    rows = [(f"player{i}", i, 'medium') for i in range(5000)] + [('me', 3855, 'medium'),
+                                                                 ('me', 10, 'medium')]
+    for backend in BACKENDS:
+        leaderboard, upstream = make_leaderboard(rows, backend)
+        window = leaderboard.get_players_around('me', 'medium', k=3)
+        assert [(e['player_name'], e['rank']) for e in window] == [
+            ('player3858', 1142), ('player3857', 1143), ('player3856', 1144),
+            ('me', 1145),
+            ('player3855', 1146), ('player3854', 1147), ('player3853', 1148)]
+        if backend == 'supabase':
+            assert upstream.requests == 4  # best, count, above, below
+            assert upstream.rows_returned <= 8  # k above, k below and the best row itself
+        assert leaderboard.get_players_around('nobody', 'medium') == []
+
+    top = leaderboard.get_players_around('player4999', 'medium', k=2)
+    assert [e['rank'] for e in top] == [1, 2, 3]
+    print("✅ Players around me")
+
+
+def test_players_around_keeps_own_games():
+    """The player's other games below their best still take up ranks"""
+    for backend in BACKENDS:
+        leaderboard, _ = make_leaderboard([
+            ('alice', 70, 'easy'), ('alice', 65, 'easy'), ('bob', 60, 'easy'),
+            ('carol', 80, 'easy')], backend)
+        window = leaderboard.get_players_around('alice', 'easy', k=2)
+        assert [(e['player_name'], e['score'], e['rank']) for e in window] == [
+            ('carol', 80, 1), ('alice', 70, 2), ('alice', 65, 3), ('bob', 60, 4)]
+    print("✅ Players around keeps the player's other games")
+
+
+def test_personal_bests():
+    """With personal bests, rank and best lookups see one row per player"""
+    rows = [('alice', 50, 'easy'), ('alice', 70, 'easy'), ('bob', 60, 'easy'),
+            ('bob', 65, 'easy'), ('carol', 10, 'easy')]
+    for backend in BACKENDS:
+        if backend == 'sqlite':
+            # Existing games are backfilled when the table is first created
+            import tempfile
+            path = os.path.join(tempfile.mkdtemp(), 'leaderboard.db')
+            storage = SQLiteStorage(path)
+            storage.insert_scores([{'player_name': n, 'score': s, 'difficulty': d}
+                                   for n, s, d in rows])
+            storage.close()
+            storage = SQLiteStorage(path, personal_bests=True)
+            assert storage.count_personal_bests('easy') == 3
+        else:
+            client = FakeSupabaseClient()
+            client.seed([{'player_name': n, 'score': s, 'difficulty': d} for n, s, d in rows])
+            storage = SupabaseStorage(client=client, personal_bests=True)
+        leaderboard = Leaderboard(storage)
+
+        assert leaderboard.get_player_best_score('alice', 'easy') == 70
+        assert leaderboard.get_player_rank('bob', 'easy') == 2      # games: 3
+        assert leaderboard.get_player_rank('carol', 'easy') == 3    # games: 5
+
+        assert leaderboard.submit_score('carol', 80, 'easy')
+        assert leaderboard.submit_score('alice', 20, 'easy')        # not a new best
+        assert leaderboard.get_player_best_score('carol', 'easy') == 80
+        assert leaderboard.get_player_rank('alice', 'easy') == 2
+        window = leaderboard.get_players_around('alice', 'easy', k=5)
+        assert [(e['player_name'], e['score']) for e in window] == [
+            ('carol', 80), ('alice', 70), ('bob', 65)]
+    print("✅ Personal-best table")
+
+
+def test_compaction():
+    """Old games roll up into daily aggregates; bests and top games survive"""
+    storage = SQLiteStorage(':memory:')
+    storage.insert_scores([
+        {'player_name': f"p{i % 10}", 'score': i, 'difficulty': 'easy',
+         'created_at': f"2020-01-{1 + i % 28:02d}T10:00:00"} for i in range(200)])
+    storage.insert_scores([{'player_name': 'fresh', 'score': 1, 'difficulty': 'easy'}])
+    stats_before = [dict(r) for r in storage._query('SELECT * FROM leaderboard_stats')]
+
+    assert storage.compact(retain_days=30, keep_top=5) == 190
+    assert storage.compact(retain_days=30, keep_top=5) == 0
+    assert storage.count_scores() == 11  # top 5 of easy, 10 player bests, fresh game
+    assert [dict(r) for r in storage._query('SELECT * FROM leaderboard_stats')] == stats_before
+    assert storage._query('SELECT SUM(games) FROM leaderboard_daily_scores')[0][0] == 190
+
+    leaderboard = Leaderboard(storage)
+    assert leaderboard.get_player_best_score('p3', 'easy') == 193
+    assert [e['score'] for e in leaderboard.get_top_scores(5, 'easy')] == [199, 198, 197, 196, 195]
+    print("✅ Retention compaction")
+
+
+def test_read_cache():
+    """Repeated reads are served locally until a submit changes them"""
+    leaderboard, client = make_leaderboard([('alice', 50, 'medium'), ('bob', 40, 'medium')])
+
+    for _ in range(5):
+        top = leaderboard.get_top_scores(limit=10, difficulty='medium')
+        rank = leaderboard.get_player_rank('bob', 'medium')
+    assert [e['player_name'] for e in top] == ['alice', 'bob'] and rank == 2
+    assert client.requests == 3  # top, best, count
+    assert leaderboard.cache_stats()['hits'] == 8
+
+    assert leaderboard.submit_score('bob', 60, 'medium')
+    assert leaderboard.get_player_best_score('bob', 'medium') == 60  # patched locally
+    assert leaderboard.get_player_rank('bob', 'medium') == 1
+    assert leaderboard.get_top_scores(limit=10, difficulty='medium')[0]['player_name'] == 'bob'
+    print("✅ Read-through cache with write invalidation")
+
+
+def test_cache_ttl_and_lru():
+    """Entries expire after the TTL and the least recently used is evicted"""
+    from src.leaderboard.cache import TTLCache
+
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)  # evicts 'b'
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    now[0] = 11
+    assert cache.get('a') == (False, None)
+    assert cache.stats()['evictions'] == 1
+    print("✅ TTL cache expiry and LRU eviction")
+
+
+def test_errors_are_not_cached():
+    """A failed query is retried on the next call"""
+    leaderboard, client = make_leaderboard([('alice', 50, 'medium')])
+    client.fail = True
+    assert leaderboard.get_top_scores(difficulty='medium') == []
+    client.fail = False
+    assert len(leaderboard.get_top_scores(difficulty='medium')) == 1
+    print("✅ Errors are not cached")
+
+
+def test_bulk_submit():
+    """Bulk submission chunks requests and reports every row"""
+    leaderboard, client = make_leaderboard()
+    entries = [{'player_name': f"p{i}", 'score': i, 'difficulty': 'hard'} for i in range(1200)]
+    entries[7]['score'] = -5
+    entries[8]['difficulty'] = 'nightmare'
+
+    results = leaderboard.submit_scores(entries, chunk_size=500)
+    assert client.requests == 3
+    assert len(results) == 1200
+    assert sum(r['ok'] for r in results) == 1198
+    assert not results[7]['ok'] and 'score' in results[7]['error']
+    assert not results[8]['ok'] and 'difficulty' in results[8]['error']
+    assert len(client.tables['leaderboard']) == 1198
+
+    # Replaying the same batch is idempotent
+    assert all(r['ok'] for r in leaderboard.submit_scores(
+        [dict(e, submission_id=r['submission_id']) for e, r in zip(entries, results) if r['ok']]))
+    assert len(client.tables['leaderboard']) == 1198
+
+    client.fail = True
+    requests = client.requests
+    results = leaderboard.submit_scores(entries[:1000], chunk_size=100)
+    assert client.requests == requests + 1
+    assert not any(r['ok'] for r in results)
+    assert results[-1]['error'].startswith('not attempted')
+    print("✅ Bulk score submission")
+
+
+def test_write_behind_survives_outage():
+    """Scores submitted while offline are kept and uploaded exactly once"""
+    from src.leaderboard import ScoreJournal, ScoreSubmitter
+
+    leaderboard, client = make_leaderboard()
+    journal = ScoreJournal(':memory:')
+    submitter = ScoreSubmitter(leaderboard, journal, base_delay=0.01, max_delay=0.05).start()
+
+    client.fail = True
+    for score in (10, 20, 30):
+        submitter.submit('alice', score, 'easy')
+    assert not submitter.flush(timeout=1.0)
+    assert submitter.pending() == 3 and submitter.failures >= 1
+
+    client.fail = False
+    deadline = time.time() + 2.0
+    while submitter.pending() and time.time() < deadline:
+        submitter.flush(timeout=0.1)
+    submitter.stop()
+
+    rows = client.tables['leaderboard']
+    assert sorted(r['score'] for r in rows) == [10, 20, 30]
+
+    # Replaying an already-delivered submission does not duplicate it
+    leaderboard._insert_rows([{k: rows[0][k] for k in
+                               ('submission_id', 'player_name', 'score', 'difficulty', 'created_at')}])
+    assert len(client.tables['leaderboard']) == 3
+    print("✅ Write-behind queue survives an outage")
+
+
+def test_invalid_scores_leave_the_journal():
+    """Rows that fail validation are dead-lettered at once instead of retried forever"""
+    from src.leaderboard import ScoreJournal, ScoreSubmitter
+
+    leaderboard, client = make_leaderboard()
+    journal = ScoreJournal(':memory:')
+    submitter = ScoreSubmitter(leaderboard, journal).start()
+    nameless = submitter.submit('', 10, 'easy')
+    unknown = submitter.submit('bob', 5, 'nightmare')
+    submitter.submit('alice', 20, 'easy')
+    assert submitter.flush(timeout=2.0)
+    submitter.stop()
+
+    assert len(journal) == 0 and submitter.failures == 0 and submitter.rejected == 2
+    assert [r['score'] for r in client.tables['leaderboard']] == [20]
+    rejected = {r['submission_id']: r['error'] for r in journal.rejected()}
+    assert set(rejected) == {nameless, unknown}
+    assert 'player_name' in rejected[nameless] and 'difficulty' in rejected[unknown]
+    print("✅ Invalid scores are dead-lettered")
+
+
+def test_replays_are_verified():
+    """Replays upload beside their scores and the verifier stores a verdict per game"""
+    from src.core import FruitNinjaGame
+    from src.core.replay import _NoTracker, verify_rows
+    from src.leaderboard import ScoreJournal, ScoreSubmitter
+
+    game = FruitNinjaGame(hand_tracker=_NoTracker(), seed=3)
+    for i in range(60):
+        game.advance((32767, 65534 - i * 1000), i * 33)
+    replay = game.replay.encode()
+
+    for backend in BACKENDS:
+        leaderboard, client = make_leaderboard(backend=backend)
+        storage = leaderboard.storage
+        submitter = ScoreSubmitter(leaderboard, ScoreJournal(':memory:')).start()
+        honest = submitter.submit('alice', game.score, 'medium', replay=replay)
+        cheat = submitter.submit('mallory', game.score + 100, 'medium', replay=replay)
+        bare = submitter.submit('bob', 5, 'medium')  # no replay: must not skip the check
+        assert submitter.flush(timeout=2.0)
+        submitter.stop()
+
+        assert all('replay' not in row for row in leaderboard.get_top_scores(10))
+        pending = storage.pending_replays(10)
+        assert sorted(row['submission_id'] for row in pending) == sorted([honest, cheat, bare])
+        assert [row['replay'] for row in pending if row['submission_id'] == bare] == [None]
+        assert storage.pending_replays(10, after=max(honest, cheat, bare)) == []
+
+        requests = client.requests if backend == 'supabase' else 0
+        storage.set_verdicts(list(verify_rows(pending, workers=1)))
+        if backend == 'supabase':
+            assert client.requests == requests + 1  # one batch, not a PATCH per game
+        assert storage.pending_replays(10) == []
+        if backend == 'sqlite':
+            verdicts = {row[0]: tuple(row[1:]) for row in storage._query(
+                'SELECT submission_id, verdict, reason FROM score_replays')}
+        else:
+            verdicts = {r['submission_id']: (r['verdict'], r['reason'])
+                        for r in client.tables['score_replays']}
+        assert verdicts[honest][0] == 'ok' and verdicts[cheat][0] == 'mismatch'
+        assert verdicts[bare] == ('invalid', 'no replay')
+    print("✅ Replay upload and verdicts")
+
+
+def test_flush_waits_for_a_score_submitted_mid_check():
+    """A score journalled right after the worker found nothing due is not skipped by flush()"""
+    import threading
+    from src.leaderboard import ScoreJournal, ScoreSubmitter
+
+    raced = threading.Event()
+
+    class RacyJournal(ScoreJournal):
+        def due(self, limit=50, now=None):
+            rows = super().due(limit, now)
+            if not rows and not raced.is_set():
+                # Lands between the worker's empty check and its idle signal
+                submitter.submit('late', 5, 'easy')
+                raced.set()
+            return rows
+
+    leaderboard, client = make_leaderboard()
+    client.latency = 0.2
+    journal = RacyJournal(':memory:')
+    submitter = ScoreSubmitter(leaderboard, journal)
+    submitter.start()
+    assert raced.wait(2.0)
+    assert submitter.flush(timeout=2.0)
+    submitter.stop()
+    assert [r['player_name'] for r in client.tables['leaderboard']] == ['late']
+    print("✅ Flush waits for scores submitted mid-check")
+
+
+def test_scores_survive_missing_replay_table():
+    """Without docs/replay_verification.sql, scores are stored and replays skipped"""
+    from src.core import FruitNinjaGame
+    from src.core.replay import _NoTracker
+    from src.leaderboard import ScoreJournal, ScoreSubmitter
+
+    game = FruitNinjaGame(hand_tracker=_NoTracker(), seed=3)
+    game.advance(None, 0)
+    replay = game.replay.encode()
+
+    leaderboard, client = make_leaderboard()
+    client.missing_tables.add('score_replays')
+    journal = ScoreJournal(':memory:')
+    submitter = ScoreSubmitter(leaderboard, journal).start()
+    submitter.submit('alice', 10, 'easy', replay=replay)
+    assert submitter.flush(timeout=2.0)
+    assert len(journal) == 0 and submitter.failures == 0
+    assert [r['score'] for r in client.tables['leaderboard']] == [10]
+    assert leaderboard.storage.store_replays is False
+
+    # Later scores no longer try the missing table
+    requests = client.requests
+    submitter.submit('bob', 20, 'easy', replay=replay)
+    assert submitter.flush(timeout=2.0)
+    submitter.stop()
+    assert client.requests == requests + 1
+    assert len(client.tables['leaderboard']) == 2
+    print("✅ Scores survive a missing replay table")
+
+
+def test_streaming_export_import():
+    """Exports page through the table by keyset; imports are chunked and idempotent"""
+    import io
+    from src.leaderboard import export_scores, import_scores, read_scores
+
+    rows = [(f"p{i}", i % 7, 'easy' if i % 2 else 'hard') for i in range(250)]
+    for backend in BACKENDS:
+        source, upstream = make_leaderboard(rows, backend)
+        assert source.storage.count_scores() == 250
+        assert source.storage.count_scores('easy') == 125
+
+        for fmt in ('csv', 'jsonl'):
+            for order in ('score', 'created_at'):
+                if backend == 'supabase':
+                    upstream.requests = upstream.rows_returned = 0
+                out = io.StringIO()
+                assert export_scores(source.storage, out, fmt, order, page_size=40) == 250
+                if backend == 'supabase':
+                    assert upstream.requests == 7 and upstream.rows_returned == 250
+
+                target, _ = make_leaderboard(backend=backend)
+                for _ in range(2):
+                    out.seek(0)
+                    stats = import_scores(target, read_scores(out, fmt), chunk_size=100)
+                    assert stats['ok'] == 250 and stats['failed'] == 0
+                exported = sorted((r['player_name'], r['score'], r['difficulty'])
+                                  for r in target.storage.iter_scores(page_size=33))
+                assert exported == sorted(rows)
+
+    # Unparsable rows are rejected one by one; the rest still import
+    target, _ = make_leaderboard()
+    lines = ['{"player_name": "a", "score": 1, "difficulty": "easy"}', '{"player_name": "b"',
+             '{"player_name": "c", "score": "lots", "difficulty": "easy"}', '[1, 2]',
+             '{"player_name": "d", "score": 2, "difficulty": "easy"}']
+    stats = import_scores(target, read_scores(io.StringIO('\n'.join(lines)), 'jsonl'))
+    assert stats['rows'] == 5 and stats['ok'] == 2
+    assert stats['failed'] == stats['rejected'] == 3
+    assert [e.split(':')[0] for e in stats['errors']] == ['row 2', 'row 3', 'row 4']
+    csv_rows = 'player_name,score,difficulty\ne,x,easy\nf,3,easy\n'
+    stats = import_scores(target, read_scores(io.StringIO(csv_rows), 'csv'))
+    assert stats['ok'] == 1 and stats['rejected'] == 1
+    print("✅ Streaming export and import")
+
+
+def test_score_histogram():
+    """Percentiles come from a local histogram synced incrementally and persisted"""
+    import tempfile
+    from src.leaderboard import ScoreHistogram
+
+    path = os.path.join(tempfile.mkdtemp(), 'histogram.json')
+    leaderboard, client = make_leaderboard([(f"p{i}", i, 'medium') for i in range(100)])
+    leaderboard.histogram = ScoreHistogram(path, margin=10)
+    assert leaderboard.get_percentile(50, 'medium') is None
+
+    assert leaderboard.sync_histogram() == 100
+    assert leaderboard.get_percentile(87, 'medium') == 87.0
+    assert leaderboard.get_approximate_rank(87, 'medium') == 13
+    assert leaderboard.get_approximate_rank(87, 'hard') == 1
+
+    assert leaderboard.submit_score('zoe', 200, 'hard')
+    requests, returned = client.requests, client.rows_returned
+    assert leaderboard.sync_histogram() == 1
+    # One request, re-reading the last 10 ids to catch rows that committed late
+    assert client.requests == requests + 1 and client.rows_returned == returned + 11
+    assert leaderboard.get_approximate_rank(150) == 2
+
+    start = time.perf_counter()
+    for score in range(10000):
+        leaderboard.get_percentile(score % 120, 'medium')
+    assert (time.perf_counter() - start) / 10000 < 50e-6
+
+    restored = ScoreHistogram(path, margin=10)
+    assert restored.cursor == leaderboard.histogram.cursor
+    assert restored.percentile(87, 'medium') == 87.0
+    assert restored.total() == 101
+    assert restored.sync(leaderboard.storage) == 0
+
+
+    # Rows whose ids are below the cursor but that committed after the last sync
+    client = FakeSupabaseClient()
+    storage = SupabaseStorage(client=client)
+    client.seed([{'id': i, 'player_name': 'p', 'score': i, 'difficulty': 'easy'} for i in (1, 2, 5, 50)])
+    histogram = ScoreHistogram(None, margin=10)
+    assert histogram.sync(storage) == 4
+    client.seed([{'id': i, 'player_name': 'late', 'score': i, 'difficulty': 'easy'} for i in (3, 45)])
+    assert histogram.sync(storage) == 1  # 45 is within the margin; 3 is too late
+    assert histogram.sync(storage) == 0 and histogram.total() == 5
+    print("✅ Local score histogram")
+
+
+def test_kiosk_proxy():
+    """Kiosks share one proxy that coalesces reads and batches writes upstream"""
+    import threading
+    from src.leaderboard import AdminStorage, LeaderboardProxy, ProxyStorage, ScoreJournal
+
+    client = FakeSupabaseClient()
+    client.seed([{'player_name': 'alice', 'score': 50, 'difficulty': 'easy'}])
+    client.latency = 0.05
+    proxy = LeaderboardProxy(SupabaseStorage(client=client), ScoreJournal(':memory:'),
+                             port=0, linger=0.1).start()
+    try:
+        kiosks = [Leaderboard(ProxyStorage(proxy.url)) for _ in range(8)]
+        assert not isinstance(kiosks[0].storage, AdminStorage)  # no compaction or verdicts
+
+        def run_all(action):
+            threads = [threading.Thread(target=action, args=(kiosk, i))
+                       for i, kiosk in enumerate(kiosks)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        tops = []
+        run_all(lambda kiosk, i: tops.append(kiosk.get_top_scores(difficulty='easy')))
+        assert client.requests == 1
+        assert all([e['player_name'] for e in top] == ['alice'] for top in tops)
+
+        run_all(lambda kiosk, i: kiosk.submit_score(f"kiosk{i}", 60 + i, 'easy'))
+        assert proxy.submitter.flush(timeout=2.0)
+        assert len(client.tables['leaderboard']) == 9
+        assert client.requests <= 3  # reads + one or two batched inserts
+
+        assert kiosks[0].get_player_rank('kiosk7', 'easy') == 1
+        assert kiosks[1].get_player_rank('alice', 'easy') == 9
+
+        client.fail = True
+        proxy.leaderboard.clear_cache()
+        assert kiosks[2].get_top_scores(limit=3, difficulty='easy') == []
+        assert kiosks[2].submit_score('late', 1, 'easy')  # journalled at the proxy
+        client.fail = False
+    finally:
+        proxy.stop()
+    assert any(r['player_name'] == 'late' for r in client.tables['leaderboard'])
+    print("✅ Multi-kiosk aggregation proxy")
+
+
+def test_standings_are_concurrent():
+    """The results screen waits for the slowest lookup, not their sum"""
+    leaderboard, client = make_leaderboard(
+        [(f"p{i}", i * 10, 'easy') for i in range(20)] + [('alice', 155, 'easy')])
+    client.latency = 0.2
+    started = time.perf_counter()
+    standings = leaderboard.standings('alice', 'easy', limit=5)
+    # best then count for the rank (0.4 s) while top runs alongside; serial is 0.6 s
+    assert time.perf_counter() - started < 0.55
+    assert client.requests == 3  # top, best and count: the best lookups share one request
+    assert standings == {'top_scores': leaderboard.get_top_scores(5, 'easy'),
+                         'rank': 5, 'best_score': 155}
+    assert client.requests == 3
+    print("✅ Standings run concurrently")
+
+
+def test_overlay_never_waits_on_network():
+    """The in-game overlay draws placeholders, then prefetched boards, without blocking"""
+    import numpy as np
+    from src.ui import LeaderboardOverlay
+
+    leaderboard, client = make_leaderboard([('alice', 50, 'easy'), ('bob', 70, 'hard')])
+    client.latency = 0.3
+    overlay = LeaderboardOverlay(leaderboard, refresh_interval=60.0,
+                                 current_player='alice').start()
+    try:
+        frame = np.full((480, 640, 3), 200, dtype=np.uint8)
+        placeholder = overlay.draw(frame.copy())
+        started = time.perf_counter()
+        for _ in range(10):
+            overlay.draw(frame.copy())
+        assert time.perf_counter() - started < 0.1  # fetch still in flight
+        assert not overlay.ready
+        assert not np.array_equal(placeholder, frame)
+
+        deadline = time.time() + 2.0
+        while not overlay.ready and time.time() < deadline:
+            time.sleep(0.01)
+        assert overlay.ready and client.requests == 1
+        assert not np.array_equal(overlay.draw(frame.copy()), placeholder)
+
+        # A failed refresh keeps the last good boards
+        boards = overlay._front
+        client.fail = True
+        leaderboard.clear_cache()
+        overlay.refresh()
+        time.sleep(0.5)
+        assert overlay._front is boards
+    finally:
+        overlay.stop(timeout=1.0)
+    print("✅ Leaderboard overlay is prefetched and double-buffered")
+
+
+def test_overlay_shows_the_game_just_played():
+    """The game over board has the new score before it is uploaded"""
+    from src.ui import LeaderboardOverlay
+
+    leaderboard, client = make_leaderboard([('alice', 50, 'easy'), ('bob', 70, 'easy')])
+    overlay = LeaderboardOverlay(leaderboard, limit=2, current_player='carol',
+                                 highlight='easy')
+    overlay.add_score(60)
+    assert [(r['player_name'], r['score']) for r in overlay._front['easy'][:1]] == [('carol', 60)]
+
+    overlay.start()
+    try:
+        deadline = time.time() + 2.0
+        while not overlay.ready and time.time() < deadline:
+            time.sleep(0.01)
+        assert [(r['player_name'], r['score']) for r in overlay._front['easy']] == [
+            ('bob', 70), ('carol', 60)]
+
+        # Once uploaded, the fetched row replaces the local one
+        leaderboard.submit_score('carol', 60, 'easy')
+        overlay.refresh()
+        time.sleep(0.2)
+        assert [r['score'] for r in overlay._front['easy']] == [70, 60]
+        assert overlay.leaderboard.fetch_top_scores_by_difficulty(2)['easy'][1]['player_name'] == 'carol'
+    finally:
+        overlay.stop(timeout=1.0)
+    print("✅ Overlay shows the game just played")
+
+
+def main():
+    """Run all tests"""
+    tests = [v for k, v in globals().items() if k.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
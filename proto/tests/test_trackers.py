@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for the hand tracker backend registry and the blob tracker
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from src.core.config import GameConfig
+from src.cv.backends import available_backends, create_tracker
+from src.cv.blob_tracker import BlobHandTracker, INDEX_FINGER_TIP
+
+SKIN_BGR = (80, 130, 200)
+
+
+def hand_frame(x, y, width=640, height=480):
+    """Dark frame with a palm blob and an extended finger pointing up"""
+    frame = np.full((height, width, 3), 40, dtype=np.uint8)
+    cv2.ellipse(frame, (x, y), (50, 60), 0, 0, 360, SKIN_BGR, -1)
+    cv2.rectangle(frame, (x - 8, y - 140), (x + 8, y), SKIN_BGR, -1)
+    return frame
+
+
+def test_registry():
+    """All built-in backends are registered and unknown names are rejected"""
+    assert {'solutions', 'tasks', 'blob'} <= set(available_backends())
+    assert isinstance(create_tracker('blob', GameConfig()), BlobHandTracker)
+    try:
+        create_tracker('missing', GameConfig())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown backend accepted")
+    print("✅ Backend registry")
+
+
+def test_blob_fingertip():
+    """Fingertip lands on the top of the extended finger"""
+    tracker = BlobHandTracker()
+    landmarks = tracker.process_frame(hand_frame(320, 300))
+
+    assert landmarks is not None and len(landmarks) == 21
+    tip_x, tip_y = landmarks[INDEX_FINGER_TIP]
+    assert abs(tip_x * 640 - 320) < 15
+    assert abs(tip_y * 480 - 160) < 15
+    print("✅ Blob fingertip estimate")
+
+
+def test_blob_prefers_moving_hand():
+    """A static skin-colored blob loses to a moving one"""
+    tracker = BlobHandTracker()
+    static = (560, 420)
+    for x in (200, 230):
+        frame = hand_frame(x, 300)
+        cv2.circle(frame, static, 75, SKIN_BGR, -1)
+        landmarks = tracker.process_frame(frame)
+
+    assert abs(landmarks[INDEX_FINGER_TIP][0] * 640 - 230) < 15
+    print("✅ Blob tracker follows motion")
+
+
+def test_blob_no_hand():
+    """Empty frame yields no landmarks"""
+    tracker = BlobHandTracker()
+    assert tracker.process_frame(np.zeros((480, 640, 3), dtype=np.uint8)) is None
+    print("✅ Blob tracker without hand")
+
+
+def test_async_tracker_returns_newest_result():
+    """AsyncHandTracker returns the newest delivered result and never reuses a timestamp"""
+    import tempfile
+    from types import SimpleNamespace
+    from src.cv.hand_landmarker import AsyncHandTracker
+
+    class FakeLandmarker:
+        """Queues frames; the test delivers results like MediaPipe's worker thread"""
+        def __init__(self, options):
+            self.callback = options.result_callback
+            self.submitted = []
+            self.closed = False
+
+        def detect_async(self, image, timestamp_ms):
+            self.submitted.append(timestamp_ms)
+
+        def deliver(self, timestamp_ms, x):
+            landmarks = [SimpleNamespace(x=x, y=0.5)] * 21
+            self.callback(SimpleNamespace(hand_landmarks=[landmarks] if x is not None else []),
+                          None, timestamp_ms)
+
+        def close(self):
+            self.closed = True
+
+    with tempfile.NamedTemporaryFile(suffix='.task') as model:
+        tracker = AsyncHandTracker(model.name, create_landmarker=FakeLandmarker)
+    fake = tracker.landmarker
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    assert tracker.process_frame(frame, 10) is None  # nothing delivered yet
+    tracker.process_frame(frame, 10)
+    tracker.process_frame(frame, 5)
+    assert fake.submitted == [10, 11, 12]  # LIVE_STREAM needs strictly increasing timestamps
+
+    fake.deliver(11, 0.3)
+    fake.deliver(10, 0.1)  # late result for an older frame is ignored
+    assert tracker.process_frame(frame, 20)[INDEX_FINGER_TIP] == (0.3, 0.5)
+    assert tracker.result_timestamp_ms == 11
+    fake.deliver(12, None)  # the hand left the frame
+    assert tracker.process_frame(frame, 21) is None
+
+    tracker.close()
+    assert fake.closed
+    print("✅ Async tracker keeps the newest result")
+
+
+def test_inference_pool_is_fair():
+    """Pooled stations get their own trackers, results, fair turns and latency stats"""
+    import threading
+    import time
+    from src.cv.inference_pool import InferencePool
+
+    trackers = []
+
+    class SlowTracker:
+        def __init__(self):
+            self.seen = set()  # frames of one camera only: tracking state stays per station
+            self.closed = False
+            trackers.append(self)
+
+        def process_frame(self, frame, timestamp_ms=None):
+            self.seen.add(int(frame[0, 0, 0]))
+            time.sleep(0.005)
+            return [(frame[0, 0, 0] / 255.0, timestamp_ms / 1e6)] * 21
+
+        def close(self):
+            self.closed = True
+
+    pool = InferencePool(SlowTracker, workers=2)
+    stations = [pool.station() for _ in range(4)]
+    try:
+        def camera(i, tracker):
+            frame = np.full((48, 64, 3), i * 50, dtype=np.uint8)
+            for t in range(1, 101):
+                tracker.process_frame(frame, t)
+                time.sleep(0.001 if i == 0 else 0.004)  # station 0 floods the pool
+
+        threads = [threading.Thread(target=camera, args=(i, s)) for i, s in enumerate(stations)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        time.sleep(0.05)
+
+        stats = pool.stats()
+        processed = [stats[s.name]['processed'] for s in stations]
+        assert min(processed) > 0
+        assert processed[0] < 2 * max(processed[1:])  # flooding buys no extra turns
+        assert stats['station0']['dropped'] > 0
+        assert all(stats[s.name]['p95_ms'] is not None for s in stations)
+        for i, station in enumerate(stations):
+            landmarks = pool.result(station.name)
+            assert abs(landmarks[0][0] - i * 50 / 255.0) < 1e-9
+        assert [t.seen for t in trackers] == [{i * 50} for i in range(4)]
+    finally:
+        pool.close()
+    assert all(t.closed for t in trackers)
+    print("✅ Shared inference pool")
+
+
+def main():
+    """Run all tests"""
+    tests = [v for k, v in globals().items() if k.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())